@@ -0,0 +1,125 @@
+"""
+Process-wide registry of OAuth API clients used to call backend services (LMS, Discovery, Enterprise).
+
+Building a new ``OAuthAPIClient`` for every call means every request to a backend service opens a new
+TCP/TLS connection and looks up the access token in the cache again. The clients handed out here are
+created once per site and process, keep their connections alive in a bounded pool, and hold on to the
+access token until it is about to expire.
+"""
+import datetime
+import logging
+import threading
+
+from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
+from edx_rest_api_client.client import OAuthAPIClient, get_and_cache_oauth_access_token
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Consider tokens expired a little early so that they do not expire while a request is in flight.
+ACCESS_TOKEN_EXPIRATION_THRESHOLD = datetime.timedelta(seconds=5)
+
+
+class PooledOAuthAPIClient(OAuthAPIClient):
+    """
+    OAuthAPIClient that keeps its connections alive and re-uses its access token until it expires.
+    """
+
+    def __init__(self, base_url, client_id, client_secret, pool_connections=None, pool_maxsize=None,
+                 request_timeout=None, **kwargs):
+        super(PooledOAuthAPIClient, self).__init__(base_url, client_id, client_secret, **kwargs)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or settings.OAUTH_API_CLIENT_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or settings.OAUTH_API_CLIENT_POOL_MAXSIZE,
+        )
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self._request_timeout = request_timeout or settings.OAUTH_API_CLIENT_REQUEST_TIMEOUT
+        self._token_expiration = None
+
+    def _ensure_authentication(self):
+        """
+        Fetch a new access token only if the one held by this client is missing or about to expire.
+        """
+        now = datetime.datetime.utcnow()
+        if self.auth.token and self._token_expiration and now < self._token_expiration - \
+                ACCESS_TOKEN_EXPIRATION_THRESHOLD:
+            return
+
+        oauth_url = self._base_url if not self.oauth_uri else self._base_url + self.oauth_uri
+        self.auth.token, self._token_expiration = get_and_cache_oauth_access_token(
+            oauth_url,
+            self._client_id,
+            self._client_secret,
+            grant_type='client_credentials',
+            timeout=self._timeout,
+        )
+
+    def request(self, method, url, headers=None, **kwargs):  # pylint: disable=arguments-differ
+        if self._request_timeout:
+            kwargs.setdefault('timeout', self._request_timeout)
+        return super(PooledOAuthAPIClient, self).request(method, url, headers=headers, **kwargs)
+
+
+class OAuthAPIClientRegistry:
+    """
+    Thread-safe registry of PooledOAuthAPIClient instances, keyed by site and OAuth credentials.
+    """
+
+    def __init__(self):
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _build_key(site_id):
+        return (
+            site_id,
+            settings.BACKEND_SERVICE_EDX_OAUTH2_PROVIDER_URL,
+            settings.BACKEND_SERVICE_EDX_OAUTH2_KEY,
+            settings.BACKEND_SERVICE_EDX_OAUTH2_SECRET,
+        )
+
+    def get_client(self, site_id):
+        """
+        Return the client for the given site, creating it on first use.
+
+        Args:
+            site_id (int): ID of the Site the client is used for.
+
+        Returns:
+            PooledOAuthAPIClient
+        """
+        key = self._build_key(site_id)
+        client = self._clients.get(key)
+        if client is not None:
+            self.hits += 1
+            monitoring_utils.set_custom_attribute('oauth_api_client_pool', 'hit')
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                self.misses += 1
+                monitoring_utils.set_custom_attribute('oauth_api_client_pool', 'miss')
+                logger.info('Creating pooled OAuth API client for site [%s].', site_id)
+                client = PooledOAuthAPIClient(key[1], key[2], key[3])
+                self._clients[key] = client
+            return client
+
+    def invalidate(self, site_id=None):
+        """
+        Close and drop the clients for the given site, or all clients if no site is given.
+        """
+        with self._lock:
+            for key in list(self._clients):
+                if site_id is None or key[0] == site_id:
+                    self._clients.pop(key).close()
+            if site_id is None:
+                self.hits = 0
+                self.misses = 0
+
+
+oauth_api_client_registry = OAuthAPIClientRegistry()
@@ -0,0 +1,54 @@
+"""
+Batch helpers for the two tiered (request + django) cache.
+
+TieredCache only reads and writes one key at a time, which costs one round-trip to the
+django cache backend per key. These helpers do the same work for many keys with a single
+``get_many``/``set_many`` call.
+"""
+from django.core.cache import cache as django_cache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
+
+
+def get_many_from_all_tiers(keys):
+    """
+    Retrieves the cached values for the given keys, looking in the request cache first
+    and fetching the rest from the django cache in a single call.
+
+    Values found in the django cache are copied into the request cache.
+
+    Args:
+        keys (iterable): cache keys
+
+    Returns:
+        dict: cached values for the keys that were found. Missing keys are omitted.
+    """
+    found = {}
+    missing = []
+    for key in keys:
+        cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(key)
+        if cached_response.is_found:
+            found[key] = cached_response.value
+        else:
+            missing.append(key)
+
+    if missing and not TieredCache._should_force_django_cache_miss():  # pylint: disable=protected-access
+        django_cached = django_cache.get_many(missing)
+        for key, value in django_cached.items():
+            DEFAULT_REQUEST_CACHE.set(key, value)
+        found.update(django_cached)
+
+    return found
+
+
+def set_many_all_tiers(data, django_cache_timeout):
+    """
+    Caches the given key/value pairs in both the request cache and the django cache.
+
+    Args:
+        data (dict): mapping of cache keys to values
+        django_cache_timeout (int): timeout, in seconds, used for the django cache
+    """
+    for key, value in data.items():
+        DEFAULT_REQUEST_CACHE.set(key, value)
+    if data:
+        django_cache.set_many(data, django_cache_timeout)
@@ -36,6 +36,9 @@ COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME = 'Course Entitlement'
 # Discovery Service constants
 DEFAULT_CATALOG_PAGE_SIZE = 100
 
+# Number of email addresses sent in one request to the LMS accounts search_emails API
+LMS_USER_SEARCH_EMAILS_BATCH_SIZE = 100
+
 ENTERPRISE_COUPON_ADMIN_ROLE = 'enterprise_coupon_admin'
 ENTERPRISE_COUPON_LEARNER_ROLE = 'enterprise_coupon_learner'
 ENTERPRISE_OFFER_ADMIN_ROLE = 'enterprise_offer_admin'
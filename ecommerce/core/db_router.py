@@ -0,0 +1,164 @@
+"""
+Database router sending opted-in reads to the read replica.
+
+Reads go to the primary database unless they happen within `read_replica()`, or in a view using
+`ReadReplicaMixin`, and a database called 'read_replica' is configured. Writes always go to the primary
+database, and pin the current request, or command, to it: the reads that follow a write see that write,
+whatever the replication lag. `ReadReplicaPinningMiddleware` carries the pin over to the following requests
+of the same client for READ_REPLICA_PIN_SECONDS. Such a fixed window only hides the writes while the replica
+lags less than it, so the replication lag of a MySQL replica is measured, and reads fall back to the primary
+database while it exceeds the window or cannot be measured.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+READ_REPLICA_DATABASE = 'read_replica'
+
+# Writes to these models do not pin to the primary database. Sessions are saved by almost every request of a
+# logged in user, and are not read from the replica.
+UNPINNED_WRITE_MODELS = ('sessions.Session',)
+
+_state = threading.local()
+_lag_lock = threading.Lock()
+_lag = {'checked_at': None, 'seconds': None}
+
+
+def read_replica_configured():
+    return READ_REPLICA_DATABASE in settings.DATABASES
+
+
+def is_pinned_to_primary():
+    return getattr(_state, 'pinned', False)
+
+
+def pin_to_primary():
+    """ Sends the remaining reads of the current request, or command, to the primary database. """
+    _state.pinned = True
+
+
+def reset_pinning(pinned=False):
+    """ Resets the pinning state of the current thread, at the beginning of a request. """
+    _state.pinned = pinned
+
+
+def _measure_replica_lag():
+    """ Returns the replication lag of the read replica in seconds, or None if it cannot be measured. """
+    if 'mysql' not in settings.DATABASES[READ_REPLICA_DATABASE]['ENGINE']:
+        # Only MySQL replication is measured, other databases are used as is (e.g. the same database in tests).
+        return 0
+
+    try:
+        with connections[READ_REPLICA_DATABASE].cursor() as cursor:
+            cursor.execute('SHOW SLAVE STATUS')
+            row = cursor.fetchone()
+            if row is None:
+                # The database is not replicating, it holds the same data as the primary.
+                return 0
+            status = dict(zip([column[0] for column in cursor.description], row))
+    except DatabaseError:
+        logger.exception('Failed to measure the replication lag of the read replica.')
+        return None
+    return status.get('Seconds_Behind_Master')
+
+
+def get_replica_lag():
+    """
+    Returns the replication lag of the read replica in seconds, or None if it cannot be measured.
+
+    The lag is measured at most once every READ_REPLICA_LAG_CHECK_SECONDS by each process.
+    """
+    now = time.monotonic()
+    checked_at = _lag['checked_at']
+    if checked_at is None or now - checked_at >= settings.READ_REPLICA_LAG_CHECK_SECONDS:
+        with _lag_lock:
+            if _lag['checked_at'] is None or now - _lag['checked_at'] >= settings.READ_REPLICA_LAG_CHECK_SECONDS:
+                _lag['seconds'] = _measure_replica_lag()
+                _lag['checked_at'] = now
+    return _lag['seconds']
+
+
+def reset_replica_lag():
+    """ Forgets the measured replication lag, so that it is measured again on the next read. """
+    _lag['checked_at'] = None
+
+
+def is_replica_in_sync():
+    """ Returns True if the replica lags less than the time the requests that wrote are pinned to the primary. """
+    lag = get_replica_lag()
+    return lag is not None and lag < settings.READ_REPLICA_PIN_SECONDS
+
+
+@contextmanager
+def read_replica():
+    """
+    Sends the reads made within this context, unless they follow a write, to the read replica if there is one.
+
+    Can also be used as a decorator, e.g. on the `handle` method of a management command.
+    """
+    depth = getattr(_state, 'replica_depth', 0)
+    _state.replica_depth = depth + 1
+    try:
+        yield
+    finally:
+        _state.replica_depth = depth
+
+
+class ReadReplicaRouter:
+    """ Routes the reads made within `read_replica()` to the read replica, and everything else to the primary. """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        if not read_replica_configured():
+            return None
+
+        if getattr(_state, 'replica_depth', 0) and not is_pinned_to_primary() and is_replica_in_sync():
+            return READ_REPLICA_DATABASE
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        if model._meta.label not in UNPINNED_WRITE_MODELS:  # pylint: disable=protected-access
+            pin_to_primary()
+        # Instances read from the replica would otherwise be written back to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        # The replica holds the same data as the primary.
+        databases = {DEFAULT_DB_ALIAS, READ_REPLICA_DATABASE}
+        return obj1._state.db in databases and obj2._state.db in databases  # pylint: disable=protected-access
+
+    def allow_migrate(self, db, app_label, **hints):  # pylint: disable=unused-argument
+        if db == READ_REPLICA_DATABASE:
+            return False
+        return None
+
+
+class ReadReplicaMixin:
+    """ Sends the reads of GET, HEAD and OPTIONS requests to the read replica, if there is one. """
+
+    read_replica_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in self.read_replica_methods:
+            return super(ReadReplicaMixin, self).dispatch(request, *args, **kwargs)
+
+        with read_replica():
+            response = super(ReadReplicaMixin, self).dispatch(request, *args, **kwargs)
+            # Templates evaluate their querysets when rendered, which would otherwise happen after this method.
+            if not response.streaming and hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+
+        if response.streaming:
+            response.streaming_content = _iter_with_read_replica(response.streaming_content)
+        return response
+
+
+def _iter_with_read_replica(iterable):
+    """ Generates the content of a streaming response, whose reads happen after the view returns, from the replica. """
+    with read_replica():
+        yield from iterable
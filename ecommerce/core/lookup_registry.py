@@ -0,0 +1,128 @@
+"""
+Process-local registries of lookup-table rows (basket attribute types, product classes, payment event types).
+
+These rows are created by migrations or on first use and essentially never change, yet they used to be
+fetched by name on every basket, checkout and fulfillment request. A registry loads the whole table on first
+use, hands out the cached instances by name, and drops them when a row is saved or deleted in this process.
+Rows are only cached once the transaction that read them commits, so a rolled back transaction never leaves
+rows that do not exist in the cache.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from oscar.core.loading import get_model
+
+logger = logging.getLogger(__name__)
+
+
+class LookupTableRegistry:
+    """
+    Thread-safe cache of the rows of a lookup table, keyed by their name.
+
+    Cached rows are reloaded after LOOKUP_TABLE_REGISTRY_TIMEOUT seconds, so that changes made by other
+    processes are eventually seen.
+    """
+
+    def __init__(self, app_label, model_name):
+        self.app_label = app_label
+        self.model_name = model_name
+        self._rows = None
+        self._expiration = 0
+        self._lock = threading.Lock()
+
+        sender = '{}.{}'.format(app_label, model_name)
+        for signal, signal_name in ((post_save, 'post_save'), (post_delete, 'post_delete')):
+            signal.connect(
+                self._invalidate_on_change,
+                sender=sender,
+                weak=False,
+                dispatch_uid='lookup_table_registry_{}_{}'.format(sender, signal_name),
+            )
+
+    @property
+    def model(self):
+        return get_model(self.app_label, self.model_name)
+
+    def _cache_on_commit(self, rows):
+        def cache_rows():
+            with self._lock:
+                self._rows = rows
+                self._expiration = time.time() + settings.LOOKUP_TABLE_REGISTRY_TIMEOUT
+
+        transaction.on_commit(cache_rows)
+
+    def _get_cached_rows(self):
+        rows = self._rows
+        if rows is not None and time.time() < self._expiration:
+            return rows
+        return None
+
+    def warm(self):
+        """
+        Load all rows of the table. They are cached once the current transaction, if any, commits.
+
+        Returns:
+            dict: rows keyed by name
+        """
+        rows = {row.name: row for row in self.model.objects.all()}
+        self._cache_on_commit(rows)
+        return rows
+
+    def get(self, name):
+        """
+        Return the row with the given name.
+
+        Raises:
+            DoesNotExist: if there is no such row, as Model.objects.get would.
+        """
+        rows = self._get_cached_rows()
+        if rows is None or name not in rows:
+            rows = self.warm()
+        try:
+            return rows[name]
+        except KeyError:
+            raise self.model.DoesNotExist(
+                '{} matching name [{}] does not exist.'.format(self.model_name, name)
+            ) from None
+
+    def get_or_create(self, name, **kwargs):
+        """
+        Return a tuple of the row with the given name, creating it if needed, and whether it was created.
+        """
+        rows = self._get_cached_rows()
+        if rows is not None and name in rows:
+            return rows[name], False
+
+        row, created = self.model.objects.get_or_create(name=name, **kwargs)
+        if not created:
+            self.warm()
+        return row, created
+
+    def invalidate(self):
+        """
+        Drop the cached rows. They are loaded again on next use.
+        """
+        with self._lock:
+            self._rows = None
+            self._expiration = 0
+
+    def _invalidate_on_change(self, *_args, **_kwargs):
+        logger.debug('Invalidating the %s.%s lookup table registry.', self.app_label, self.model_name)
+        self.invalidate()
+
+
+basket_attribute_types = LookupTableRegistry('basket', 'BasketAttributeType')
+payment_event_types = LookupTableRegistry('order', 'PaymentEventType')
+product_classes = LookupTableRegistry('catalogue', 'ProductClass')
+
+
+def invalidate_lookup_table_registries():
+    """
+    Drop the cached rows of all registries.
+    """
+    for registry in (basket_attribute_types, payment_event_types, product_classes):
+        registry.invalidate()
@@ -0,0 +1,104 @@
+"""
+Django management command to compare the SDN fallback matchers on the currently imported SDN data.
+"""
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ecommerce.extensions.payment.core.sdn import (
+    SDN_FALLBACK_SOURCE,
+    SDN_FALLBACK_TYPE,
+    check_sdn_fallback_by_scan,
+    checkSDNFallback,
+    sdn_fallback_index
+)
+from ecommerce.extensions.payment.exceptions import SDNFallbackDataEmptyError
+from ecommerce.extensions.payment.models import SDNFallbackData
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Time the token-indexed SDN fallback check against the record scan on the current SDN data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--checks',
+            metavar='N',
+            action='store',
+            type=int,
+            default=200,
+            help='Number of checks to run with each matcher.'
+        )
+        parser.add_argument(
+            '--seed',
+            action='store',
+            type=int,
+            default=None,
+            help='Seed used to pick the names, cities and countries that are checked.'
+        )
+
+    def _build_checks(self, count, seed):
+        """
+        Half of the checks are built from current records (hits), the other half use made up names (misses).
+        """
+        try:
+            records = list(
+                SDNFallbackData.get_current_records_and_filter_by_source_and_type(
+                    SDN_FALLBACK_SOURCE, SDN_FALLBACK_TYPE
+                ).exclude(countries='').values_list('names', 'addresses', 'countries')
+            )
+        except SDNFallbackDataEmptyError as empty_error:
+            raise CommandError('There is no current SDN data to run the checks against.') from empty_error
+        if not records:
+            raise CommandError('There is no current SDN data to run the checks against.')
+
+        rng = random.Random(seed)
+        checks = []
+        for index in range(count):
+            names, addresses, countries = rng.choice(records)
+            name_tokens = names.split()
+            name = ' '.join(rng.sample(name_tokens, min(2, len(name_tokens))))
+            city = rng.choice(addresses.split()) if addresses else ''
+            if index % 2:
+                name = '{} nomatch{}'.format(name, index)
+            checks.append((name, city, rng.choice(countries.split())))
+        return checks
+
+    def _time_matcher(self, matcher, checks):
+        start = time.perf_counter()
+        results = [matcher(name, city, country) for name, city, country in checks]
+        return time.perf_counter() - start, results
+
+    def handle(self, *args, **options):
+        checks = self._build_checks(options['checks'], options['seed'])
+
+        sdn_fallback_index.invalidate()
+        start = time.perf_counter()
+        checkSDNFallback(*checks[0])
+        build_seconds = time.perf_counter() - start
+
+        scan_seconds, scan_results = self._time_matcher(check_sdn_fallback_by_scan, checks)
+        index_seconds, index_results = self._time_matcher(checkSDNFallback, checks)
+
+        mismatches = sum(1 for scan, indexed in zip(scan_results, index_results) if scan != indexed)
+        if mismatches:
+            logger.warning('SDNFallback: The matchers disagree on %d of %d checks.', mismatches, len(checks))
+
+        self.stdout.write(
+            'Ran {checks} checks ({hits} hits).\n'
+            'Record scan:   {scan:.4f}s total, {scan_each:.3f}ms per check\n'
+            'Token index:   {index:.4f}s total, {index_each:.3f}ms per check (first build {build:.4f}s)\n'
+            'Mismatches:    {mismatches}'.format(
+                checks=len(checks),
+                hits=sum(1 for result in scan_results if result),
+                scan=scan_seconds,
+                scan_each=scan_seconds * 1000 / len(checks),
+                index=index_seconds,
+                index_each=index_seconds * 1000 / len(checks),
+                build=build_seconds,
+                mismatches=mismatches,
+            )
+        )
@@ -3,6 +3,7 @@ Django management command to download SDN csv for use as fallback if the trade.g
 See docs/decisions/0007-sdn-fallback.rst for more details.
 
 """
+import hashlib
 import logging
 import tempfile
 
@@ -12,10 +13,15 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 from requests.exceptions import Timeout
 
-from ecommerce.extensions.payment.core.sdn import populate_sdn_fallback_data_and_metadata
+from ecommerce.extensions.payment.core.sdn import (
+    SDN_FALLBACK_IMPORT_BATCH_SIZE,
+    populate_sdn_fallback_data_and_metadata_from_file
+)
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class Command(BaseCommand):
     help = 'Download the SDN csv from trade.gov, for use as fallback for when their SDN API is down.'
@@ -29,17 +35,32 @@ class Command(BaseCommand):
             default=3,  # typical size is > 4 MB; 3 MB would be unexpectedly low
             help='File size MB threshold, under which we will not import it. Use default if argument not specified'
         )
+        parser.add_argument(
+            '--batch-size',
+            metavar='N',
+            action='store',
+            dest='batch_size',
+            type=int,
+            default=SDN_FALLBACK_IMPORT_BATCH_SIZE,
+            help='Number of SDN records inserted per query.'
+        )
 
     def handle(self, *args, **options):
-        # download the csv locally, to check size and pass along to import
+        # stream the csv into a local file, to check size and pass along to import
         threshold = options['threshold']
         url = 'https://data.trade.gov/downloadable_consolidated_screening_list/v1/consolidated.csv'
         timeout = settings.SDN_CHECK_REQUEST_TIMEOUT
 
-        with requests.Session() as s:
+        with requests.Session() as s, tempfile.TemporaryFile() as temp_csv:
             try:
-                download = s.get(url, timeout=timeout)
+                download = s.get(url, timeout=timeout, stream=True)
                 status_code = download.status_code
+                if status_code == 200:
+                    # compute the checksum while the file is downloaded, so it is never fully loaded in memory
+                    file_checksum = hashlib.sha256()
+                    for chunk in download.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        file_checksum.update(chunk)
+                        temp_csv.write(chunk)
             except Timeout:
                 logger.warning(
                     "SDNFallback: DOWNLOAD FAILURE: Timeout occurred trying to download SDN csv. "
@@ -49,32 +70,30 @@ class Command(BaseCommand):
                 logger.warning("SDNFallback: DOWNLOAD FAILURE: Exception occurred: [%s]", e)
                 raise
 
-            if download.status_code != 200:
+            if status_code != 200:
                 logger.warning("SDNFallback: DOWNLOAD FAILURE: Status code was: [%s]", status_code)
                 raise Exception("CSV download url got an unsuccessful response code: ", status_code)
 
-            with tempfile.TemporaryFile() as temp_csv:
-                temp_csv.write(download.content)
-                file_size_in_bytes = temp_csv.tell()  # get current position in the file (number of bytes)
-                file_size_in_MB = file_size_in_bytes / 10**6
+            file_size_in_bytes = temp_csv.tell()  # get current position in the file (number of bytes)
+            file_size_in_MB = file_size_in_bytes / 10**6
 
-                if file_size_in_MB > threshold:
-                    sdn_file_string = download.content.decode('utf-8')
-                    with transaction.atomic():
-                        metadata_entry = populate_sdn_fallback_data_and_metadata(sdn_file_string)
-                        if metadata_entry:
-                            logger.info(
-                                'SDNFallback: IMPORT SUCCESS: Imported SDN CSV. Metadata id %s',
-                                metadata_entry.id)
+            if file_size_in_MB > threshold:
+                with transaction.atomic():
+                    metadata_entry = populate_sdn_fallback_data_and_metadata_from_file(
+                        temp_csv, file_checksum.hexdigest(), batch_size=options['batch_size'])
+                    if metadata_entry:
+                        logger.info(
+                            'SDNFallback: IMPORT SUCCESS: Imported SDN CSV. Metadata id %s',
+                            metadata_entry.id)
 
-                        logger.info('SDNFallback: DOWNLOAD SUCCESS: Successfully downloaded the SDN CSV.')
-                        self.stdout.write(
-                            self.style.SUCCESS(
-                                'SDNFallback: Imported SDN CSV into the SDNFallbackMetadata and SDNFallbackData models.'
-                            )
+                    logger.info('SDNFallback: DOWNLOAD SUCCESS: Successfully downloaded the SDN CSV.')
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            'SDNFallback: Imported SDN CSV into the SDNFallbackMetadata and SDNFallbackData models.'
                         )
-                else:
-                    logger.warning(
-                        "SDNFallback: DOWNLOAD FAILURE: file too small! "
-                        "(%f MB vs threshold of %s MB)", file_size_in_MB, threshold)
-                    raise Exception("CSV file download did not meet threshold given")
+                    )
+            else:
+                logger.warning(
+                    "SDNFallback: DOWNLOAD FAILURE: file too small! "
+                    "(%f MB vs threshold of %s MB)", file_size_in_MB, threshold)
+                raise Exception("CSV file download did not meet threshold given")
@@ -1,5 +1,9 @@
 """
 Django management command to Sync Product, Orders and Lines to Hubspot server.
+
+Each run syncs the baskets created or submitted since the previous successful run of the site, which is recorded
+in SiteConfiguration.hubspot_last_synced. Objects are read from the database in chunks, and their batches are
+uploaded to Hubspot concurrently.
 """
 
 
@@ -7,6 +11,7 @@ import json
 import logging
 import time
 import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from decimal import Decimal as D
 from urllib.parse import urljoin
@@ -14,9 +19,11 @@ from urllib.parse import urljoin
 import requests
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Q
+from django.db.models import Prefetch, Q
+from django.utils import timezone
 from oscar.core.loading import get_class, get_model
-from requests.exceptions import HTTPError, RequestException
+from requests.exceptions import ConnectionError  # pylint: disable=redefined-builtin
+from requests.exceptions import HTTPError, RequestException, Timeout
 
 from ecommerce.extensions.fulfillment.status import ORDER
 
@@ -32,6 +39,12 @@ logger = logging.getLogger(__name__)
 
 
 DEFAULT_INITIAL_DAYS = 1
+DEFAULT_LAG_MINUTES = 60
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 1
+# Without a timeout, a request that never gets an answer would block its worker, and the sync, forever.
+HUBSPOT_REQUEST_TIMEOUT_SECONDS = 30
 HUBSPOT_API_BASE_URL = 'https://api.hubapi.com'
 HUBSPOT_ECOMMERCE_SETTINGS = {
     'enabled': True,
@@ -174,6 +187,7 @@ PRODUCT = "PRODUCT"
 LINE_ITEM = "LINE_ITEM"
 DEAL = "DEAL"
 BATCH_SIZE = 200
+CART_CHUNK_SIZE = 500
 
 EXPECTED_METHODS = ["GET", "POST", "PUT"]
 
@@ -181,6 +195,9 @@ EXPECTED_METHODS = ["GET", "POST", "PUT"]
 class Command(BaseCommand):
     help = 'Sync Product, Orders and Lines to Hubspot server.'
     initial_sync_days = None
+    lag_minutes = None
+    max_workers = None
+    max_retries = None
 
     def _get_hubspot_enable_sites(self):
         """
@@ -195,8 +212,13 @@ class Command(BaseCommand):
         api_url = urljoin(f"{HUBSPOT_API_BASE_URL}/", f"{api_url}/{hubspot_object}")
         if method not in EXPECTED_METHODS:
             raise ValueError(f"Unexpected method {method}. Allowed methods are: {EXPECTED_METHODS}")
-        response = requests.request(method, api_url, json=body, params=kwargs)
+        response = requests.request(
+            method, api_url, json=body, params=kwargs, timeout=HUBSPOT_REQUEST_TIMEOUT_SECONDS
+        )
         response.raise_for_status()
+        # Successful calls may answer without a body, e.g. 204 No Content.
+        if not response.content:
+            return None
         return response.json()
 
     def _install_hubspot_ecommerce_bridge(self, site_configuration):
@@ -289,25 +311,22 @@ class Command(BaseCommand):
 
     def _get_hubspot_contact_structure(self, users):
         """
-        Returns list of dicts, each dict represents hubspot CONTACT.
+        Yields dicts, each dict represents hubspot CONTACT.
         """
-        hubspot_contacts = []
         for user in users:
-            hubspot_contacts.append({
+            yield {
                 'integratorObjectId': str(user.id),
                 'action': 'UPSERT',
                 'changeOccurredTimestamp': self._get_timestamp(),
                 'propertyNameToValues': {
                     'email': user.email
                 }
-            })
-        return hubspot_contacts
+            }
 
     def _get_hubspot_deal_structure(self, carts, partner):
         """
-        Returns list of dicts, each dict represents hubspot DEAL.
+        Yields dicts, each dict represents hubspot DEAL.
         """
-        hubspot_deals = []
         for cart in carts:
             deal = {
                 'integratorObjectId': str(cart.id),
@@ -317,7 +336,8 @@ class Command(BaseCommand):
             }
             total_price, description = self._get_carts_extra_properties(cart)
             if cart.status == Basket.SUBMITTED:
-                order = Order.objects.filter(basket=cart).first()
+                # The orders of the basket are prefetched, in primary key order.
+                order = cart.hubspot_orders[0] if cart.hubspot_orders else None
                 deal['propertyNameToValues'] = {
                     'deal_name': order.number,
                     'total_incl_tax': float(order.total_incl_tax),
@@ -334,44 +354,40 @@ class Command(BaseCommand):
                     'user_id': str(cart.owner.id) if cart.owner else ''
                 }
             deal['propertyNameToValues']['description'] = description
-            hubspot_deals.append(deal)
-        return hubspot_deals
+            yield deal
 
     def _get_hubspot_line_item_structure(self, lines):
         """
-        Returns list of dicts, each dict represents hubspot LINE_ITEM.
+        Yields dicts, each dict represents hubspot LINE_ITEM.
         """
-        hubspot_line_items = []
         for line in lines:
             line_price_incl_tax = self._get_cart_line_prices(line, 'price_incl_tax')
             line_price_excl_tax = self._get_cart_line_prices(line, 'price_excl_tax')
-            hubspot_line_items.append({
+            yield {
                 'integratorObjectId': str(line.id),
                 'action': 'UPSERT',
                 'changeOccurredTimestamp': self._get_timestamp(),
                 'propertyNameToValues': {
-                    'order_id': str(line.basket.id),
+                    'order_id': str(line.basket_id),
                     'price_currency': str(line.price_currency),
                     'tax': float(line_price_incl_tax - line_price_excl_tax),
-                    'product_id': str(line.product.id),
+                    'product_id': str(line.product_id),
                     'price_incl_tax': float(line_price_incl_tax),
                     'price_excl_tax': float(line_price_excl_tax),
                     'quantity': line.quantity
                 }
-            })
-        return hubspot_line_items
+            }
 
     def _get_hubspot_product_structure(self, products):
         """
-        Returns list of dicts, each dict represents hubspot PRODUCT.
+        Yields dicts, each dict represents hubspot PRODUCT.
         """
-        hubspot_products = []
         for product in products:
             if product.description:
                 description = product.description
             else:
                 description = product.course.id if product.course else ''
-            hubspot_products.append({
+            yield {
                 'integratorObjectId': str(product.id),
                 'action': 'UPSERT',
                 'changeOccurredTimestamp': self._get_timestamp(),
@@ -379,50 +395,113 @@ class Command(BaseCommand):
                     'title': str(product.title),
                     'description': description
                 }
-            })
-        return hubspot_products
+            }
 
     def _upsert_hubspot_objects(self, object_type, objects, site_configuration):
         """
-        Calls the sync message endpoint on given objects (PRODUCT, DEAL
-        and LINE_ITEM) and each request can has 200 (BATCH_SIZE) objects.
+        Calls the sync message endpoint on given objects (CONTACT, PRODUCT, DEAL
+        and LINE_ITEM) and each request can has 200 (BATCH_SIZE) objects. Up to
+        `max_workers` requests are made at once.
+
+        Returns:
+            bool: True if every batch of objects was synced.
         """
-        try:
-            total = len(objects)
-            for start in range(0, total, BATCH_SIZE):
-                batch = objects[start:start + BATCH_SIZE]
+        site = site_configuration.site.domain
+        start_time = time.time()
+        synced = failed = 0
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            pending = {}
+
+            def collect(futures):
+                nonlocal synced, failed
+                for future in futures:
+                    start, size = pending.pop(future)
+                    try:
+                        future.result()
+                    except (HTTPError, RequestException) as ex:
+                        failed += 1
+                        self.stderr.write(
+                            'An error occurred while upserting {object_type} for site {site}: {message}'.format(
+                                object_type=object_type, site=site, message=ex
+                            )
+                        )
+                        continue
+                    synced += size
+                    self.stdout.write(
+                        'Successfully synced {object_type}s batch from {start} to {end} for site {site}'.format(
+                            object_type=object_type, start=start, end=start + size, site=site
+                        )
+                    )
+
+            for start, batch in self._iter_batches(objects):
                 self.stdout.write(
-                    'Syncing {object_type}s batch from {start} to {end} of total: {total} for site {site}'.format(
-                        object_type=object_type,
-                        start=start,
-                        end=start + BATCH_SIZE,
-                        total=total,
-                        site=site_configuration.site.domain
+                    'Syncing {object_type}s batch from {start} to {end} for site {site}'.format(
+                        object_type=object_type, start=start, end=start + len(batch), site=site
                     )
                 )
-                self._hubspot_endpoint(
+                pending[executor.submit(self._upsert_batch, object_type, batch, site_configuration)] = (
+                    start, len(batch)
+                )
+                # Objects are only read from the database as fast as they are uploaded.
+                if len(pending) >= self.max_workers:
+                    done, __ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(list(pending))
+
+        seconds = time.time() - start_time
+        self.stdout.write(
+            'Synced {count} {object_type}s for site {site} in {seconds:.2f} seconds '
+            '({rate:.1f} objects/second).'.format(
+                count=synced, object_type=object_type, site=site, seconds=seconds,
+                rate=synced / seconds if seconds else synced
+            )
+        )
+        return not failed
+
+    def _iter_batches(self, objects):
+        """
+        Yields the start index and objects of each batch of BATCH_SIZE objects.
+        """
+        batch = []
+        start = 0
+        for hubspot_object in objects:
+            batch.append(hubspot_object)
+            if len(batch) == BATCH_SIZE:
+                yield start, batch
+                start += len(batch)
+                batch = []
+        if batch:
+            yield start, batch
+
+    def _upsert_batch(self, object_type, batch, site_configuration):
+        """
+        Upserts a batch of objects, retrying with an exponential backoff when Hubspot is unavailable
+        or rate limits the requests.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._hubspot_endpoint(
                     object_type,
                     'extensions/ecomm/v1/sync-messages/',
                     'PUT',
                     body=batch,
                     hapikey=site_configuration.hubspot_secret_key
                 )
-                self.stdout.write(
-                    'Successfully synced {object_type}s batch from {start} to {end} of total: '
-                    '{total} for site {site}'.format(
-                        object_type=object_type,
-                        start=start,
-                        end=start + BATCH_SIZE,
-                        total=total,
-                        site=site_configuration.site.domain
-                    )
-                )
-        except (HTTPError, RequestException) as ex:
-            self.stderr.write(
-                'An error occurred while upserting {object_type} for site {site}: {message}'.format(
-                    object_type=object_type, site=site_configuration.site.domain, message=ex
-                )
-            )
+            except requests.JSONDecodeError:
+                # Hubspot accepted the batch, only the body of its answer is not JSON.
+                return None
+            except (HTTPError, ConnectionError, Timeout) as ex:
+                if attempt >= self.max_retries or not self._is_retryable(ex):
+                    raise
+            time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            attempt += 1
+
+    def _is_retryable(self, exception):
+        response = getattr(exception, 'response', None)
+        if response is None:
+            return isinstance(exception, (ConnectionError, Timeout))
+        return response.status_code == 429 or response.status_code >= 500
 
     def _call_sync_errors_messages_endpoint(self, site_configuration):
         """
@@ -451,61 +530,136 @@ class Command(BaseCommand):
                 )
             )
 
-    def _get_unsynced_carts(self, site_configuration):
+    def _get_sync_window(self, site_configuration):
+        """
+        Returns the start and end of the period whose baskets are synced. The period starts where the last
+        successful sync ended or, for the first sync of a site, `initial_sync_days` days before today.
+        """
+        end = timezone.now() - timedelta(minutes=self.lag_minutes)
+        start = site_configuration.hubspot_last_synced
+        if start is None:
+            today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            start = today - timedelta(days=self.initial_sync_days)
+        return start, end
+
+    def _get_unsynced_carts(self, site_configuration, start, end):
+        """
+        Returns the baskets with lines created or submitted between start and end, or None if there is none.
+        """
         carts = Basket.objects.filter(site=site_configuration.site, lines__isnull=False)
-        start_date = datetime.now().date() - timedelta(self.initial_sync_days)
         unsynced_carts = carts.filter(
-            Q(date_created__date=start_date) | Q(date_submitted__date=start_date)
-        )
+            Q(date_created__gte=start, date_created__lt=end) | Q(date_submitted__gte=start, date_submitted__lt=end)
+        ).distinct()
+        count = unsynced_carts.count()
         self.stdout.write(
-            'Pulled unsynced carts for site {site} from {start_date} and total count is total: {count}'.format(
-                site=site_configuration.site.domain, start_date=start_date, count=unsynced_carts.count()
+            'Pulled unsynced carts for site {site} from {start} to {end} and total count is total: {count}'.format(
+                site=site_configuration.site.domain, start=start, end=end, count=count
             )
         )
-        return unsynced_carts
+        return unsynced_carts if count else None
+
+    def _iter_carts(self, carts):
+        """
+        Yields the given baskets, read in chunks along with their lines and orders.
+        """
+        carts = carts.select_related('owner').prefetch_related(
+            Prefetch('lines', queryset=CartLine.objects.select_related('product__course').order_by('id')),
+            Prefetch(
+                'order_set',
+                queryset=Order.objects.select_related('user').order_by('id'),
+                to_attr='hubspot_orders',
+            ),
+        ).order_by('id')
+        last_id = 0
+        while True:
+            chunk = list(carts.filter(id__gt=last_id)[:CART_CHUNK_SIZE])
+            for cart in chunk:
+                # Used by all_lines(), which would otherwise query the lines again.
+                cart._lines = list(cart.lines.all())  # pylint: disable=protected-access
+                yield cart
+            if len(chunk) < CART_CHUNK_SIZE:
+                return
+            last_id = chunk[-1].id
 
     def _sync_data(self, site_configuration):
         """
-        Create lists of Order, OrderLine and Product objects and
+        Stream Order, OrderLine and Product objects and
         call upsert(PUT) sync-messages endpoint for each objects.
         """
-        unsynced_carts = self._get_unsynced_carts(site_configuration)
-        if unsynced_carts:
+        start, end = self._get_sync_window(site_configuration)
+        unsynced_carts = self._get_unsynced_carts(site_configuration, start, end)
+        if unsynced_carts is not None:
             # we need to exclude the CartLines without product
             # because product is required in hubspot for LINE_ITEM.
             unsynced_cart_lines = CartLine.objects.filter(basket__in=unsynced_carts).exclude(product=None)
-            unsynced_products = Product.objects.filter(basket_lines__in=unsynced_cart_lines)
-            unsynced_users = User.objects.filter(baskets__in=unsynced_carts)
-            self._upsert_hubspot_objects(
-                CONTACT,
-                self._get_hubspot_contact_structure(unsynced_users),
-                site_configuration
-            )
-            self._upsert_hubspot_objects(
-                PRODUCT,
-                self._get_hubspot_product_structure(unsynced_products),
-                site_configuration
-            )
-            self._upsert_hubspot_objects(
-                DEAL,
-                self._get_hubspot_deal_structure(unsynced_carts, site_configuration.partner),
-                site_configuration
-            )
-            self._upsert_hubspot_objects(
-                LINE_ITEM,
-                self._get_hubspot_line_item_structure(unsynced_cart_lines),
-                site_configuration
-            )
+            unsynced_products = Product.objects.filter(
+                basket_lines__in=unsynced_cart_lines
+            ).distinct().select_related('course')
+            unsynced_users = User.objects.filter(baskets__in=unsynced_carts).distinct()
+            results = [
+                self._upsert_hubspot_objects(
+                    CONTACT,
+                    self._get_hubspot_contact_structure(unsynced_users.iterator()),
+                    site_configuration
+                ),
+                self._upsert_hubspot_objects(
+                    PRODUCT,
+                    self._get_hubspot_product_structure(unsynced_products.iterator()),
+                    site_configuration
+                ),
+                self._upsert_hubspot_objects(
+                    DEAL,
+                    self._get_hubspot_deal_structure(self._iter_carts(unsynced_carts), site_configuration.partner),
+                    site_configuration
+                ),
+                self._upsert_hubspot_objects(
+                    LINE_ITEM,
+                    self._get_hubspot_line_item_structure(unsynced_cart_lines.order_by('id').iterator()),
+                    site_configuration
+                ),
+            ]
+            if not all(results):
+                self.stderr.write(
+                    'Some objects failed to sync for site {site}. Baskets from {start} will be synced again.'.format(
+                        site=site_configuration.site.domain, start=start
+                    )
+                )
+                return
         else:
             self.stdout.write('No data found to sync for site {site}'.format(site=site_configuration.site.domain))
 
+        # Saving the whole site configuration would clear the site and payment processor caches.
+        SiteConfiguration.objects.filter(id=site_configuration.id).update(hubspot_last_synced=end)
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--initial-sync-days',
             default=DEFAULT_INITIAL_DAYS,
             dest='initial_sync_days',
             type=int,
-            help='Number of days before today to start initial sync',
+            help='Number of days before today to start the initial sync of sites never synced before',
+        )
+        parser.add_argument(
+            '--lag-minutes',
+            default=DEFAULT_LAG_MINUTES,
+            dest='lag_minutes',
+            type=int,
+            help='Baskets created or submitted more recently are left to the next sync, to be synced with '
+                 'their lines',
+        )
+        parser.add_argument(
+            '--max-workers',
+            default=DEFAULT_MAX_WORKERS,
+            dest='max_workers',
+            type=int,
+            help='Maximum number of batches uploaded to Hubspot at once',
+        )
+        parser.add_argument(
+            '--max-retries',
+            default=DEFAULT_MAX_RETRIES,
+            dest='max_retries',
+            type=int,
+            help='Number of times the upload of a batch is retried when Hubspot is unavailable',
         )
 
     def handle(self, *args, **options):
@@ -513,6 +667,9 @@ class Command(BaseCommand):
         Main command handler.
         """
         self.initial_sync_days = options['initial_sync_days']
+        self.lag_minutes = options['lag_minutes']
+        self.max_workers = options['max_workers']
+        self.max_retries = options['max_retries']
         try:
             site_configurations = self._get_hubspot_enable_sites()
             if not site_configurations:
@@ -0,0 +1,31 @@
+"""
+Tests for Django management command to benchmark the SDN fallback matchers.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from ecommerce.extensions.test import factories as extensions_factories
+from ecommerce.tests.testcases import TestCase
+
+
+class TestBenchmarkSdnFallbackCommand(TestCase):
+
+    def test_handle(self):
+        """ Verify both matchers are run and agree on the current SDN data. """
+        metadata = extensions_factories.SDNFallbackMetadataFactory.create(import_state='Current')
+        extensions_factories.SDNFallbackDataFactory.create_batch(
+            5, sdn_fallback_metadata=metadata, names='juan de la cruz', addresses='north kristinaport',
+            countries='SN'
+        )
+        out = StringIO()
+        call_command('benchmark_sdn_fallback', '--checks=10', '--seed=1', stdout=out)
+        output = out.getvalue()
+        self.assertIn('Ran 10 checks (5 hits).', output)
+        self.assertIn('Mismatches:    0', output)
+
+    def test_handle_without_data(self):
+        """ Verify the command fails when no SDN data has been imported. """
+        with self.assertRaises(CommandError):
+            call_command('benchmark_sdn_fallback')
@@ -6,13 +6,14 @@ Test the sync_hubspot management command
 from datetime import datetime, timedelta
 from io import StringIO
 
+import requests
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from factory.django import get_model
-from mock import patch
-from requests.exceptions import HTTPError
+from mock import Mock, patch
+from requests.exceptions import HTTPError, TooManyRedirects
 
-from ecommerce.core.management.commands.sync_hubspot import EXPECTED_METHODS
+from ecommerce.core.management.commands.sync_hubspot import EXPECTED_METHODS, HUBSPOT_REQUEST_TIMEOUT_SECONDS
 from ecommerce.core.management.commands.sync_hubspot import Command as sync_command
 from ecommerce.extensions.test.factories import create_basket, create_order
 from ecommerce.tests.factories import SiteConfigurationFactory, UserFactory
@@ -208,6 +209,19 @@ class TestSyncHubspotCommand(TestCase):
             self.assertIn('Successfully installed hubspot ecommerce bridge', output)
             self.assertIn('Successfully defined the hubspot ecommerce settings', output)
 
+    def test_hubspot_endpoint_empty_response(self):
+        """
+        Test _hubspot_endpoint accepts successful responses without a body, and sets a timeout on its requests.
+        """
+        command = sync_command()
+        with patch('ecommerce.core.management.commands.sync_hubspot.requests.request') as mock_client:
+            mock_client.return_value = Mock(status_code=204, content=b'')
+            response = command._hubspot_endpoint(  # pylint: disable=W0212
+                'DEAL', 'extensions/ecomm/v1/sync-messages/', 'PUT', body=[{}], hapikey='test_key'
+            )
+        self.assertIsNone(response)
+        self.assertEqual(mock_client.call_args[1]['timeout'], HUBSPOT_REQUEST_TIMEOUT_SECONDS)
+
     @patch.object(sync_command, '_hubspot_endpoint')
     def test_with_exception(self, mocked_hubspot):      # pylint: disable=unused-argument
         """
@@ -234,3 +248,77 @@ class TestSyncHubspotCommand(TestCase):
                 api_url="fake_url",
                 method=unsupported_method
             )
+
+    @patch.object(sync_command, '_hubspot_endpoint')
+    def test_incremental_sync(self, mocked_hubspot):
+        """
+        Test the baskets are synced from where the last successful sync ended.
+        """
+        with patch.object(sync_command, '_install_hubspot_ecommerce_bridge', return_value=True), \
+                patch.object(sync_command, '_define_hubspot_ecommerce_settings', return_value=True), \
+                patch.object(sync_command, '_call_sync_errors_messages_endpoint'):
+            # if a batch cannot be synced, the same baskets are synced by the next run
+            mocked_hubspot.side_effect = HTTPError
+            self._get_command_output()
+            self.hubspot_site_configuration.refresh_from_db()
+            self.assertIsNone(self.hubspot_site_configuration.hubspot_last_synced)
+
+            mocked_hubspot.side_effect = None
+            output = self._get_command_output()
+            self.assertIn('Synced 2 DEALs for site {site}'.format(site=self.hubspot_site_configuration.site.domain),
+                          output)
+            self.hubspot_site_configuration.refresh_from_db()
+            self.assertIsNotNone(self.hubspot_site_configuration.hubspot_last_synced)
+
+            output = self._get_command_output()
+            self.assertIn(
+                'No data found to sync for site {site}'.format(site=self.hubspot_site_configuration.site.domain),
+                output
+            )
+
+    @patch('ecommerce.core.management.commands.sync_hubspot.time.sleep')
+    @patch.object(sync_command, '_hubspot_endpoint')
+    def test_upsert_retries(self, mocked_hubspot, mocked_sleep):
+        """
+        Test the upload of a batch is retried, with an exponential backoff, when Hubspot is unavailable.
+        """
+        command = sync_command()
+        command.max_retries = 2
+        unavailable = HTTPError(response=Mock(status_code=503))
+        mocked_hubspot.side_effect = [unavailable, unavailable, {}]
+        command._upsert_batch('DEAL', [{}], self.hubspot_site_configuration)  # pylint: disable=W0212
+        self.assertEqual(mocked_hubspot.call_count, 3)
+        self.assertEqual([call[0][0] for call in mocked_sleep.call_args_list], [1, 2])
+
+        # errors which would happen again are not retried
+        mocked_hubspot.reset_mock()
+        mocked_hubspot.side_effect = HTTPError(response=Mock(status_code=400))
+        with self.assertRaises(HTTPError):
+            command._upsert_batch('DEAL', [{}], self.hubspot_site_configuration)  # pylint: disable=W0212
+        self.assertEqual(mocked_hubspot.call_count, 1)
+
+    @patch('ecommerce.core.management.commands.sync_hubspot.time.sleep')
+    @patch.object(sync_command, '_hubspot_endpoint')
+    def test_upsert_request_error(self, mocked_hubspot, mocked_sleep):
+        """
+        Test a batch failing with a request error is not retried, and only fails that batch.
+        """
+        with patch.object(sync_command, '_install_hubspot_ecommerce_bridge', return_value=True), \
+                patch.object(sync_command, '_define_hubspot_ecommerce_settings', return_value=True), \
+                patch.object(sync_command, '_call_sync_errors_messages_endpoint'):
+            mocked_hubspot.side_effect = TooManyRedirects('Exceeded 30 redirects.')
+            output = self._get_command_output(is_stderr=True)
+        self.assertIn('An error occurred while upserting', output)
+        self.assertFalse(mocked_sleep.called)
+        self.hubspot_site_configuration.refresh_from_db()
+        self.assertIsNone(self.hubspot_site_configuration.hubspot_last_synced)
+
+    @patch.object(sync_command, '_hubspot_endpoint')
+    def test_upsert_undecodable_response(self, mocked_hubspot):
+        """
+        Test a batch accepted by Hubspot counts as synced even if the body of the response is not JSON.
+        """
+        command = sync_command()
+        mocked_hubspot.side_effect = requests.JSONDecodeError('Expecting value', '', 0)
+        self.assertIsNone(command._upsert_batch('DEAL', [{}], self.hubspot_site_configuration))  # pylint: disable=W0212
+        self.assertEqual(mocked_hubspot.call_count, 1)
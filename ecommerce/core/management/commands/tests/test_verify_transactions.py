@@ -9,6 +9,8 @@ import ddt
 import pytz
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from oscar.core.loading import get_class, get_model
 from oscar.test.factories import OrderFactory, OrderLineFactory, ProductFactory
 
@@ -114,6 +116,26 @@ class VerifyTransactionsTest(TestCase):
         except CommandError as e:
             self.fail("Failed to verify transactions when no errors were expected. {}".format(e))
 
+    def test_query_count_independent_of_orders(self):
+        """ Verify the number of queries does not grow with the number of orders and payment events """
+        def add_paid_order():
+            order = OrderFactory(total_incl_tax=90, date_placed=self.timestamp)
+            OrderLineFactory(order=order, product=self.product, partner_sku='test_sku')
+            for event_type in (self.payevent, self.refundevent):
+                PaymentEventFactory(order=order, amount=90, event_type_id=event_type.id, date_created=self.timestamp)
+
+        self.order.delete()
+        add_paid_order()
+        with CaptureQueriesContext(connection) as single_order_queries:
+            call_command('verify_transactions')
+
+        for __ in range(4):
+            add_paid_order()
+        with CaptureQueriesContext(connection) as many_orders_queries:
+            call_command('verify_transactions')
+
+        self.assertEqual(len(many_orders_queries), len(single_order_queries))
+
     def test_zero_dollar_order(self):
         """ Verify zero dollar orders are not flagged as errors """
         total_incl_tax_before = self.order.total_incl_tax
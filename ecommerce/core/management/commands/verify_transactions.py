@@ -29,14 +29,15 @@ Example output:
 import datetime
 import json
 import logging
+import time
 
 import pytz
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Sum
+from django.db import connections
 from oscar.core.loading import get_class, get_model
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
-from ecommerce.core.utils import use_read_replica_if_available
+from ecommerce.core.db_router import read_replica
 
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
@@ -49,8 +50,20 @@ DEFAULT_END_DELTA_TIME = 60
 VALID_PRODUCT_CLASS_NAMES = [SEAT_PRODUCT_CLASS_NAME, COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME]
 
 
+class QueryCounter:
+    """ Database execute wrapper counting the queries it runs. """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
 class Command(BaseCommand):
     ERRORS_DICT = None
+    ORDER_COUNT = 0
     PAID_EVENT_TYPE = None
     REFUNDED_EVENT_TYPE = None
 
@@ -85,6 +98,7 @@ class Command(BaseCommand):
             help='Mismatched orders to go to Support'
         )
 
+    @read_replica()
     def handle(self, *args, **options):
         logger.info("Verify transactions with options: %r", options)
 
@@ -101,25 +115,38 @@ class Command(BaseCommand):
         end = datetime.datetime.now(pytz.utc) - datetime.timedelta(minutes=end_delta)
         logger.info("Start time: %s  --  End time: %s", start, end)
 
-        orders = use_read_replica_if_available(Order.objects.all()
-                                               .filter(date_placed__gte=start, date_placed__lt=end)
-                                               .prefetch_related('payment_events__event_type'))
-        logger.info("Number of orders to verify: %s", orders.count())
-        if orders.count() == 0:
-            logger.info("No orders, DONE")
-            return
-
-        if support:
-            self.handle_support(orders)
-        else:
-            self.handle_alert(orders, threshold)
+        # Payment events and order lines are prefetched, so that validating an order does not query the database.
+        orders = (Order.objects.all()
+                  .filter(date_placed__gte=start, date_placed__lt=end)
+                  .prefetch_related('payment_events__event_type',
+                                    'lines__product__product_class',
+                                    'lines__product__parent__product_class'))
+        query_counter = QueryCounter()
+        verification_start = time.time()
+        with connections[orders.db].execute_wrapper(query_counter):
+            self.ORDER_COUNT = orders.count()
+            logger.info("Number of orders to verify: %s", self.ORDER_COUNT)
+            if self.ORDER_COUNT == 0:
+                logger.info("No orders, DONE")
+                return
+
+            try:
+                if support:
+                    self.handle_support(orders)
+                else:
+                    self.handle_alert(orders, threshold)
+            finally:
+                logger.info(
+                    "Verified %d orders in %.2f seconds with %d queries.",
+                    self.ORDER_COUNT, time.time() - verification_start, query_counter.count
+                )
 
-    def process_errors(self, orders):
+    def process_errors(self):
         # FIXME: it is possible for an order to have more than one error, so this really should
         # count "unique orders with errors", not number of errors
         error_count = sum([len(v["errors"]) for v in self.ERRORS_DICT.values()])
         exit_errors = json.dumps(self.ERRORS_DICT)
-        error_rate = float(error_count) / orders.count()
+        error_rate = float(error_count) / self.ORDER_COUNT
 
         logger.info("Summary: %d errors, %.1f %%", error_count, error_rate * 100.0)
 
@@ -129,7 +156,7 @@ class Command(BaseCommand):
         for order in orders:
             self.validate_order(order)
 
-        error_count, exit_errors, error_rate = self.process_errors(orders)
+        error_count, exit_errors, error_rate = self.process_errors()
 
         if threshold == 0 or threshold >= 1:
             threshold = int(threshold)
@@ -144,11 +171,10 @@ class Command(BaseCommand):
 
     def handle_support(self, orders):
         for order in orders:
-            all_payment_events = order.payment_events
-            payments = all_payment_events.filter(event_type=self.PAID_EVENT_TYPE)
+            payments = self.get_payment_events(order, self.PAID_EVENT_TYPE)
 
             # If the payment total and the order total do not match, flag for review.
-            if payments.count() == 1 and payments[0].amount != order.total_incl_tax:
+            if len(payments) == 1 and payments[0].amount != order.total_incl_tax:
                 mismatch_total = float(payments[0].amount - order.total_incl_tax)
                 # FIXME: validate_order should be changed to log _all_ errors related to an order
                 # If payment amount > order amount, a refund is required from Support
@@ -169,18 +195,29 @@ class Command(BaseCommand):
                         error_dict=error_dict,
                     )
 
-        error_count, exit_errors, error_rate = self.process_errors(orders)
+        error_count, exit_errors, error_rate = self.process_errors()
         if error_count and error_rate > 0:
             raise CommandError("Errors in transactions: {errors}".format(errors=exit_errors))
 
+    @staticmethod
+    def get_payment_events(order, event_type):
+        """ Returns the prefetched payment events of the given type for the order. """
+        return [event for event in order.payment_events.all() if event.event_type_id == event_type.id]
+
+    @staticmethod
+    def sum_amounts(payment_events):
+        """ Returns the total amount of the given payment events, or None if there are none (like Sum). """
+        return sum(event.amount for event in payment_events) if payment_events else None
+
     def validate_order(self, order):
-        all_payment_events = order.payment_events
-        refunds = all_payment_events.filter(event_type=self.REFUNDED_EVENT_TYPE)
-        payments = all_payment_events.filter(event_type=self.PAID_EVENT_TYPE)
+        refunds = self.get_payment_events(order, self.REFUNDED_EVENT_TYPE)
+        payments = self.get_payment_events(order, self.PAID_EVENT_TYPE)
+        refund_total = self.sum_amounts(refunds)
+        payment_total = self.sum_amounts(payments)
 
         # If a coupon is used to purchase a product for the full price, there will be no PaymentEvent
         # so we must also verify that order had a price > 0.
-        if payments.count() == 0:
+        if not payments:
             if self.order_requires_payment(order) and order.total_incl_tax > 0:
                 self.add_error(
                     "orders_no_payment",
@@ -189,7 +226,7 @@ class Command(BaseCommand):
                 )
 
         # We do not support multi-payment today, so flag this for review.
-        elif payments.count() > 1:
+        elif len(payments) > 1:
             self.add_error(
                 "orders_multi_payment",
                 "The following orders had multiple payments",
@@ -198,7 +235,7 @@ class Command(BaseCommand):
             )
 
         # If the payment total and the order total do not match, flag for review.
-        elif payments.aggregate(total=Sum('amount')).get('total') != order.total_incl_tax:
+        elif payment_total != order.total_incl_tax:
             # FIXME: validate_order should be changed to log _all_ errors related to an order
             self.add_error(
                 "orders_mismatched_totals",
@@ -207,8 +244,6 @@ class Command(BaseCommand):
                 payments
             )
 
-        refund_total = refunds.aggregate(total=Sum('amount')).get('total')
-        payment_total = payments.aggregate(total=Sum('amount')).get('total')
         if refund_total is not None and refund_total > payment_total:
             self.add_error(
                 "orders_refund_exceeded",
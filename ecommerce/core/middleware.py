@@ -0,0 +1,32 @@
+"""
+Middleware for the core app.
+"""
+
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from ecommerce.core.db_router import is_pinned_to_primary, read_replica_configured, reset_pinning
+
+PRIMARY_PINNED_COOKIE_NAME = 'ecommerce_primary_pinned'
+
+
+class ReadReplicaPinningMiddleware(MiddlewareMixin):
+    """
+    Middleware that pins the requests of a client to the primary database for READ_REPLICA_PIN_SECONDS after one
+    of its requests wrote to the database, so that the replication lag of the read replica never hides that write.
+    Requests that may write (e.g. POST) are pinned from the start.
+    """
+
+    def process_request(self, request):
+        reset_pinning(
+            PRIMARY_PINNED_COOKIE_NAME in request.COOKIES or request.method not in ('GET', 'HEAD', 'OPTIONS')
+        )
+
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        if read_replica_configured() and is_pinned_to_primary():
+            response.set_cookie(
+                PRIMARY_PINNED_COOKIE_NAME, 'true', max_age=settings.READ_REPLICA_PIN_SECONDS, httponly=True
+            )
+        reset_pinning()
+        return response
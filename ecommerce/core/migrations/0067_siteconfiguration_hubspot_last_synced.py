@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 21:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0066_remove_account_microfrontend_url_field_from_SiteConfiguration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='siteconfiguration',
+            name='hubspot_last_synced',
+            field=models.DateTimeField(blank=True, help_text='Baskets created or submitted before this time have been synced to Hubspot', null=True, verbose_name='Hubspot Last Synced'),
+        ),
+    ]
@@ -12,18 +12,19 @@ from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from edx_django_utils import monitoring as monitoring_utils
 from edx_rbac.models import UserRole, UserRoleAssignment
-from edx_rest_api_client.client import OAuthAPIClient
 from jsonfield.fields import JSONField
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import RequestException, Timeout
 from simple_history.models import HistoricalRecords
 
-from ecommerce.core.constants import ALL_ACCESS_CONTEXT, ALLOW_MISSING_LMS_USER_ID
+from ecommerce.core.api_clients import oauth_api_client_registry
+from ecommerce.core.constants import ALL_ACCESS_CONTEXT, ALLOW_MISSING_LMS_USER_ID, LMS_USER_SEARCH_EMAILS_BATCH_SIZE
 from ecommerce.core.exceptions import MissingLmsUserIdException
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.extensions.basket.constants import ENABLE_STRIPE_PAYMENT_PROCESSOR
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class, get_processor_class_by_name
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.payment.registry import payment_processor_registry
 
 log = logging.getLogger(__name__)
 
@@ -189,6 +190,12 @@ class SiteConfiguration(models.Model):
         max_length=255,
         blank=True
     )
+    hubspot_last_synced = models.DateTimeField(
+        verbose_name=_('Hubspot Last Synced'),
+        help_text=_('Baskets created or submitted before this time have been synced to Hubspot'),
+        null=True,
+        blank=True
+    )
     enable_microfrontend_for_basket_page = models.BooleanField(
         verbose_name=_('Enable Microfrontend for Basket Page'),
         help_text=_('Use the microfrontend implementation of the basket page instead of the server-side template'),
@@ -250,8 +257,7 @@ class SiteConfiguration(models.Model):
 
     def _all_payment_processors(self):
         """ Returns all processor classes declared in settings. """
-        all_processors = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
-        return all_processors
+        return payment_processor_registry.get_processor_classes()
 
     def get_payment_processors(self):
         """
@@ -260,20 +266,17 @@ class SiteConfiguration(models.Model):
         Returns:
             list[BasePaymentProcessor]: Returns payment processor classes enabled for the corresponding Site
         """
-        all_processors = self._all_payment_processors()
-        all_processor_names = {processor.NAME for processor in all_processors}
+        processor_names = frozenset(self.payment_processors_set)
+        all_processor_names = {processor.NAME for processor in self._all_payment_processors()}
 
-        missing_processor_configurations = self.payment_processors_set - all_processor_names
+        missing_processor_configurations = processor_names - all_processor_names
         if missing_processor_configurations:
             processor_config_repr = ", ".join(missing_processor_configurations)
             log.warning(
                 'Unknown payment processors [%s] are configured for site %s', processor_config_repr, self.site.id
             )
 
-        return [
-            processor for processor in all_processors
-            if processor.NAME in self.payment_processors_set and processor.is_enabled()
-        ]
+        return payment_processor_registry.get_enabled_processors(processor_names)
 
     def get_client_side_payment_processor_class(self, request):
         """ Returns the payment processor class to be used for client-side payments.
@@ -291,9 +294,7 @@ class SiteConfiguration(models.Model):
             desired_processor = 'stripe'
 
         if self.client_side_payment_processor:
-            for processor in self._all_payment_processors():
-                if processor.NAME == desired_processor:
-                    return processor
+            return payment_processor_registry.get_processor_class_by_name(desired_processor)
 
         return None
 
@@ -315,6 +316,8 @@ class SiteConfiguration(models.Model):
         # Clear Site cache upon SiteConfiguration changed
         Site.objects.clear_cache()
         super(SiteConfiguration, self).save(*args, **kwargs)
+        oauth_api_client_registry.invalidate(self.site_id)
+        payment_processor_registry.invalidate()
 
     def build_ecommerce_url(self, path=''):
         """
@@ -390,14 +393,13 @@ class SiteConfiguration(models.Model):
         """
         This client is authenticated with the configured oauth settings and automatically cached.
 
+        The same client, and its pool of keep-alive connections, is shared by every caller in
+        the process for this site.
+
         Returns:
             requests.Session: API client
         """
-        return OAuthAPIClient(
-            settings.BACKEND_SERVICE_EDX_OAUTH2_PROVIDER_URL,
-            settings.BACKEND_SERVICE_EDX_OAUTH2_KEY,
-            settings.BACKEND_SERVICE_EDX_OAUTH2_SECRET,
-        )
+        return oauth_api_client_registry.get_client(self.site_id)
 
     @cached_property
     def embargo_api_url(self):
@@ -518,6 +520,28 @@ class User(AbstractUser):
                 log.exception('Failed to get users for emails: [%s], error: [%s]', user_emails, error)
         return []
 
+    @classmethod
+    def get_bulk_lms_user_ids_using_emails(cls, site, user_emails, batch_size=LMS_USER_SEARCH_EMAILS_BATCH_SIZE):
+        """Returns the lms_user ids of the given email addresses, querying LMS in batches.
+
+        Args:
+            site (Site): The site from which the LMS account API endpoint is created.
+            user_emails(iterable): Email addresses to search from LMS.
+            batch_size(int): Maximum number of email addresses sent in one request.
+
+        Returns (dict):
+            LMS User ids keyed by lowercased email address. Addresses not found in LMS are omitted.
+        """
+        user_emails = sorted({user_email for user_email in user_emails if user_email})
+        lms_user_ids_by_email = {}
+        for start in range(0, len(user_emails), batch_size):
+            for lms_user in cls.get_bulk_lms_users_using_emails(site, user_emails[start:start + batch_size]):
+                try:
+                    lms_user_ids_by_email[lms_user['email'].lower()] = lms_user['id']
+                except (KeyError, AttributeError):
+                    log.warning('Ignoring LMS user without an email or id: [%s]', lms_user)
+        return lms_user_ids_by_email
+
     def lms_user_id_with_metric(self, usage=None, allow_missing=False):
         """
         Returns the LMS user_id, or None if not found. Also sets a metric with the result.
@@ -0,0 +1,55 @@
+
+
+import responses
+from django.test import override_settings
+
+from ecommerce.core.api_clients import OAuthAPIClientRegistry
+from ecommerce.tests.testcases import TestCase
+
+
+class OAuthAPIClientRegistryTests(TestCase):
+    def setUp(self):
+        super(OAuthAPIClientRegistryTests, self).setUp()
+        self.registry = OAuthAPIClientRegistry()
+
+    def test_get_client_counts_hits_and_misses(self):
+        """ Verify a client is created once per site and re-used afterwards. """
+        client = self.registry.get_client(self.site.id)
+        self.assertIs(self.registry.get_client(self.site.id), client)
+        self.assertIsNot(self.registry.get_client(self.site.id + 1), client)
+        self.assertEqual(self.registry.hits, 1)
+        self.assertEqual(self.registry.misses, 2)
+
+    def test_get_client_with_new_credentials(self):
+        """ Verify a new client is created when the OAuth credentials change. """
+        client = self.registry.get_client(self.site.id)
+        with override_settings(BACKEND_SERVICE_EDX_OAUTH2_KEY='another-key'):
+            self.assertIsNot(self.registry.get_client(self.site.id), client)
+
+    def test_invalidate(self):
+        """ Verify invalidating a site only drops the clients of that site. """
+        client = self.registry.get_client(self.site.id)
+        other_client = self.registry.get_client(self.site.id + 1)
+
+        self.registry.invalidate(self.site.id)
+        self.assertIsNot(self.registry.get_client(self.site.id), client)
+        self.assertIs(self.registry.get_client(self.site.id + 1), other_client)
+
+        self.registry.invalidate()
+        self.assertEqual(self.registry.misses, 0)
+        self.assertIsNot(self.registry.get_client(self.site.id + 1), other_client)
+
+    @responses.activate
+    def test_access_token_reused(self):
+        """ Verify the client fetches the access token once and re-uses it for later requests. """
+        token = self.mock_access_token_response()
+        url = 'http://api.example.com/resource/'
+        responses.add(responses.GET, url, json={})
+
+        client = self.registry.get_client(self.site.id)
+        client.get(url)
+        client.get(url)
+
+        token_calls = [call for call in responses.calls if call.request.url != url]
+        self.assertEqual(len(token_calls), 1)
+        self.assertEqual(client.auth.token, token)
@@ -0,0 +1,36 @@
+
+
+from django.core.cache import cache as django_cache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
+from mock import patch
+
+from ecommerce.core.cache_utils import get_many_from_all_tiers, set_many_all_tiers
+from ecommerce.tests.testcases import TestCase
+
+
+class CacheUtilsTests(TestCase):
+    def test_set_and_get_many(self):
+        """ Verify values set for many keys are read back from both tiers. """
+        set_many_all_tiers({'key-1': 1, 'key-2': 0}, 60)
+        self.assertEqual(TieredCache.get_cached_response('key-1').value, 1)
+
+        self.assertEqual(get_many_from_all_tiers(['key-1', 'key-2', 'key-3']), {'key-1': 1, 'key-2': 0})
+
+    def test_get_many_reads_django_cache_once(self):
+        """ Verify keys missing from the request cache are fetched with one call and copied into it. """
+        TieredCache.set_all_tiers('key-1', 'value-1', 60)
+        django_cache.set('key-2', 'value-2', 60)
+
+        with patch('ecommerce.core.cache_utils.django_cache.get_many', wraps=django_cache.get_many) as get_many:
+            self.assertEqual(
+                get_many_from_all_tiers(['key-1', 'key-2', 'key-3']), {'key-1': 'value-1', 'key-2': 'value-2'}
+            )
+            get_many.assert_called_once_with(['key-2', 'key-3'])
+
+        self.assertTrue(DEFAULT_REQUEST_CACHE.get_cached_response('key-2').is_found)
+
+    def test_set_many_with_no_data(self):
+        """ Verify nothing is written to the django cache when there is no data. """
+        with patch('ecommerce.core.cache_utils.django_cache.set_many') as set_many:
+            set_many_all_tiers({}, 60)
+            set_many.assert_not_called()
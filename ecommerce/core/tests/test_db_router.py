@@ -0,0 +1,146 @@
+import mock
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.views.generic import View
+
+from ecommerce.core.db_router import (
+    READ_REPLICA_DATABASE,
+    ReadReplicaMixin,
+    ReadReplicaRouter,
+    pin_to_primary,
+    read_replica,
+    reset_pinning,
+    reset_replica_lag
+)
+from ecommerce.core.middleware import PRIMARY_PINNED_COOKIE_NAME, ReadReplicaPinningMiddleware
+from ecommerce.core.models import User
+from ecommerce.tests.testcases import TestCase
+
+DATABASES_WITH_REPLICA = dict(settings.DATABASES, **{READ_REPLICA_DATABASE: settings.DATABASES[DEFAULT_DB_ALIAS]})
+
+
+class RoutedView(ReadReplicaMixin, View):
+    def get(self, request):  # pylint: disable=unused-argument
+        return HttpResponse(ReadReplicaRouter().db_for_read(User))
+
+    def post(self, request):  # pylint: disable=unused-argument
+        return HttpResponse(ReadReplicaRouter().db_for_read(User))
+
+
+class StreamingRoutedView(ReadReplicaMixin, View):
+    def get(self, request):  # pylint: disable=unused-argument
+        return StreamingHttpResponse(ReadReplicaRouter().db_for_read(User) for __ in range(2))
+
+
+@override_settings(DATABASES=DATABASES_WITH_REPLICA)
+class ReadReplicaRouterTests(TestCase):
+    def setUp(self):
+        super(ReadReplicaRouterTests, self).setUp()
+        self.router = ReadReplicaRouter()
+        reset_pinning()
+        reset_replica_lag()
+        self.addCleanup(reset_pinning)
+        self.addCleanup(reset_replica_lag)
+
+    def test_reads_use_primary_by_default(self):
+        """ Verify reads go to the primary database unless they opt in to the read replica. """
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+        with read_replica():
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DATABASE)
+            with read_replica():
+                self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DATABASE)
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DATABASE)
+
+        self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_writes_pin_to_primary(self):
+        """ Verify writes go to the primary database, as do the reads that follow them. """
+        with read_replica():
+            self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_session_writes_do_not_pin_to_primary(self):
+        """ Verify saving sessions, which most requests of logged in users do, does not pin to the primary. """
+        with read_replica():
+            self.assertEqual(self.router.db_for_write(Session), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DATABASE)
+
+    def test_lagging_replica(self):
+        """ Verify reads go to the primary while the replica lags more than the pin window, or its lag is unknown. """
+        for lag in (settings.READ_REPLICA_PIN_SECONDS, None):
+            reset_replica_lag()
+            with mock.patch('ecommerce.core.db_router._measure_replica_lag', return_value=lag), read_replica():
+                self.assertEqual(self.router.db_for_read(User), DEFAULT_DB_ALIAS)
+
+    def test_replica_lag_measured_periodically(self):
+        """ Verify the replication lag is measured at most once every READ_REPLICA_LAG_CHECK_SECONDS. """
+        with mock.patch('ecommerce.core.db_router._measure_replica_lag', return_value=1) as mock_measure:
+            with read_replica():
+                self.router.db_for_read(User)
+                self.router.db_for_read(User)
+            self.assertEqual(mock_measure.call_count, 1)
+
+            with override_settings(READ_REPLICA_LAG_CHECK_SECONDS=0), read_replica():
+                self.router.db_for_read(User)
+            self.assertEqual(mock_measure.call_count, 2)
+
+    @override_settings(DATABASES={DEFAULT_DB_ALIAS: settings.DATABASES[DEFAULT_DB_ALIAS]})
+    def test_without_read_replica(self):
+        """ Verify the router lets Django pick the database when no read replica is configured. """
+        with read_replica():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_allow_migrate(self):
+        """ Verify migrations are never run on the read replica. """
+        self.assertFalse(self.router.allow_migrate(READ_REPLICA_DATABASE, 'core'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'core'))
+
+    def test_mixin(self):
+        """ Verify views using the mixin read from the replica on safe requests only. """
+        factory = RequestFactory()
+        self.assertEqual(RoutedView.as_view()(factory.get('/')).content.decode(), READ_REPLICA_DATABASE)
+        self.assertEqual(RoutedView.as_view()(factory.post('/')).content.decode(), DEFAULT_DB_ALIAS)
+
+        pin_to_primary()
+        self.assertEqual(RoutedView.as_view()(factory.get('/')).content.decode(), DEFAULT_DB_ALIAS)
+
+    def test_mixin_streaming(self):
+        """ Verify the content of streaming responses is generated with reads from the replica. """
+        response = StreamingRoutedView.as_view()(RequestFactory().get('/'))
+        self.assertEqual(b''.join(response.streaming_content).decode(), READ_REPLICA_DATABASE * 2)
+
+    def test_pinning_middleware(self):
+        """ Verify the requests following a write are pinned to the primary database. """
+        factory = RequestFactory()
+
+        def read(request):  # pylint: disable=unused-argument
+            with read_replica():
+                return HttpResponse(self.router.db_for_read(User))
+
+        def write(request):  # pylint: disable=unused-argument
+            User.objects.create(username='writer')
+            return HttpResponse()
+
+        response = ReadReplicaPinningMiddleware(read)(factory.get('/'))
+        self.assertEqual(response.content.decode(), READ_REPLICA_DATABASE)
+        self.assertNotIn(PRIMARY_PINNED_COOKIE_NAME, response.cookies)
+
+        response = ReadReplicaPinningMiddleware(write)(factory.get('/'))
+        self.assertEqual(response.cookies[PRIMARY_PINNED_COOKIE_NAME]['max-age'], settings.READ_REPLICA_PIN_SECONDS)
+
+        request = factory.get('/')
+        request.COOKIES[PRIMARY_PINNED_COOKIE_NAME] = 'true'
+        response = ReadReplicaPinningMiddleware(read)(request)
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
+
+        response = ReadReplicaPinningMiddleware(read)(factory.post('/'))
+        self.assertEqual(response.content.decode(), DEFAULT_DB_ALIAS)
+
+        # The pinning state does not leak into the following requests.
+        response = ReadReplicaPinningMiddleware(read)(factory.get('/'))
+        self.assertEqual(response.content.decode(), READ_REPLICA_DATABASE)
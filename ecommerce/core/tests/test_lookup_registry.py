@@ -0,0 +1,66 @@
+from django.test import override_settings
+from oscar.core.loading import get_model
+
+from ecommerce.core.lookup_registry import basket_attribute_types
+from ecommerce.extensions.basket.constants import EMAIL_OPT_IN_ATTRIBUTE
+from ecommerce.tests.testcases import TestCase
+
+BasketAttributeType = get_model('basket', 'BasketAttributeType')
+
+
+class LookupTableRegistryTests(TestCase):
+    def warm_and_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            basket_attribute_types.warm()
+
+    def test_get_uses_cached_rows(self):
+        """ Verify rows are read from the cache once the transaction that loaded them commits. """
+        self.warm_and_commit()
+
+        with self.assertNumQueries(0):
+            attribute_type = basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE)
+        self.assertEqual(attribute_type, BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE))
+
+    def test_rows_not_cached_before_commit(self):
+        """ Verify rows loaded in a transaction that has not committed are not cached. """
+        basket_attribute_types.warm()
+
+        with self.assertNumQueries(1):
+            basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE)
+
+    def test_get_missing_row(self):
+        """ Verify DoesNotExist is raised for unknown names, as it would be by the model manager. """
+        self.warm_and_commit()
+
+        with self.assertRaises(BasketAttributeType.DoesNotExist):
+            basket_attribute_types.get('does-not-exist')
+
+    def test_get_or_create(self):
+        """ Verify missing rows are created and existing ones are served from the cache. """
+        self.warm_and_commit()
+
+        with self.assertNumQueries(0):
+            __, created = basket_attribute_types.get_or_create(EMAIL_OPT_IN_ATTRIBUTE)
+        self.assertFalse(created)
+
+        attribute_type, created = basket_attribute_types.get_or_create('new-attribute')
+        self.assertTrue(created)
+        self.assertEqual(basket_attribute_types.get('new-attribute'), attribute_type)
+
+    def test_invalidated_on_save_and_delete(self):
+        """ Verify the cached rows are dropped when a row is saved or deleted. """
+        self.warm_and_commit()
+        attribute_type = BasketAttributeType.objects.create(name='new-attribute')
+        self.assertIsNone(basket_attribute_types._rows)  # pylint: disable=protected-access
+
+        self.warm_and_commit()
+        attribute_type.delete()
+        self.assertIsNone(basket_attribute_types._rows)  # pylint: disable=protected-access
+
+    @override_settings(LOOKUP_TABLE_REGISTRY_TIMEOUT=-1)
+    def test_expired_rows_are_reloaded(self):
+        """ Verify rows are loaded again once they have expired. """
+        self.warm_and_commit()
+
+        with self.assertNumQueries(1):
+            basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE)
@@ -25,6 +25,8 @@ from ecommerce.core.models import (
 from ecommerce.core.tests import toggle_switch
 from ecommerce.extensions.basket.constants import ENABLE_STRIPE_PAYMENT_PROCESSOR
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
+from ecommerce.extensions.payment.helpers import get_processor_class
+from ecommerce.extensions.payment.registry import PaymentProcessorRegistry
 from ecommerce.extensions.payment.tests.processors import AnotherDummyProcessor, DummyProcessor
 from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.mixins import LmsApiMockMixin
@@ -226,6 +228,25 @@ class UserTests(DiscoveryTestMixin, LmsApiMockMixin, TestCase):
                 user.deactivate_account(self.request.site.siteconfiguration)
                 self.assertTrue(mock_logger.called)
 
+    def test_get_bulk_lms_user_ids_using_emails(self):
+        """ Verify LMS user ids are looked up in batches and keyed by lowercased email. """
+        self.mock_bulk_lms_users_using_emails(self.request, [
+            {'lms_user_id': 11, 'username': 'first', 'email': 'First@example.com'},
+            {'lms_user_id': 12, 'username': 'second', 'email': 'second@example.com'},
+        ])
+
+        lms_user_ids = User.get_bulk_lms_user_ids_using_emails(
+            self.site, ['First@example.com', 'second@example.com', 'third@example.com', 'second@example.com', ''],
+            batch_size=2
+        )
+
+        self.assertEqual(lms_user_ids, {'first@example.com': 11, 'second@example.com': 12})
+        search_calls = [call for call in responses.calls if call.request.url.endswith('search_emails')]
+        self.assertEqual(
+            [json.loads(call.request.body)['emails'] for call in search_calls],
+            [['First@example.com', 'second@example.com'], ['third@example.com']]
+        )
+
 
 class BusinessClientTests(TestCase):
     def test_str(self):
@@ -330,6 +351,26 @@ class SiteConfigurationTests(TestCase):
         result = site_config.get_payment_processors()
         self.assertEqual(result, expected_result)
 
+    @override_settings(PAYMENT_PROCESSORS=[
+        'ecommerce.extensions.payment.tests.processors.DummyProcessor',
+        'ecommerce.extensions.payment.tests.processors.AnotherDummyProcessor',
+    ])
+    def test_get_payment_processors_uses_registry(self):
+        """ Verify processor classes are imported once, and switch changes are still picked up. """
+        site_config = _make_site_config('dummy')
+        self._enable_processor_switches([DummyProcessor])
+
+        with mock.patch('ecommerce.core.models.payment_processor_registry', PaymentProcessorRegistry()), \
+                mock.patch('ecommerce.extensions.payment.registry.get_processor_class',
+                           wraps=get_processor_class) as patched_get_processor_class:
+            self.assertEqual(site_config.get_payment_processors(), [DummyProcessor])
+            self.assertEqual(site_config.get_payment_processors(), [DummyProcessor])
+            self.assertEqual(patched_get_processor_class.call_count, 2)
+
+            toggle_switch(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + DummyProcessor.NAME, False)
+            self.assertEqual(site_config.get_payment_processors(), [])
+            self.assertEqual(patched_get_processor_class.call_count, 2)
+
     def test_get_client_side_payment_processor(self):
         """ Verify the method returns the client-side payment processor. """
         processor_name = 'cybersource'
@@ -373,10 +414,21 @@ class SiteConfigurationTests(TestCase):
         token = self.mock_access_token_response()
         site_config = SiteConfigurationFactory()
         client = site_config.oauth_api_client
-        self.assertEqual(type(client), OAuthAPIClient)
+        self.assertIsInstance(client, OAuthAPIClient)
         self.assertEqual(client.get_jwt_access_token(), token)
         self.assertEqual(len(responses.calls), 1)
 
+    def test_oauth_api_client_shared(self):
+        """
+        Verify the same client is returned for a site until its configuration is saved.
+        """
+        site_config = SiteConfigurationFactory()
+        client = site_config.oauth_api_client
+        self.assertIs(site_config.oauth_api_client, client)
+
+        site_config.save()
+        self.assertIsNot(site_config.oauth_api_client, client)
+
 
 class EcommerceFeatureRoleTests(TestCase):
     def test_str(self):
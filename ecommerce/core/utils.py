@@ -4,7 +4,6 @@ import logging
 from urllib.parse import parse_qs, urlparse
 
 import waffle
-from django.conf import settings
 from django.core.exceptions import ValidationError
 from edx_django_utils.cache import get_cache_key as get_django_cache_key
 
@@ -65,10 +64,3 @@ def deprecated_traverse_pagination(response, client, api_url):
         next_page = response.get('next')
 
     return results
-
-
-def use_read_replica_if_available(queryset):
-    """
-    If there is a database called 'read_replica', use that database for the queryset.
-    """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
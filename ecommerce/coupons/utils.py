@@ -89,6 +89,49 @@ def get_catalog_course_runs(site, query, limit=None, offset=None):
     return results
 
 
+def get_catalog_query_identifiers(site, query, page_size=100):
+    """
+    Get the keys of every course run matching the query, along with the UUIDs of their courses,
+    by walking through all pages of the Course Catalog API course runs endpoint.
+
+    Results are not cached, since callers use them to build their own long-lived index.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        query (str): ElasticSearch Query
+        page_size (int): Number of course runs requested per page
+
+    Returns:
+        set: Course run keys and course UUIDs of the course runs matching the query
+
+    Raises:
+        HTTPError: requests HTTPError.
+    """
+    api_client = site.siteconfiguration.oauth_api_client
+    api_url = urljoin(f"{site.siteconfiguration.discovery_api_url}/", "course_runs/")
+    params = {
+        "partner": site.siteconfiguration.partner.short_code,
+        "q": query,
+        "limit": page_size,
+        "offset": 0,
+    }
+
+    identifiers = set()
+    while True:
+        response = api_client.get(api_url, params=params)
+        response.raise_for_status()
+        results = response.json()
+
+        for course_run in results.get('results', []):
+            identifiers.add(course_run['key'])
+            if course_run.get('course_uuid'):
+                identifiers.add(str(course_run['course_uuid']))
+
+        if not results.get('next'):
+            return identifiers
+        params['offset'] += page_size
+
+
 def prepare_course_seat_types(course_seat_types):
     """
     Convert list of course seat types into comma-separated string.
@@ -257,14 +257,9 @@ class Course(models.Model):
                 attributes__name='id_verification_required',
                 attribute_values__value_boolean=not id_verification_required
             )
-            certificate_type_query = Q(
-                attributes__name='certificate_type',
-                attribute_values__value_text=certificate_type
-            )
-
             # Delete seats with a different verification requirement, assuming the seats
             # have not been purchased.
-            self.seat_products.filter(certificate_type_query).annotate(orders=Count('line')).filter(
+            self.seat_products.filter(certificate_type=certificate_type).annotate(orders=Count('line')).filter(
                 id_verification_required_query,
                 orders=0
             ).delete()
@@ -346,8 +341,7 @@ class Course(models.Model):
         if enrollment_code:
             if is_active:
                 seat = self.seat_products.filter(
-                    attributes__name='certificate_type',
-                    attribute_values__value_text=enrollment_code.attr.seat_type
+                    certificate_type=enrollment_code.attr.seat_type
                 ).order_by('-expires').first()
                 enrollment_code.expires = seat.expires if seat.expires else now() + timedelta(days=365)
             else:
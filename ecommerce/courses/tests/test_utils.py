@@ -2,9 +2,10 @@
 
 import ddt
 import responses
-from edx_django_utils.cache import TieredCache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
 from mock import patch
 from opaque_keys.edx.keys import CourseKey
+from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError as ReqConnectionError
 
 from ecommerce.core.utils import get_cache_key
@@ -14,12 +15,15 @@ from ecommerce.courses.utils import (
     get_certificate_type_display_value,
     get_course_catalogs,
     get_course_info_from_catalog,
-    mode_for_product
+    mode_for_product,
+    prefetch_course_info_from_catalog
 )
 from ecommerce.entitlements.utils import create_or_update_course_entitlement
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.tests.testcases import TestCase
 
+Product = get_model('catalogue', 'Product')
+
 
 @ddt.ddt
 class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
@@ -109,6 +113,53 @@ class UtilsTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
             _ = get_course_info_from_catalog(self.request.site, product)
             self.assertEqual(mocked_set_all_tiers.call_count, 2)
 
+    @ddt.data(1, 4)
+    @responses.activate
+    def test_prefetch_course_info_from_catalog(self, max_workers):
+        """ Verify the course run information of several products is retrieved once and kept for the request. """
+        self.mock_access_token_response()
+        seats = []
+        for __ in range(2):
+            course = CourseFactory(partner=self.partner)
+            seats.append(course.create_or_update_seat('verified', None, 100))
+            self.mock_course_run_detail_endpoint(course, discovery_api_url=self.site_configuration.discovery_api_url)
+
+        with self.settings(COURSE_INFO_PREFETCH_MAX_WORKERS=max_workers):
+            prefetch_course_info_from_catalog(self.request.site, seats)
+        num_calls = len(responses.calls)
+
+        for seat in seats:
+            self.assertEqual(get_course_info_from_catalog(self.request.site, seat)['key'], seat.attr.course_key)
+        self.assertEqual(len(responses.calls), num_calls)
+
+        # Information cached by previous requests is read from the cache without calling Discovery.
+        DEFAULT_REQUEST_CACHE.clear()
+        prefetch_course_info_from_catalog(self.request.site, seats)
+        self.assertEqual(len(responses.calls), num_calls)
+
+    @responses.activate
+    def test_prefetch_course_info_from_catalog_failure(self):
+        """ Verify a failed request is logged, and its error is raised again without requesting Discovery again. """
+        self.mock_access_token_response()
+        course = CourseFactory(partner=self.partner)
+        seat = course.create_or_update_seat('verified', None, 100)
+        responses.add(
+            responses.GET,
+            '{}course_runs/{}/?partner={}'.format(
+                self.site_configuration.discovery_api_url, course.id, self.partner.short_code
+            ),
+            body=ReqConnectionError(),
+        )
+
+        with patch('ecommerce.courses.utils.logger') as mock_logger:
+            prefetch_course_info_from_catalog(self.request.site, [seat])
+        self.assertTrue(mock_logger.exception.called)
+        num_calls = len(responses.calls)
+
+        with self.assertRaises(ReqConnectionError):
+            get_course_info_from_catalog(self.request.site, seat)
+        self.assertEqual(len(responses.calls), num_calls)
+
     @ddt.data(
         ('honor', 'Honor'),
         ('verified', 'Verified'),
@@ -1,13 +1,19 @@
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
-from edx_django_utils.cache import TieredCache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
 from opaque_keys.edx.keys import CourseKey
+from requests.exceptions import RequestException
 
+from ecommerce.core.cache_utils import get_many_from_all_tiers
 from ecommerce.core.utils import deprecated_traverse_pagination, get_cache_key
 
+logger = logging.getLogger(__name__)
+
 
 def mode_for_product(product):
     """
@@ -36,6 +42,11 @@ def _get_discovery_response(site, cache_key, resource, resource_id):
     Returns:
         dict: resource's information for given resource_id received from Discovery API
     """
+    # Requests that already failed while prefetching, see prefetch_course_info_from_catalog, are not sent again.
+    error_cached_response = DEFAULT_REQUEST_CACHE.get_cached_response(_get_discovery_error_cache_key(cache_key))
+    if error_cached_response.is_found:
+        raise error_cached_response.value
+
     course_cached_response = TieredCache.get_cached_response(cache_key)
     if course_cached_response.is_found:
         return course_cached_response.value
@@ -76,10 +87,7 @@ def get_course_detail(site, course_resource_id):
         dict: Course information received from Discovery API
     """
     resource = "courses"
-    cache_key = get_cache_key(
-        site_domain=site.domain,
-        resource="{}-{}".format(resource, course_resource_id)
-    )
+    cache_key = _get_discovery_cache_key(site, resource, course_resource_id)
     return _get_discovery_response(site, cache_key, resource, course_resource_id)
 
 
@@ -95,20 +103,82 @@ def get_course_run_detail(site, course_run_key):
         dict: CourseRun information received from Discovery API
     """
     resource = "course_runs"
-    cache_key = get_cache_key(
+    cache_key = _get_discovery_cache_key(site, resource, course_run_key)
+    return _get_discovery_response(site, cache_key, resource, course_run_key)
+
+
+def _get_discovery_cache_key(site, resource, resource_id):
+    return get_cache_key(
         site_domain=site.domain,
-        resource="{}-{}".format(resource, course_run_key)
+        resource="{}-{}".format(resource, resource_id)
     )
-    return _get_discovery_response(site, cache_key, resource, course_run_key)
+
+
+def _get_discovery_error_cache_key(cache_key):
+    return '{}-error'.format(cache_key)
+
+
+def _get_catalog_resource(product):
+    """ Returns the Discovery resource, and its ID, holding the course or course_run information of the product. """
+    if product.is_course_entitlement_product:
+        return "courses", product.attr.UUID
+    return "course_runs", CourseKey.from_string(product.attr.course_key)
 
 
 def get_course_info_from_catalog(site, product):
     """ Get course or course_run information from Discovery Service and cache """
-    if product.is_course_entitlement_product:
-        response = get_course_detail(site, product.attr.UUID)
+    resource, resource_id = _get_catalog_resource(product)
+    if resource == "courses":
+        return get_course_detail(site, resource_id)
+    return get_course_run_detail(site, resource_id)
+
+
+def prefetch_course_info_from_catalog(site, products):
+    """
+    Load the course or course_run information of several products at once, so that the following calls to
+    get_course_info_from_catalog for these products are answered from the request cache.
+
+    The information already cached is read with a single cache lookup, and the missing information is requested
+    from Discovery concurrently. Failed requests are logged and are not sent again during the request: the
+    following calls to get_course_info_from_catalog for these products raise the same error.
+
+    Arguments:
+        site (Site): Site object containing Site Configuration data
+        products (list): Seat, enrollment code or course entitlement products
+    """
+    resources = {}
+    for product in products:
+        resource, resource_id = _get_catalog_resource(product)
+        resources[_get_discovery_cache_key(site, resource, resource_id)] = (resource, resource_id)
+
+    cached_values = get_many_from_all_tiers(resources)
+    missing_keys = [key for key in resources if key not in cached_values]
+    if not missing_keys:
+        return
+
+    def fetch(key):
+        resource, resource_id = resources[key]
+        try:
+            return _get_discovery_response(site, key, resource, resource_id), None
+        except RequestException as exc:
+            logger.exception('Failed to prefetch [%s] [%s] from the Discovery Service.', resource, resource_id)
+            return None, exc
+
+    max_workers = min(settings.COURSE_INFO_PREFETCH_MAX_WORKERS, len(missing_keys))
+    if max_workers <= 1:
+        results = [fetch(key) for key in missing_keys]
     else:
-        response = get_course_run_detail(site, CourseKey.from_string(product.attr.course_key))
-    return response
+        # Load what the requests need from the database before handing them to the worker threads.
+        site.siteconfiguration.partner  # pylint: disable=pointless-statement
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, missing_keys))
+
+    # The worker threads have their own request cache.
+    for key, (result, error) in zip(missing_keys, results):
+        if error is None:
+            DEFAULT_REQUEST_CACHE.set(key, result)
+        else:
+            DEFAULT_REQUEST_CACHE.set(_get_discovery_error_cache_key(key), error)
 
 
 def get_course_catalogs(site, resource_id=None):
@@ -12,6 +12,7 @@ from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import HTTPError, Timeout
 
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.courses.utils import get_course_info_from_catalog
 from ecommerce.enterprise.api import catalog_contains_course_runs, get_enterprise_id_for_user
 from ecommerce.enterprise.utils import get_or_create_enterprise_customer_user
@@ -308,9 +309,7 @@ class EnterpriseCustomerCondition(ConditionWithoutRangeMixin, SingleItemConsumpt
 
         if not catalog:
             # For actual baskets get `catalog` from basket attribute
-            enterprise_catalog_attribute, __ = BasketAttributeType.objects.get_or_create(
-                name=ENTERPRISE_CATALOG_ATTRIBUTE_TYPE
-            )
+            enterprise_catalog_attribute, __ = basket_attribute_types.get_or_create(ENTERPRISE_CATALOG_ATTRIBUTE_TYPE)
             enterprise_customer_catalog = BasketAttribute.objects.filter(
                 basket=basket,
                 attribute_type=enterprise_catalog_attribute,
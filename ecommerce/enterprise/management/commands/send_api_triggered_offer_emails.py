@@ -243,6 +243,13 @@ class Command(BaseCommand):
 
         return ConditionalOffer.objects.filter(**filter_kwargs).exclude(emails_for_usage_alert='')
 
+    @staticmethod
+    def _get_usage_alert_emails(enterprise_offer):
+        """
+        Return the email addresses the usage alerts of the given offer are sent to.
+        """
+        return enterprise_offer.emails_for_usage_alert.strip().split(',')
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--enterprise-customer-uuid',
@@ -270,9 +277,19 @@ class Command(BaseCommand):
         if options['force_type']:
             logger.info('Force sending a %s email for each of these offers', force_type)
 
+        site = Site.objects.get_current()
+        # Look up the LMS user ids of every alert recipient in a few batched calls instead of one call per address.
+        known_lms_user_ids = User.get_bulk_lms_user_ids_using_emails(
+            site,
+            {
+                user_email.strip()
+                for enterprise_offer in enterprise_offers
+                for user_email in self._get_usage_alert_emails(enterprise_offer)
+            }
+        )
+
         for enterprise_offer in enterprise_offers:
             if force_type or self.is_eligible_for_email(enterprise_offer):
-                site = Site.objects.get_current()
 
                 try:
                     email_body_variables = self.get_email_content(
@@ -300,8 +317,8 @@ class Command(BaseCommand):
                 )
 
                 lms_user_ids_by_email = {
-                    user_email: User.get_lms_user_attribute_using_email(site, user_email, attribute='id')
-                    for user_email in enterprise_offer.emails_for_usage_alert.strip().split(',')
+                    user_email: known_lms_user_ids.get(user_email.strip().lower())
+                    for user_email in self._get_usage_alert_emails(enterprise_offer)
                 }
 
                 send_api_triggered_offer_usage_email.delay(
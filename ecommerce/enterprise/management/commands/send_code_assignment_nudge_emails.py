@@ -46,44 +46,58 @@ class Command(BaseCommand):
             is_subscribed=True
         )
 
-    @staticmethod
-    def _create_email_sent_record(site, nudge_email):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Per-run memos, so that each code, enterprise customer and learner is only looked up once.
+        self._enterprise_customer_uuids_by_code = {}
+        self._enterprise_customer_email_settings = {}
+        self._lms_user_ids_by_email = {}
+
+    def _get_enterprise_customer_uuid(self, code):
         """
-        Creates an instance of OfferAssignmentEmailSentRecord with the given data.
-        Arguments:
-            nudge_email (CodeAssignmentNudgeEmails): A nudge email sent to the learner.
+        Returns the UUID of the Enterprise Customer of the given code.
         """
-        OfferAssignmentEmailSentRecord.create_email_record(
-            enterprise_customer_uuid=get_enterprise_customer_uuid(nudge_email.code),
-            email_type=nudge_email.email_template.email_type,
-            template=nudge_email.email_template,
-            sender_category=AUTOMATIC_EMAIL,
-            code=nudge_email.code,
-            user_email=nudge_email.user_email,
-            receiver_id=User.get_lms_user_attribute_using_email(site, nudge_email.user_email)
-        )
+        if code not in self._enterprise_customer_uuids_by_code:
+            self._enterprise_customer_uuids_by_code[code] = get_enterprise_customer_uuid(code)
+        return self._enterprise_customer_uuids_by_code[code]
 
-    @staticmethod
-    def _get_sender_alias(site, nudge_email):
+    def _get_sender_alias_and_reply_to(self, site, nudge_email):
         """
-        Returns the sender alias of an Enterprise Customer.
+        Returns the sender alias and the reply_to email address of the Enterprise Customer of a nudge email.
 
         Arguments:
             nudge_email (CodeAssignmentNudgeEmails): A nudge email sent to the learner.
         """
-        enterprise_customer_uuid = get_enterprise_customer_uuid(nudge_email.code)
-        return get_enterprise_customer_sender_alias(site, enterprise_customer_uuid)
+        enterprise_customer_uuid = self._get_enterprise_customer_uuid(nudge_email.code)
+        if enterprise_customer_uuid not in self._enterprise_customer_email_settings:
+            self._enterprise_customer_email_settings[enterprise_customer_uuid] = (
+                get_enterprise_customer_sender_alias(site, enterprise_customer_uuid),
+                get_enterprise_customer_reply_to_email(site, enterprise_customer_uuid),
+            )
+        return self._enterprise_customer_email_settings[enterprise_customer_uuid]
 
-    @staticmethod
-    def _get_reply_to_email(site, nudge_email):
+    def _load_lms_user_ids(self, site, nudge_emails):
+        """
+        Looks up the LMS user ids of all the learners of the given nudge emails, in batches.
         """
-        Returns the reply_to email address of an Enterprise Customer.
+        user_emails = set(nudge_emails.values_list('user_email', flat=True))
+        self._lms_user_ids_by_email.update(User.get_bulk_lms_user_ids_using_emails(site, user_emails))
 
+    def _create_email_sent_record(self, nudge_email):
+        """
+        Creates an instance of OfferAssignmentEmailSentRecord with the given data.
         Arguments:
             nudge_email (CodeAssignmentNudgeEmails): A nudge email sent to the learner.
         """
-        enterprise_customer_uuid = get_enterprise_customer_uuid(nudge_email.code)
-        return get_enterprise_customer_reply_to_email(site, enterprise_customer_uuid)
+        OfferAssignmentEmailSentRecord.create_email_record(
+            enterprise_customer_uuid=self._get_enterprise_customer_uuid(nudge_email.code),
+            email_type=nudge_email.email_template.email_type,
+            template=nudge_email.email_template,
+            sender_category=AUTOMATIC_EMAIL,
+            code=nudge_email.code,
+            user_email=nudge_email.user_email,
+            receiver_id=self._lms_user_ids_by_email.get(nudge_email.user_email.lower())
+        )
 
     def handle(self, *args, **options):
         send_nudge_email_count = 0
@@ -94,7 +108,8 @@ class Command(BaseCommand):
             '[Code Assignment Nudge Email] Total count of Enterprise Nudge Emails that are scheduled for today is %s.',
             total_nudge_emails_count
         )
-        for nudge_email in nudge_emails:
+        self._load_lms_user_ids(site, nudge_emails)
+        for nudge_email in nudge_emails.select_related('email_template'):
             try:
                 voucher = get_cached_voucher(nudge_email.code)
             except Voucher.DoesNotExist:
@@ -118,8 +133,7 @@ class Command(BaseCommand):
                 nudge_email.already_sent = True
                 nudge_email.save()
                 send_nudge_email_count += 1
-                sender_alias = self._get_sender_alias(site, nudge_email)
-                reply_to = self._get_reply_to_email(site, nudge_email)
+                sender_alias, reply_to = self._get_sender_alias_and_reply_to(site, nudge_email)
                 send_code_assignment_nudge_email.delay(
                     nudge_email.user_email,
                     email_subject,
@@ -129,7 +143,7 @@ class Command(BaseCommand):
                     base_enterprise_url=base_enterprise_url,
                 )
                 self.set_last_reminder_date(nudge_email.user_email, nudge_email.code)
-                self._create_email_sent_record(site, nudge_email)
+                self._create_email_sent_record(nudge_email)
         logger.info(
             '[Code Assignment Nudge Email] %s out of %s added to the email sending queue.',
             send_nudge_email_count,
@@ -153,3 +153,28 @@ class SendCodeAssignmentNudgeEmailsTests(TestCase):
             assert nudge_email.filter(already_sent=True).count() == 0
             # assert that nudge emails are unsubscribed if voucher is expired
             assert nudge_email.filter(is_subscribed=False).count() == self.total_nudge_emails_for_today
+
+    def test_remote_lookups_are_batched(self):
+        """
+        Test that learners are looked up in LMS in bulk and enterprise customers once each.
+        """
+        cmd_path = 'ecommerce.enterprise.management.commands.send_code_assignment_nudge_emails'
+        lms_user_ids = {
+            nudge_email.user_email.lower(): index for index, nudge_email in enumerate(self.nudge_emails, start=1)
+        }
+        with mock.patch(cmd_path + '.send_code_assignment_nudge_email.delay'), \
+                mock.patch(cmd_path + '.User.get_bulk_lms_user_ids_using_emails',
+                           return_value=lms_user_ids) as mock_bulk_lookup, \
+                mock.patch(cmd_path + '.get_enterprise_customer_sender_alias',
+                           return_value='Sender') as mock_sender_alias, \
+                mock.patch(cmd_path + '.get_enterprise_customer_reply_to_email',
+                           return_value='reply@example.com') as mock_reply_to:
+            call_command('send_code_assignment_nudge_emails')
+
+        mock_bulk_lookup.assert_called_once()
+        assert set(mock_bulk_lookup.call_args[0][1]) == {nudge_email.user_email for nudge_email in self.nudge_emails}
+        assert mock_sender_alias.call_count == 1
+        assert mock_reply_to.call_count == 1
+        assert sorted(OfferAssignmentEmailSentRecord.objects.values_list('receiver_id', flat=True)) == sorted(
+            lms_user_ids.values()
+        )
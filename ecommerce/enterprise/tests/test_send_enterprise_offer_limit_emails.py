@@ -43,13 +43,12 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase, SiteMixin, EnterpriseService
     def mock_lms_user_responses(self, user_ids_by_email):
         api_url = urljoin(f"{self.site.siteconfiguration.user_api_url}/", "accounts/search_emails")
 
-        for _, user_id in user_ids_by_email.items():
-            responses.add(
-                responses.POST,
-                api_url,
-                json=[{'id': user_id}],
-                content_type='application/json',
-            )
+        responses.add(
+            responses.POST,
+            api_url,
+            json=[{'id': user_id, 'email': email} for email, user_id in user_ids_by_email.items()],
+            content_type='application/json',
+        )
 
     def mock_offer_analytics_response(
         self,
@@ -340,6 +339,8 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase, SiteMixin, EnterpriseService
             call_command('send_api_triggered_offer_emails')
             # if offer_with_404 had email content, this 5 would be a 6.
             assert mock_send_email.call_count == 5
+            # All the alert recipients are looked up in LMS with a single call.
+            assert len([call for call in responses.calls if call.request.url.endswith('search_emails')]) == 1
             assert OfferUsageEmail.objects.all().count() == offer_usage_count + 5
             mock_send_email.assert_has_calls([
                 mock.call(
@@ -356,7 +357,7 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase, SiteMixin, EnterpriseService
                     campaign_id=settings.CAMPAIGN_IDS_BY_EMAIL_TYPE[OfferUsageEmailTypes.DIGEST]
                 ),
                 mock.call(
-                    {'example_1@example.com': 44, ' example_2@example.com': 44},
+                    {'example_1@example.com': 22, ' example_2@example.com': 44},
                     'Offer Usage Notification',
                     {
                         'email_type': OfferUsageEmailTypes.DIGEST, 'is_enrollment_limit_offer': False,
@@ -369,7 +370,7 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase, SiteMixin, EnterpriseService
                     campaign_id=settings.CAMPAIGN_IDS_BY_EMAIL_TYPE[OfferUsageEmailTypes.DIGEST]
                 ),
                 mock.call(
-                    {'example_1@example.com': 44, ' example_2@example.com': 44},
+                    {'example_1@example.com': 22, ' example_2@example.com': 44},
                     'Offer Usage Notification',
                     {
                         'email_type': OfferUsageEmailTypes.DIGEST, 'is_enrollment_limit_offer': True,
@@ -382,7 +383,7 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase, SiteMixin, EnterpriseService
                     campaign_id=settings.CAMPAIGN_IDS_BY_EMAIL_TYPE[OfferUsageEmailTypes.DIGEST]
                 ),
                 mock.call(
-                    {'example_1@example.com': 44, ' example_2@example.com': 44},
+                    {'example_1@example.com': 22, ' example_2@example.com': 44},
                     'Offer Usage Notification',
                     {
                         'email_type': OfferUsageEmailTypes.DIGEST, 'is_enrollment_limit_offer': True,
@@ -395,7 +396,7 @@ class SendEnterpriseOfferLimitEmailsTests(TestCase, SiteMixin, EnterpriseService
                     campaign_id=settings.CAMPAIGN_IDS_BY_EMAIL_TYPE[OfferUsageEmailTypes.DIGEST]
                 ),
                 mock.call(
-                    {'example_1@example.com': 44, ' example_2@example.com': 44},
+                    {'example_1@example.com': 22, ' example_2@example.com': 44},
                     'Offer Usage Notification',
                     {
                         'email_type': OfferUsageEmailTypes.DIGEST, 'is_enrollment_limit_offer': True,
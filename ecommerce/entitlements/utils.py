@@ -3,7 +3,6 @@
 import logging
 
 from django.conf import settings
-from django.db.models import Q
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import COURSE_ENTITLEMENT_PRODUCT_CLASS_NAME
@@ -44,15 +43,7 @@ def create_parent_course_entitlement(name, UUID):
 
 def get_entitlement(uuid, certificate_type):
     """ Get a Course Entitlement Product """
-    uuid_query = Q(
-        attributes__name='UUID',
-        attribute_values__value_text=str(uuid),
-    )
-    certificate_type_query = Q(
-        attributes__name='certificate_type',
-        attribute_values__value_text=certificate_type.lower(),
-    )
-    return Product.objects.filter(uuid_query).get(certificate_type_query)
+    return Product.objects.get(uuid=str(uuid), certificate_type=certificate_type.lower())
 
 
 def create_or_update_course_entitlement(
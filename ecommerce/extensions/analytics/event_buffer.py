@@ -0,0 +1,150 @@
+"""
+Process-wide buffer of the analytics events sent to Segment and Braze.
+
+Firing an event used to call Segment or Braze from the request thread; Braze events were even posted while
+rendering the basket page. Events are now queued in memory and sent by a background thread of each process, in
+batches of up to ANALYTICS_EVENT_BATCH_SIZE events gathered for at most ANALYTICS_EVENT_FLUSH_INTERVAL seconds.
+Events of a batch put with the same event id are the same occurrence of an event, and are sent once. Events put
+without an id are always sent, even when they are identical, as each of them was fired on its own.
+
+The queue holds at most ANALYTICS_EVENT_QUEUE_SIZE events. Putting an event never blocks: events fired while the
+queue is full are dropped, and counted, so that a slow analytics service never slows down checkout.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from queue import Empty, Full, Queue
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsEventBuffer:
+    """
+    Thread-safe buffer of analytics events, each passed to the sender it was put with by a background thread.
+
+    A sender is a callable receiving the list of events to send. Events put with the same sender are batched, and
+    those put with the same sender and event id are coalesced.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._pid = None
+        self._stats = Counter()
+
+    @property
+    def stats(self):
+        """
+        Returns the number of events enqueued, sent, coalesced, dropped because the queue was full and failed
+        to be sent by this process.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, stat, count=1):
+        with self._lock:
+            self._stats[stat] += count
+
+    def _get_queue(self):
+        """ Returns the queue of this process, starting its flusher thread if needed. """
+        # The queue and its thread are not inherited by forked worker processes.
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    queue = Queue(maxsize=settings.ANALYTICS_EVENT_QUEUE_SIZE)
+                    thread = threading.Thread(target=self._run, args=(queue,), name='analytics-event-flusher')
+                    thread.daemon = True
+                    thread.start()
+                    self._queue = queue
+                    self._pid = os.getpid()
+        return self._queue
+
+    def put(self, sender, event, event_id=None):
+        """
+        Queues an event to be sent by the given sender.
+
+        Args:
+            sender (callable): Callable sending a list of events.
+            event: The event to send.
+            event_id (str): Identifier of the occurrence of the event. Events queued again with the same
+                identifier before they are sent, e.g. by retries, are sent once.
+
+        Returns:
+            bool: False if the event was dropped because the queue is full.
+        """
+        if settings.ANALYTICS_EVENT_SYNC_MODE:
+            # Errors are raised to the code firing the event.
+            self._count('enqueued')
+            sender([event])
+            self._count('sent')
+            return True
+
+        try:
+            self._get_queue().put_nowait((sender, event, event_id))
+        except Full:
+            self._count('dropped')
+            logger.warning('Dropped an analytics event because the queue is full.')
+            return False
+
+        self._count('enqueued')
+        return True
+
+    def _run(self, queue):
+        while True:
+            batch = [queue.get()]
+            deadline = time.monotonic() + settings.ANALYTICS_EVENT_FLUSH_INTERVAL
+            while len(batch) < settings.ANALYTICS_EVENT_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(queue.get(timeout=timeout))
+                except Empty:
+                    break
+
+            self._flush(batch)
+            for __ in batch:
+                queue.task_done()
+
+    def _flush(self, batch):
+        events_by_sender = {}
+        event_ids = set()
+        for sender, event, event_id in batch:
+            if event_id is not None:
+                if (sender, event_id) in event_ids:
+                    self._count('coalesced')
+                    continue
+                event_ids.add((sender, event_id))
+            events_by_sender.setdefault(sender, []).append(event)
+
+        for sender, events in events_by_sender.items():
+            self._send(sender, events)
+
+    def _send(self, sender, events):
+        try:
+            sender(events)
+        except Exception:  # pylint: disable=broad-except
+            self._count('failed', len(events))
+            logger.exception('Failed to send [%d] analytics events.', len(events))
+        else:
+            self._count('sent', len(events))
+
+    def flush(self, timeout=5):
+        """
+        Waits, for at most the given number of seconds, until the queued events are sent.
+        """
+        if self._pid != os.getpid():
+            return
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+
+analytics_event_buffer = AnalyticsEventBuffer()
+atexit.register(analytics_event_buffer.flush)
@@ -0,0 +1,77 @@
+import threading
+
+from django.test import override_settings
+
+from ecommerce.extensions.analytics.event_buffer import AnalyticsEventBuffer
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(ANALYTICS_EVENT_SYNC_MODE=False, ANALYTICS_EVENT_FLUSH_INTERVAL=0.2)
+class AnalyticsEventBufferTests(TestCase):
+    def setUp(self):
+        super(AnalyticsEventBufferTests, self).setUp()
+        self.buffer = AnalyticsEventBuffer()
+        self.batches = []
+
+    def send(self, events):
+        self.batches.append(events)
+
+    def test_batching(self):
+        """ Verify events are sent in the background, in batches which keep events fired repeatedly. """
+        self.assertTrue(self.buffer.put(self.send, 'cart-viewed'))
+        self.assertTrue(self.buffer.put(self.send, 'cart-viewed'))
+        self.assertTrue(self.buffer.put(self.send, 'product-added'))
+        self.buffer.flush()
+
+        self.assertEqual(self.batches, [['cart-viewed', 'cart-viewed', 'product-added']])
+        self.assertEqual(self.buffer.stats, {'enqueued': 3, 'sent': 3})
+
+    def test_coalescing(self):
+        """ Verify events queued again with the same event id are sent once. """
+        self.buffer.put(self.send, 'cart-viewed', event_id='1')
+        self.buffer.put(self.send, 'cart-viewed', event_id='1')
+        self.buffer.put(self.send, 'cart-viewed', event_id='2')
+        self.buffer.flush()
+
+        self.assertEqual(self.batches, [['cart-viewed', 'cart-viewed']])
+        self.assertEqual(self.buffer.stats, {'enqueued': 3, 'coalesced': 1, 'sent': 2})
+
+    @override_settings(ANALYTICS_EVENT_QUEUE_SIZE=1, ANALYTICS_EVENT_FLUSH_INTERVAL=0)
+    def test_full_queue(self):
+        """ Verify events are dropped, without blocking, while the queue is full. """
+        sending = threading.Event()
+        release = threading.Event()
+
+        def send(events):
+            sending.set()
+            release.wait(5)
+            self.send(events)
+
+        self.buffer.put(send, 'first')
+        sending.wait(5)
+        self.assertTrue(self.buffer.put(send, 'second'))
+        self.assertFalse(self.buffer.put(send, 'third'))
+
+        release.set()
+        self.buffer.flush()
+        self.assertEqual(self.batches, [['first'], ['second']])
+        self.assertEqual(self.buffer.stats, {'enqueued': 2, 'dropped': 1, 'sent': 2})
+
+    def test_sender_failure(self):
+        """ Verify events whose sender fails are counted, and do not stop the following events. """
+        def fail(events):  # pylint: disable=unused-argument
+            raise Exception('Service unavailable.')
+
+        self.buffer.put(fail, 'first')
+        self.buffer.flush()
+        self.buffer.put(self.send, 'second')
+        self.buffer.flush()
+
+        self.assertEqual(self.batches, [['second']])
+        self.assertEqual(self.buffer.stats, {'enqueued': 2, 'failed': 1, 'sent': 1})
+
+    @override_settings(ANALYTICS_EVENT_SYNC_MODE=True)
+    def test_sync_mode(self):
+        """ Verify events are sent by the thread firing them in sync mode. """
+        self.buffer.put(self.send, 'cart-viewed')
+        self.assertEqual(self.batches, [['cart-viewed']])
@@ -15,7 +15,9 @@ from requests.exceptions import RequestException
 from ecommerce.core.models import User  # pylint: disable=unused-import
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.analytics.utils import (
+    BRAZE_EVENT_BATCH_SIZE,
     ECOM_TRACKING_ID_FMT,
+    _send_braze_events,
     get_google_analytics_client_id,
     parse_tracking_context,
     prepare_analytics_data,
@@ -246,3 +248,20 @@ class UtilsTest(DiscoveryTestMixin, BasketMixin, TransactionTestCase):
             user = self.create_user()
             self.assertIsNone(track_braze_event(user, 'edx.bi.ecommerce.cart.viewed', {'prop': 123}))
             mock_debug.assert_not_called()
+
+    @override_settings(
+        BRAZE_EVENT_REST_ENDPOINT='rest.braze.com',
+        BRAZE_API_KEY='test-api-key',
+    )
+    @responses.activate
+    def test_send_braze_events_in_batches(self):
+        """ Verify queued Braze events are sent in as few requests as Braze accepts. """
+        braze_url = 'https://{url}/users/track'.format(url=getattr(settings, 'BRAZE_EVENT_REST_ENDPOINT'))
+        responses.add(responses.POST, braze_url, json={'message': 'success'}, content_type='application/json')
+        events = [{'external_id': index, 'name': 'edx.bi.ecommerce.cart.viewed'} for index in range(80)]
+
+        _send_braze_events(events)
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(json.loads(responses.calls[0].request.body)['events'], events[:BRAZE_EVENT_BATCH_SIZE])
+        self.assertEqual(json.loads(responses.calls[1].request.body)['events'], events[BRAZE_EVENT_BATCH_SIZE:])
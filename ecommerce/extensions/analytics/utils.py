@@ -11,11 +11,15 @@ from django.conf import settings
 from django.db import transaction
 
 from ecommerce.courses.utils import mode_for_product
+from ecommerce.extensions.analytics.event_buffer import analytics_event_buffer
 
 logger = logging.getLogger(__name__)
 
 ECOM_TRACKING_ID_FMT = 'ecommerce-{}'
 
+# Maximum number of events accepted by the Braze users/track endpoint in a single request.
+BRAZE_EVENT_BATCH_SIZE = 75
+
 
 def parse_tracking_context(user, usage=None):
     """
@@ -142,6 +146,8 @@ def track_segment_event(site, user, event, properties, traits=None):
         traits (dict): Event traits, which will be included in the
             `context` section of the event payload.
 
+    The event is queued once the current transaction is committed, and sent to Segment in the background.
+
     Returns:
         (success, msg): Tuple indicating the success of enqueuing the event on the message queue.
             This can be safely ignored unless needed for debugging purposes.
@@ -181,9 +187,17 @@ def track_segment_event(site, user, event, properties, traits=None):
     if traits:
         context['traits'] = traits
 
+    segment_client = site_configuration.segment_client
     return transaction.on_commit(
-        lambda: site.siteconfiguration.segment_client.track(user_tracking_id, event, properties,
-                                                            context=context))
+        lambda: analytics_event_buffer.put(
+            _send_segment_events, (segment_client, user_tracking_id, event, properties, context)
+        ))
+
+
+def _send_segment_events(events):
+    """ Sends events queued by track_segment_event. """
+    for segment_client, user_tracking_id, event, properties, context in events:
+        segment_client.track(user_tracking_id, event, properties, context=context)
 
 
 def translate_basket_line_for_segment(line):
@@ -226,7 +240,7 @@ def get_google_analytics_client_id(request):
 
 def track_braze_event(user, event, properties):
     """
-    Sends an event directly to Braze.
+    Sends an event to Braze, in the background.
 
     Args:
         user (User): User to which the event should be associated.
@@ -237,32 +251,33 @@ def track_braze_event(user, event, properties):
         logger.debug('Failed to send event to Braze: Missing required settings.')
         return
 
+    analytics_event_buffer.put(_send_braze_events, {
+        'external_id': user.lms_user_id_with_metric(usage='Braze event: ' + event),
+        'name': event,
+        'time': datetime.now(timezone.utc).isoformat(),
+        'properties': properties
+    })
+
+
+def _send_braze_events(events):
+    """ Sends events queued by track_braze_event, in as few requests as Braze accepts. """
     event_url = 'https://{url}/users/track'.format(url=getattr(settings, 'BRAZE_EVENT_REST_ENDPOINT'))
     headers = {'Authorization': 'Bearer ' + getattr(settings, 'BRAZE_API_KEY')}
-    try:
-        response = requests.post(
-            event_url,
-            headers=headers,
-            json={
-                'events': [
-                    {
-                        'external_id': user.lms_user_id_with_metric(usage='Braze event: ' + event),
-                        'name': event,
-                        'time': datetime.now(timezone.utc).isoformat(),
-                        'properties': properties
-                    }
-                ]
-            }
-        )
-    # Log out the exception since it could be a symptom we might want to look into.
-    except requests.exceptions.RequestException:
-        logger.exception('Failed to send event to Braze due to request exception.')
-        return
-
-    try:
-        response.raise_for_status()
-    # Just going to log it out. If we miss the event, it's unfortunate, but not worth raising an error
-    except requests.exceptions.HTTPError:
-        # https://www.braze.com/docs/api/errors/
-        message = response.json().get('message', 'Unknown error')
-        logger.debug('Failed to send event [%s] to Braze: %s', event, message)
+    for start in range(0, len(events), BRAZE_EVENT_BATCH_SIZE):
+        batch = events[start:start + BRAZE_EVENT_BATCH_SIZE]
+        try:
+            response = requests.post(event_url, headers=headers, json={'events': batch})
+        # Log out the exception since it could be a symptom we might want to look into.
+        except requests.exceptions.RequestException:
+            logger.exception('Failed to send event to Braze due to request exception.')
+            continue
+
+        try:
+            response.raise_for_status()
+        # Just going to log it out. If we miss the event, it's unfortunate, but not worth raising an error
+        except requests.exceptions.HTTPError:
+            # https://www.braze.com/docs/api/errors/
+            message = response.json().get('message', 'Unknown error')
+            logger.debug(
+                'Failed to send event [%s] to Braze: %s', ', '.join(event['name'] for event in batch), message
+            )
@@ -2,7 +2,7 @@
 
 import logging
 import re
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from decimal import Decimal
 from urllib.parse import urljoin
 
@@ -12,8 +12,8 @@ from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from django.db.models import Count, Q, Sum, prefetch_related_objects
+from django.db import models, transaction
+from django.db.models import Count, F, Prefetch, Q, prefetch_related_objects
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
@@ -28,9 +28,8 @@ from ecommerce.core.constants import (
     ISO_8601_FORMAT,
     SEAT_PRODUCT_CLASS_NAME
 )
-from ecommerce.core.url_utils import get_ecommerce_url
+from ecommerce.core.url_utils import get_ecommerce_url, get_lms_dashboard_url, get_lms_program_dashboard_url
 from ecommerce.core.utils import log_message_and_raise_validation_error
-from ecommerce.coupons.utils import is_coupon_available
 from ecommerce.courses.models import Course
 from ecommerce.enterprise.benefits import BENEFIT_MAP as ENTERPRISE_BENEFIT_MAP
 from ecommerce.enterprise.conditions import sum_user_discounts_for_offer
@@ -54,6 +53,7 @@ from ecommerce.extensions.api.v2.constants import (
     REFUND_ORDER_EMAIL_GREETING,
     REFUND_ORDER_EMAIL_SUBJECT
 )
+from ecommerce.extensions.catalogue.attribute_utils import load_product_attribute_values
 from ecommerce.extensions.catalogue.utils import attach_vouchers_to_coupon_product
 from ecommerce.extensions.checkout.views import ReceiptResponseView
 from ecommerce.extensions.offer.constants import (
@@ -77,6 +77,7 @@ from ecommerce.extensions.offer.utils import (
     send_assigned_offer_reminder_email,
     send_revoked_offer_email
 )
+from ecommerce.extensions.payment.utils import get_basket_program_uuids
 from ecommerce.extensions.voucher.utils import create_enterprise_vouchers
 from ecommerce.invoice.models import Invoice
 from ecommerce.programs.custom import class_path
@@ -92,6 +93,7 @@ CodeAssignmentNudgeEmails = get_model('offer', 'CodeAssignmentNudgeEmails')
 Category = get_model('catalogue', 'Category')
 Line = get_model('order', 'Line')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Condition = get_model('offer', 'Condition')
 OfferAssignment = get_model('offer', 'OfferAssignment')
 OfferAssignmentEmailTemplates = get_model('offer', 'OfferAssignmentEmailTemplates')
 TemplateFileAttachment = get_model('offer', 'TemplateFileAttachment')
@@ -103,6 +105,7 @@ ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 ProductCategory = get_model('catalogue', 'ProductCategory')
 Refund = get_model('refund', 'Refund')
 Selector = get_class('partner.strategy', 'Selector')
+Source = get_model('payment', 'Source')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
 VoucherApplication = get_model('voucher', 'VoucherApplication')
@@ -194,8 +197,16 @@ def retrieve_enterprise_customer_catalog(coupon):
     Helper method to retrieve the Enterprise Customer Catalog UUID
     attached to a given coupon.
     """
-    offer_range = retrieve_range(coupon)
-    offer_condition = retrieve_condition(coupon)
+    return _retrieve_voucher_enterprise_customer_catalog(retrieve_voucher(coupon))
+
+
+def _retrieve_voucher_enterprise_customer_catalog(voucher):
+    """
+    Helper method to retrieve the Enterprise Customer Catalog UUID
+    attached to the first voucher of a coupon.
+    """
+    offer_range = voucher.original_offer.condition.range
+    offer_condition = voucher.best_offer.condition
     if offer_range and offer_range.enterprise_customer_catalog:
         return offer_range.enterprise_customer_catalog
     if offer_condition.enterprise_customer_catalog_uuid:
@@ -351,8 +362,9 @@ class ProductSerializer(ProductPaymentInfoMixin, serializers.HyperlinkedModelSer
 
     def get_attribute_values(self, product):
         request = self.context.get('request')
+        attribute_values = _get_prefetched_attribute_values(product)
         serializer = ProductAttributeValueSerializer(
-            product.attr,
+            product.attr if attribute_values is None else attribute_values,
             many=True,
             read_only=True,
             context={'request': request}
@@ -404,8 +416,110 @@ class LineSerializer(serializers.ModelSerializer):
         )
 
 
+def _get_prefetched_attribute_values(product):
+    """
+    Return the attribute values of the product, including those inherited from its parent, if they have been
+    prefetched. Returns None otherwise.
+    """
+    def is_prefetched(item):
+        return 'attribute_values' in getattr(item, '_prefetched_objects_cache', {})
+
+    # The product is checked first, so that its parent is not fetched when nothing has been prefetched.
+    if not is_prefetched(product) or (product.is_child and not is_prefetched(product.parent)):
+        return None
+
+    # Same values as Product.get_attribute_values, without querying them again.
+    attribute_values = list(product.attribute_values.all())
+    if product.is_child:
+        codes = {attribute_value.attribute.code for attribute_value in attribute_values}
+        attribute_values += [
+            attribute_value for attribute_value in product.parent.attribute_values.all()
+            if attribute_value.attribute.code not in codes
+        ]
+        attribute_values.sort(key=lambda attribute_value: attribute_value.pk)
+    return attribute_values
+
+
+def _load_prefetched_attribute_values(product):
+    """
+    Load the prefetched attribute values of the product into product.attr, so reading them does not query.
+    """
+    attribute_values = _get_prefetched_attribute_values(product)
+    if attribute_values is None:
+        return
+
+    load_product_attribute_values(product, attribute_values)
+
+
+def _get_condition_name(condition):
+    """
+    Return the name of the condition, reusing the range loaded with it.
+    """
+    # Condition.name is read from a proxy of the condition, which is created without the relations already loaded.
+    proxy = condition.proxy()
+    if proxy is not condition and condition.range_id and Condition.range.is_cached(condition):
+        proxy.range = condition.range
+    return proxy.name
+
+
+class OrderBulkSerializer(serializers.ListSerializer):  # pylint: disable=abstract-method
+    """
+    Serializes a page of orders, loading the objects their fields are derived from for all of them at once.
+    """
+
+    def to_representation(self, data):
+        orders = list(data.all() if isinstance(data, models.Manager) else data)
+        # This is a no-op for the lookups already prefetched by the view.
+        prefetch_related_objects(orders, *self.child.prefetch_related_lookups)
+
+        discounts = [discount for order in orders for discount in order.discounts.all()]
+        self.child.discount_vouchers = Voucher.objects.prefetch_related('offers__benefit').in_bulk(
+            {discount.voucher_id for discount in discounts if discount.voucher_id}
+        )
+        self.child.discount_offers = ConditionalOffer.objects.select_related('condition__range').in_bulk(
+            {discount.offer_id for discount in discounts if discount.offer_id}
+        )
+        self.child.program_uuids = get_basket_program_uuids({order.basket_id for order in orders})
+        for order in orders:
+            for line in order.lines.all():
+                if line.product:
+                    _load_prefetched_attribute_values(line.product)
+
+        return [self.child.to_representation(order) for order in orders]
+
+
+# Marks a value looked up once per serializer that has not been looked up yet, when None is a valid value.
+_NOT_LOADED = object()
+
+
 class OrderSerializer(serializers.ModelSerializer):
     """Serializer for parsing order data."""
+    # Relations the fields below are read from, loaded for a whole page of orders by OrderViewSet.
+    select_related_fields = ('basket', 'billing_address', 'user')
+    prefetch_related_lookups = (
+        Prefetch(
+            'lines',
+            queryset=Line.objects.select_related(
+                'product__course', 'product__parent__product_class', 'product__product_class'
+            )
+        ),
+        'lines__attributes',
+        Prefetch(
+            'lines__product__attribute_values',
+            queryset=ProductAttributeValue.objects.select_related('attribute')
+        ),
+        Prefetch(
+            'lines__product__parent__attribute_values',
+            queryset=ProductAttributeValue.objects.select_related('attribute')
+        ),
+        'lines__product__stockrecords',
+        'discounts',
+        Prefetch('sources', queryset=Source.objects.select_related('source_type').order_by('pk')),
+        'basket__vouchers__applications',
+        'basket__vouchers__offers__benefit',
+        'basket__vouchers__offers__condition',
+    )
+
     basket_discounts = serializers.SerializerMethodField()
     billing_address = BillingAddressSerializer(allow_null=True)
     contains_credit_seat = serializers.SerializerMethodField()
@@ -423,24 +537,45 @@ class OrderSerializer(serializers.ModelSerializer):
     total_before_discounts_incl_tax = serializers.SerializerMethodField()
     order_product_ids = serializers.SerializerMethodField()
 
+    def __init__(self, *args, **kwargs):
+        super(OrderSerializer, self).__init__(*args, **kwargs)
+        # Set by OrderBulkSerializer when serializing a page of orders, looked up per order otherwise.
+        self.discount_vouchers = None
+        self.discount_offers = None
+        self.program_uuids = None
+        # The enterprise learner portal URL only depends on the request, it is looked up once for all the orders
+        # serialized together.
+        self._enterprise_learner_portal_url = _NOT_LOADED
+
+    def _get_discount_voucher(self, discount):
+        if self.discount_vouchers is None:
+            return discount.voucher
+        return self.discount_vouchers.get(discount.voucher_id)
+
+    def _get_discount_offer(self, discount):
+        if self.discount_offers is None:
+            return discount.offer
+        return self.discount_offers.get(discount.offer_id)
+
     def get_basket_discounts(self, obj):
         basket_discounts = []
         try:
-            discounts = obj.basket_discounts
-            if discounts:
-                for discount in discounts:
-                    basket_discount = {
-                        'amount': discount.amount,
-                        'benefit_value': discount.voucher.benefit.value if discount.voucher else None,
-                        'code': discount.voucher_code,
-                        'condition_name': discount.offer.condition.name if discount.offer else None,
-                        'contains_offer': bool(discount.offer),
-                        'currency': obj.currency,
-                        'enterprise_customer_name':
-                            discount.offer.condition.enterprise_customer_name if discount.offer else None,
-                        'offer_type': discount.offer.offer_type if discount.offer else None,
-                    }
-                    basket_discounts.append(basket_discount)
+            # Same discounts as obj.basket_discounts, filtered from the (prefetched) discounts of the order.
+            discounts = [discount for discount in obj.discounts.all() if discount.is_basket_discount]
+            for discount in discounts:
+                voucher = self._get_discount_voucher(discount)
+                offer = self._get_discount_offer(discount)
+                basket_discount = {
+                    'amount': discount.amount,
+                    'benefit_value': voucher.benefit.value if voucher else None,
+                    'code': discount.voucher_code,
+                    'condition_name': _get_condition_name(offer.condition) if offer else None,
+                    'contains_offer': bool(offer),
+                    'currency': obj.currency,
+                    'enterprise_customer_name': offer.condition.enterprise_customer_name if offer else None,
+                    'offer_type': offer.offer_type if offer else None,
+                }
+                basket_discounts.append(basket_discount)
         except (AttributeError, TypeError, ValueError):
             logger.exception(
                 '[Receipt MFE] Failed to retrieve basket discounts for [%s]',
@@ -465,7 +600,10 @@ class OrderSerializer(serializers.ModelSerializer):
 
     def get_dashboard_url(self, obj):
         try:
-            return ReceiptResponseView.get_order_dashboard_url(self, obj)
+            if self.program_uuids is None:
+                return ReceiptResponseView.get_order_dashboard_url(self, obj)
+            program_uuid = self.program_uuids.get(obj.basket_id)
+            return get_lms_program_dashboard_url(program_uuid) if program_uuid else get_lms_dashboard_url()
         except ValueError:
             logger.exception(
                 '[Receipt MFE] Failed to retrieve dashboard URL for [%s]',
@@ -513,6 +651,11 @@ class OrderSerializer(serializers.ModelSerializer):
         return payment_method
 
     def get_enterprise_learner_portal_url(self, obj):
+        if self._enterprise_learner_portal_url is _NOT_LOADED:
+            self._enterprise_learner_portal_url = self._get_enterprise_learner_portal_url(obj)
+        return self._enterprise_learner_portal_url
+
+    def _get_enterprise_learner_portal_url(self, obj):
         try:
             request = self.context['request']
             enterprise_customer_user = ReceiptResponseView().get_metadata_for_enterprise_user(request)
@@ -532,13 +675,16 @@ class OrderSerializer(serializers.ModelSerializer):
 
     def get_total_before_discounts_incl_tax(self, obj):
         try:
-            return str(obj.total_before_discounts_incl_tax)
+            # Same as obj.total_before_discounts_incl_tax, summed over the (prefetched) lines of the order.
+            lines = obj.lines.all()
+            basket_total = sum(line.line_price_before_discounts_incl_tax for line in lines)
+            return str(basket_total + obj.shipping_incl_tax)
         except ValueError:
             return None
 
     def get_order_product_ids(self, obj):
         try:
-            return ','.join(map(str, obj.lines.values_list('product_id', flat=True)))
+            return ','.join(str(line.product_id) for line in obj.lines.all())
         except (AttributeError, ValueError):
             logger.exception(
                 '[Receipt MFE] Failed to retrieve order product IDs for order [%s]',
@@ -581,6 +727,7 @@ class OrderSerializer(serializers.ModelSerializer):
             'user',
             'vouchers',
         )
+        list_serializer_class = OrderBulkSerializer
 
 
 class BasketSerializer(serializers.ModelSerializer):
@@ -823,9 +970,10 @@ class AtomicPublicationSerializer(serializers.Serializer):  # pylint: disable=ab
         return products
 
     def _get_seats_offered_on_mobile(self, course):
-        certificate_type_query = Q(attributes__name='certificate_type', attribute_values__value_text='verified')
-        mobile_query = Q(stockrecords__partner_sku__contains='mobile')
-        mobile_seats = course.seat_products.filter(certificate_type_query & mobile_query)
+        mobile_seats = course.seat_products.filter(
+            certificate_type='verified',
+            stockrecords__partner_sku__contains='mobile'
+        )
 
         return mobile_seats
 
@@ -1346,87 +1494,126 @@ class OfferAssignmentEmailTemplatesSerializer(serializers.ModelSerializer):
         return files.data
 
 
-class EnterpriseCouponOverviewListSerializer(serializers.ModelSerializer):
+def get_enterprise_coupons_overview_data(coupons):
     """
-    Serializer for Enterprise Coupons list overview.
-    """
-
-    def _get_num_unassigned(self, vouchers):
-        """
-        Return number of available assignments.
-        """
-        all_slots_available = 0
-        enterprise_offer = vouchers.first().enterprise_offer
+    Return the overview data of the given enterprise coupons, keyed by coupon id.
 
-        assignments = OfferAssignment.objects.filter(code__in=vouchers.values_list('code', flat=True)).exclude(
+    The data of all the coupons is computed with a fixed number of queries, whatever the number of coupons.
+    """
+    coupon_ids = [coupon.id for coupon in coupons]
+    coupon_vouchers = Voucher.objects.filter(coupon_vouchers__coupon_id__in=coupon_ids)
+    codes = coupon_vouchers.values('code')
+
+    vouchers_by_coupon = defaultdict(list)
+    coupon_ids_by_code = defaultdict(list)
+    for voucher in coupon_vouchers.annotate(coupon_id=F('coupon_vouchers__coupon_id')).order_by('-date_created', '-id'):
+        vouchers_by_coupon[voucher.coupon_id].append(voucher)
+        coupon_ids_by_code[voucher.code].append(voucher.coupon_id)
+
+    # The offers of the first voucher hold the data shared by all the vouchers of a coupon.
+    first_vouchers = [vouchers[0] for vouchers in vouchers_by_coupon.values()]
+    prefetch_related_objects(first_vouchers, 'offers__condition__range')
+
+    num_assignments_by_code = dict(
+        OfferAssignment.objects.filter(code__in=codes).exclude(
             status__in=[OFFER_REDEEMED, OFFER_ASSIGNMENT_REVOKED]
-        ).values('code').annotate(num_assignments=Count('code')).order_by('code')
+        ).values('code').annotate(num_assignments=Count('code')).order_by('code').values_list('code', 'num_assignments')
+    )
 
-        vouchers_num_assignments = {item['code']: item['num_assignments'] for item in assignments}
+    errors_by_coupon = defaultdict(list)
+    for offer_assignment in OfferAssignment.objects.filter(code__in=codes, status=OFFER_ASSIGNMENT_EMAIL_BOUNCED):
+        for coupon_id in coupon_ids_by_code[offer_assignment.code]:
+            errors_by_coupon[coupon_id].append(offer_assignment)
 
-        for voucher in vouchers:
-            num_assignments = vouchers_num_assignments.get(voucher.code, 0)
-            voucher_slots_available = voucher.calculate_available_slots(
-                enterprise_offer.max_global_applications,
-                num_assignments
-            )
-            if voucher_slots_available > 0:
-                all_slots_available += voucher_slots_available
+    now = timezone.now()
+    overview_data = {}
+    for coupon_id, vouchers in vouchers_by_coupon.items():
+        voucher = vouchers[0]
+        usage = voucher.usage
+        count = len(vouchers)
+        overview_data[coupon_id] = {
+            'start_date': voucher.start_datetime,
+            'end_date': voucher.end_datetime,
+            'num_uses': sum(coupon_voucher.num_orders for coupon_voucher in vouchers),
+            'usage_limitation': usage,
+            'num_codes': count,
+            'max_uses': _get_coupon_max_uses(voucher, usage, count),
+            'num_unassigned': _get_coupon_num_unassigned(vouchers, num_assignments_by_code),
+            'errors': OfferAssignmentSerializer(errors_by_coupon[coupon_id], many=True).data,
+            'available': voucher.start_datetime < now < voucher.end_datetime,
+            'enterprise_catalog_uuid': _retrieve_voucher_enterprise_customer_catalog(voucher),
+        }
+    return overview_data
 
-        return all_slots_available
 
-    def _get_errors(self, coupon):
-        """
-        Returns a list of OfferAssignment errors associated with coupon.
-        """
-        codes = coupon.attr.coupon_vouchers.vouchers.values_list('code', flat=True)
-        offer_assignments_with_error = OfferAssignment.objects.filter(
-            code__in=codes,
-            status=OFFER_ASSIGNMENT_EMAIL_BOUNCED
+def _get_coupon_num_unassigned(vouchers, num_assignments_by_code):
+    """
+    Return number of available assignments.
+    """
+    all_slots_available = 0
+    enterprise_offer = vouchers[0].enterprise_offer
+
+    for voucher in vouchers:
+        num_assignments = num_assignments_by_code.get(voucher.code, 0)
+        voucher_slots_available = voucher.calculate_available_slots(
+            enterprise_offer.max_global_applications,
+            num_assignments
         )
-        return OfferAssignmentSerializer(offer_assignments_with_error, many=True).data
+        if voucher_slots_available > 0:
+            all_slots_available += voucher_slots_available
 
-    # Max number of codes available (Maximum Coupon Usage).
-    def _get_max_uses(self, voucher, voucher_usage, voucher_count):
-        offer = voucher.best_offer
+    return all_slots_available
 
-        max_uses_per_code = None
-        if voucher_usage == Voucher.SINGLE_USE:
-            max_uses_per_code = 1
-        elif offer.max_global_applications:
-            max_uses_per_code = offer.max_global_applications
-        else:
-            max_uses_per_code = OFFER_MAX_USES_DEFAULT
 
-        return max_uses_per_code * voucher_count
+# Max number of codes available (Maximum Coupon Usage).
+def _get_coupon_max_uses(voucher, voucher_usage, voucher_count):
+    offer = voucher.best_offer
+
+    max_uses_per_code = None
+    if voucher_usage == Voucher.SINGLE_USE:
+        max_uses_per_code = 1
+    elif offer.max_global_applications:
+        max_uses_per_code = offer.max_global_applications
+    else:
+        max_uses_per_code = OFFER_MAX_USES_DEFAULT
+
+    return max_uses_per_code * voucher_count
+
+
+class EnterpriseCouponOverviewBulkSerializer(serializers.ListSerializer):  # pylint: disable=abstract-method
+    """
+    Serializes a page of enterprise coupons, computing the overview data of all of them at once.
+    """
+
+    def to_representation(self, data):
+        coupons = list(data.all() if isinstance(data, models.Manager) else data)
+        self.child.overview_data = get_enterprise_coupons_overview_data(coupons)
+        return [self.child.to_representation(coupon) for coupon in coupons]
+
+
+class EnterpriseCouponOverviewListSerializer(serializers.ModelSerializer):
+    """
+    Serializer for Enterprise Coupons list overview.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(EnterpriseCouponOverviewListSerializer, self).__init__(*args, **kwargs)
+        # Overview data of the coupons of a page, by coupon id, set by EnterpriseCouponOverviewBulkSerializer.
+        self.overview_data = {}
 
     def to_representation(self, coupon):  # pylint: disable=arguments-differ
         representation = super(EnterpriseCouponOverviewListSerializer, self).to_representation(coupon)
 
-        vouchers = coupon.attr.coupon_vouchers.vouchers.all()
-        voucher = vouchers.first()
-        usage = voucher.usage
-        count = vouchers.count()
-        num_orders = vouchers.aggregate(Sum('num_orders'))
-
-        data = {
-            'start_date': voucher.start_datetime,
-            'end_date': voucher.end_datetime,
-            'num_uses': num_orders['num_orders__sum'],
-            'usage_limitation': usage,
-            'num_codes': count,
-            'max_uses': self._get_max_uses(voucher, usage, count),
-            'num_unassigned': self._get_num_unassigned(vouchers),
-            'errors': self._get_errors(coupon),
-            'available': is_coupon_available(coupon),
-            'enterprise_catalog_uuid': retrieve_enterprise_customer_catalog(coupon),
-        }
+        overview_data = self.overview_data.get(coupon.id)
+        if overview_data is None:
+            overview_data = get_enterprise_coupons_overview_data([coupon])[coupon.id]
 
-        return dict(representation, **data)
+        return dict(representation, **overview_data)
 
     class Meta:
         model = Product
         fields = ('id', 'title')
+        list_serializer_class = EnterpriseCouponOverviewBulkSerializer
 
 
 class EnterpriseCouponSearchSerializer(serializers.Serializer):  # pylint: disable=abstract-method
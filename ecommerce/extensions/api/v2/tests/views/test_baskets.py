@@ -11,8 +11,10 @@ import ddt
 import mock
 import responses
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import override_settings
 from django.urls import reverse
+from edx_django_utils.cache import TieredCache
 from edx_rest_framework_extensions.auth.jwt.cookies import jwt_cookie_name
 from oscar.core.loading import get_model
 from oscar.test import factories
@@ -21,6 +23,7 @@ from rest_framework.throttling import UserRateThrottle
 from waffle.testutils import override_switch
 
 from ecommerce.core.constants import ALLOW_MISSING_LMS_USER_ID
+from ecommerce.core.utils import get_cache_key
 from ecommerce.courses.models import Course
 from ecommerce.extensions.api import exceptions as api_exceptions
 from ecommerce.extensions.api.tests.test_authentication import AccessTokenMixin
@@ -776,6 +779,53 @@ class BasketCalculateViewTests(ProgramTestMixin, ThrottlingMixin, TestCase):
         self.assertFalse(mock_calculate_basket.called, msg='The cache should be hit.')
         self.assertEqual(response.data, expected)
 
+    def _get_anonymous_calculate_cache_key(self, products):
+        skus = sorted(product.stockrecords.first().partner_sku for product in products)
+        return get_cache_key(site_domain=self.site, resource_name='calculate', skus=skus, bundle_id=None)
+
+    @mock.patch('ecommerce.extensions.api.v2.views.baskets.BasketCalculateView._calculate_temporary_basket_atomic')
+    def test_basket_calculate_anonymous_releases_lock(self, mock_calculate_basket):
+        """ Verify the lock taken to calculate an anonymous basket is released once the result is cached. """
+        mock_calculate_basket.return_value = {'Test Succeeded': True}
+        cache_key = self._get_anonymous_calculate_cache_key(self.products[0:1])
+
+        response = self.client.get(self._generate_sku_url(self.products[0:1], username=None))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(TieredCache.get_cached_response(cache_key).is_found)
+        self.assertIsNone(cache.get('{}_lock'.format(cache_key)))
+
+    @mock.patch('ecommerce.extensions.api.v2.views.baskets.time.sleep')
+    @mock.patch('ecommerce.extensions.api.v2.views.baskets.BasketCalculateView._calculate_temporary_basket_atomic')
+    def test_basket_calculate_anonymous_waits_for_calculation(self, mock_calculate_basket, mock_sleep):
+        """ Verify a request waits for the result of an anonymous basket calculated by another request. """
+        expected = {'Test Succeeded': True}
+        cache_key = self._get_anonymous_calculate_cache_key(self.products[0:1])
+        cache.add('{}_lock'.format(cache_key), True)
+        mock_sleep.side_effect = lambda __: TieredCache.set_all_tiers(cache_key, expected, 60)
+
+        response = self.client.get(self._generate_sku_url(self.products[0:1], username=None))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected)
+        self.assertTrue(mock_sleep.called)
+        self.assertFalse(mock_calculate_basket.called, msg='The basket should not be calculated again.')
+
+    @override_settings(ANONYMOUS_BASKET_CALCULATE_LOCK_WAIT=0)
+    @mock.patch('ecommerce.extensions.api.v2.views.baskets.BasketCalculateView._calculate_temporary_basket_atomic')
+    def test_basket_calculate_anonymous_wait_timeout(self, mock_calculate_basket):
+        """ Verify a request calculates the anonymous basket itself when another request takes too long to. """
+        expected = {'Test Succeeded': True}
+        mock_calculate_basket.return_value = expected
+        cache_key = self._get_anonymous_calculate_cache_key(self.products[0:1])
+        lock_key = '{}_lock'.format(cache_key)
+        cache.add(lock_key, True)
+
+        response = self.client.get(self._generate_sku_url(self.products[0:1], username=None))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, expected)
+        self.assertTrue(mock_calculate_basket.called)
+        # The lock belongs to the other request.
+        self.assertTrue(cache.get(lock_key))
+
     @mock.patch('ecommerce.extensions.api.v2.views.baskets.BasketCalculateView._calculate_temporary_basket_atomic')
     def test_basket_calculate_no_query_parameters(self, mock_calculate_basket_atomic):
         """Verify a request made without query parameters uses the request user"""
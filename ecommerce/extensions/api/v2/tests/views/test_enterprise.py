@@ -14,8 +14,10 @@ import pytz
 import responses
 import rules  # pylint: disable=unused-import
 from django.conf import settings
+from django.db import connection
 from django.db.models.signals import post_delete
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.http import urlencode  # pylint: disable=unused-import
@@ -44,6 +46,7 @@ from ecommerce.enterprise.rules import (  # pylint: disable=unused-import
     request_user_has_implicit_access_admin
 )
 from ecommerce.enterprise.tests.mixins import EnterpriseServiceMockMixin
+from ecommerce.extensions.api.v2.views.enterprise import OfferAssignmentRollup
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.fulfillment.modules import EnrollmentFulfillmentModule
 from ecommerce.extensions.offer.applicator import Applicator
@@ -53,6 +56,7 @@ from ecommerce.extensions.offer.constants import (
     DAY10,
     DAY19,
     MAX_FILES_SIZE_FOR_COUPONS,
+    OFFER_ASSIGNED,
     OFFER_ASSIGNMENT_EMAIL_BOUNCED,
     OFFER_ASSIGNMENT_EMAIL_SUBJECT_LIMIT,
     OFFER_ASSIGNMENT_EMAIL_TEMPLATE_FIELD_LIMIT,
@@ -1890,6 +1894,75 @@ class EnterpriseCouponViewSetRbacTests(
         assert len(results) == 1
         assert results[0]['id'] == effective_coupon.id
 
+    def create_overview_coupons(self, count):
+        """
+        Helper method for creating enterprise coupons with three single use codes each.
+        """
+        return [
+            self.create_coupon(
+                enterprise_customer=self.data['enterprise_customer']['id'],
+                enterprise_customer_catalog='aaaaaaaa-2c44-487b-9b6a-24eee973f9a4',
+                quantity=3,
+                start_datetime=datetime.datetime.now() - datetime.timedelta(days=1),
+                end_datetime=datetime.datetime.now() + datetime.timedelta(days=500),
+            )
+            for __ in range(count)
+        ]
+
+    def test_coupon_overview_data(self):
+        """
+        Test the overview data of a coupon is the same in the list and in the single coupon response.
+        """
+        enterprise_customer_uuid = self.data['enterprise_customer']['id']
+        coupon = self.create_overview_coupons(1)[0]
+        voucher_codes = list(coupon.attr.coupon_vouchers.vouchers.values_list('code', flat=True))
+        OfferAssignment.objects.create(
+            offer=coupon.attr.coupon_vouchers.vouchers.first().enterprise_offer,
+            code=voucher_codes[0],
+            user_email='assigned@example.com',
+        )
+        bounced_assignment = OfferAssignment.objects.create(
+            offer=coupon.attr.coupon_vouchers.vouchers.first().enterprise_offer,
+            code=voucher_codes[1],
+            user_email='bounced@example.com',
+            status=OFFER_ASSIGNMENT_EMAIL_BOUNCED,
+        )
+        self.set_jwt_cookie(system_wide_role=SYSTEM_ENTERPRISE_LEARNER_ROLE, context=enterprise_customer_uuid)
+        path = reverse('api:v2:enterprise-coupons-overview', kwargs={'enterprise_id': enterprise_customer_uuid})
+
+        result = self.get_response('GET', path).json()['results'][0]
+
+        assert result == self.get_response('GET', path, {'coupon_id': coupon.id}).json()
+        assert result['num_codes'] == 3
+        assert result['max_uses'] == 3
+        assert result['num_uses'] == 0
+        assert result['num_unassigned'] == 1
+        assert result['usage_limitation'] == Voucher.SINGLE_USE
+        assert result['available']
+        assert result['enterprise_catalog_uuid'] == 'aaaaaaaa-2c44-487b-9b6a-24eee973f9a4'
+        assert result['errors'] == [
+            {'id': bounced_assignment.id, 'user_email': 'bounced@example.com', 'code': voucher_codes[1]}
+        ]
+
+    def test_coupon_overview_query_count_independent_of_page_size(self):
+        """
+        Test the overview data of a page of coupons is computed with the same number of queries whatever the
+        number of coupons in the page.
+        """
+        enterprise_customer_uuid = self.data['enterprise_customer']['id']
+        self.set_jwt_cookie(system_wide_role=SYSTEM_ENTERPRISE_LEARNER_ROLE, context=enterprise_customer_uuid)
+        path = reverse('api:v2:enterprise-coupons-overview', kwargs={'enterprise_id': enterprise_customer_uuid})
+
+        self.create_overview_coupons(2)
+        # The first request creates the user of the JWT cookie.
+        self.get_response('GET', path)
+        with CaptureQueriesContext(connection) as initial_queries:
+            assert len(self.get_response('GET', path).json()['results']) == 2
+
+        self.create_overview_coupons(8)
+        with self.assertNumQueries(len(initial_queries)):
+            assert len(self.get_response('GET', path).json()['results']) == 10
+
     # @ddt.data(
     #     (
     #         '85b08dde-0877-4474-a4e9-8408fe47ce88',
@@ -4647,6 +4720,56 @@ class OfferAssignmentSummaryViewSetTests(
             else:  # To test if response has something in it it shouldn't
                 assert False
 
+    def test_query_count_independent_of_assignments(self):
+        """
+        The rollup and the pagination should be done by the database, so that the number of queries does not
+        depend on the number of offer assignments of the user.
+        """
+        path = OFFER_ASSIGNMENT_SUMMARY_LINK + '?page_size=10'
+        with CaptureQueriesContext(connection) as initial_queries:
+            self.client.get(path)
+
+        offer = OfferAssignment.objects.filter(user_email=self.user.email).first().offer
+        OfferAssignment.objects.bulk_create(
+            [
+                OfferAssignment(
+                    offer=offer,
+                    code='BULK{:03d}'.format(index % 100),
+                    user_email=self.user.email,
+                    status=OFFER_ASSIGNED,
+                )
+                for index in range(10000)
+            ],
+            batch_size=1000,
+        )
+
+        with self.assertNumQueries(len(initial_queries)):
+            response = self.client.get(path).json()
+
+        assert response['count'] == 103
+        assert len(response['results']) == 10
+        last_result = self.client.get(path + '&page=11').json()['results'][-1]
+        assert last_result['code'] == 'BULK099'
+        assert last_result['redemptions_remaining'] == 100
+        assert last_result['catalog'] == 'aaaaaaaa-2c44-487b-9b6a-24eee973f9a4'
+
+    def test_rollup_negative_indexes(self):
+        """
+        The rollup should be indexed and sliced with negative bounds like a list.
+        """
+        rollup = OfferAssignmentRollup(OfferAssignment.objects.filter(user_email=self.user.email))
+        items = list(rollup)
+        codes = [item['obj'].code for item in items]
+
+        assert rollup[-1]['obj'].code == codes[-1]
+        assert [item['obj'].code for item in rollup[-2:]] == codes[-2:]
+        assert [item['obj'].code for item in rollup[:-1]] == codes[:-1]
+        assert [item['obj'].code for item in rollup[-100:]] == codes
+        with self.assertRaises(IndexError):
+            rollup[-len(codes) - 1]  # pylint: disable=pointless-statement
+        with self.assertRaises(IndexError):
+            rollup[len(codes)]  # pylint: disable=pointless-statement
+
 
 @ddt.ddt
 class OfferAssignmentEmailTemplatesViewSetTests(JwtMixin, TestCase):
@@ -10,7 +10,9 @@ import pytz
 import responses
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_class, get_model
@@ -29,13 +31,14 @@ from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.views import ReceiptResponseView
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
-from ecommerce.extensions.test.factories import create_order, prepare_voucher
+from ecommerce.extensions.test.factories import ConditionalOfferFactory, VoucherFactory, create_order, prepare_voucher
 from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.mixins import Applicator, ThrottlingMixin
 from ecommerce.tests.testcases import TestCase
 
 Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
 ShippingEventType = get_model('order', 'ShippingEventType')
@@ -353,6 +356,59 @@ class OrderListViewTests(AccessTokenMixin, ThrottlingMixin, TestCase):
         self.assertEqual(content['results'][0]['number'], str(second_order.number))
         self.assertEqual(content['results'][1]['number'], str(order.number))
 
+    def create_orders_with_discounted_seats(self, user, count, source_type):
+        """ Create orders for the user, each for a discounted course seat and paid with the given source type. """
+        for __ in range(count):
+            course = CourseFactory(partner=self.partner)
+            seat = course.create_or_update_seat('verified', True, 100)
+            _range = factories.RangeFactory(products=[seat])
+            # The voucher is named explicitly, random names may clash across this many vouchers.
+            voucher = VoucherFactory(code='ORDERS{}'.format(seat.id), name='Orders {}'.format(seat.id))
+            voucher.offers.add(ConditionalOfferFactory(
+                offer_type=ConditionalOffer.VOUCHER,
+                benefit=factories.BenefitFactory(range=_range, type=Benefit.PERCENTAGE, value=15),
+                condition=factories.ConditionFactory(range=_range, value=1),
+            ))
+            basket = factories.BasketFactory(owner=user, site=self.site)
+            basket.vouchers.add(voucher)
+            basket.add_product(seat)
+            Applicator().apply(basket, user=user, request=self.request)
+            order = create_order(basket=basket, user=user)
+            factories.SourceFactory(order=order, source_type=source_type)
+
+    @mock.patch('ecommerce.extensions.checkout.views.ReceiptResponseView.get_metadata_for_enterprise_user')
+    def test_query_count_independent_of_page_size(self, mock_get_metadata_for_enterprise_user):
+        """ Verify the number of queries made to list orders does not grow with the number of orders. """
+        mock_get_metadata_for_enterprise_user.return_value = None
+        source_type = factories.SourceTypeFactory()
+        other_user = self.create_user()
+        other_token = self.generate_jwt_token_header(other_user)
+        self.create_orders_with_discounted_seats(self.user, 2, source_type)
+        self.create_orders_with_discounted_seats(other_user, 10, source_type)
+
+        # The first request of a user creates it from the JWT, warm them up so it is not counted.
+        self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
+        self.client.get(self.path, HTTP_AUTHORIZATION=other_token)
+
+        with CaptureQueriesContext(connection) as initial:
+            response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.json()['count'], 2)
+
+        mock_get_metadata_for_enterprise_user.reset_mock()
+        with self.assertNumQueries(len(initial)):
+            response = self.client.get(self.path, HTTP_AUTHORIZATION=other_token)
+
+        results = response.json()['results']
+        self.assertEqual(len(results), 10)
+        # The enterprise learner data only depends on the request, it is fetched once per page.
+        mock_get_metadata_for_enterprise_user.assert_called_once()
+        for result in results:
+            self.assertEqual(result['discount'], '15.00')
+            self.assertEqual(result['basket_discounts'][0]['benefit_value'], 15.0)
+            self.assertEqual(result['vouchers'][0]['code'], result['basket_discounts'][0]['code'])
+            self.assertEqual(result['payment_processor'], 'Creditcard')
+            self.assertEqual(result['order_product_ids'], str(result['lines'][0]['product']['id']))
+
 
 @ddt.ddt
 @override_settings(ECOMMERCE_SERVICE_WORKER_USERNAME='test-service-user')
@@ -10,6 +10,7 @@ import responses
 from django.http import Http404
 from django.urls import reverse
 from django.utils.timezone import now
+from freezegun import freeze_time
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
 from oscar.test.factories import BenefitFactory, OrderFactory, OrderLineFactory, ProductFactory, RangeFactory
@@ -23,7 +24,8 @@ from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.v2.views.vouchers import VoucherViewSet
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
-from ecommerce.extensions.offer.utils import get_benefit_type
+from ecommerce.extensions.offer.constants import VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY
+from ecommerce.extensions.offer.utils import get_benefit_type, get_voucher_offers_cache_version
 from ecommerce.extensions.partner.strategy import DefaultStrategy
 from ecommerce.extensions.test.factories import (
     ConditionalOfferFactory,
@@ -239,6 +241,86 @@ class VoucherViewSetTests(DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockMixi
             self.assertTrue(offer['multiple_credit_providers'])
             self.assertIsNone(offer['credit_provider_price'])
 
+    @responses.activate
+    def test_offers_page_cached(self):
+        """ Verify the converted offer page is cached, and credit seats are still filtered for each request. """
+        self.mock_access_token_response()
+        products, request, voucher = self.prepare_get_offers_response(quantity=2, seat_type='credit')
+        self.mock_eligibility_api(request, self.user, products[0].attr.course_key, eligible=True)
+        self.mock_eligibility_api(request, self.user, products[1].attr.course_key, eligible=True)
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 2)
+
+        order = OrderFactory(user=self.user)
+        order.lines.add(OrderLineFactory(product=products[0], partner_sku='test_sku'))
+        calls = len(responses.calls)
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 1)
+        # Only the credit eligibility of the user is checked again, Discovery is not called.
+        self.assertEqual(len(responses.calls), calls + 2)
+        self.assertTrue(all('eligibility' in call.request.url for call in responses.calls[calls:]))
+
+    @responses.activate
+    def test_offers_page_cached_omits_expired_seats(self):
+        """ Verify seats which expire after the offer page is cached are omitted from the cached page. """
+        self.mock_access_token_response()
+        products, request, voucher = self.prepare_get_offers_response(quantity=2)
+        # Seats expire without being saved, so the cached offer page is not invalidated.
+        Product.objects.filter(id=products[0].id).update(expires=now() + datetime.timedelta(hours=1))
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 2)
+
+        with freeze_time(now() + datetime.timedelta(hours=2)):
+            offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 1)
+
+    @responses.activate
+    def test_offers_page_cache_invalidated_on_condition_change(self):
+        """ Verify the cached offer page is not used once the condition of the voucher changes. """
+        self.mock_access_token_response()
+        __, request, voucher = self.prepare_get_offers_response(quantity=2)
+        cache_key = VoucherViewSet().get_offers_cache_key(request, voucher)
+
+        condition = voucher.best_offer.condition
+        condition.value = condition.value + 1
+        condition.save()
+        self.assertNotEqual(VoucherViewSet().get_offers_cache_key(request, voucher), cache_key)
+
+    @responses.activate
+    def test_offers_page_cache_invalidated_on_range_change(self):
+        """ Verify the cached offer page is invalidated when the range of the voucher changes. """
+        self.mock_access_token_response()
+        __, request, voucher = self.prepare_get_offers_response(quantity=2)
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 2)
+
+        product_range = voucher.best_offer.benefit.range
+        product_range.course_seat_types = 'professional'
+        product_range.save()
+        offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), 0)
+
+    def test_offers_page_cache_invalidated_on_offered_product_change(self):
+        """ Verify only changes to products that can be offered invalidate the cached offer pages. """
+        version = get_voucher_offers_cache_version(VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY)
+        ProductFactory()
+        self.assertEqual(get_voucher_offers_cache_version(VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY), version)
+
+        CourseFactory(partner=self.partner).create_or_update_seat('verified', True, 50)
+        self.assertNotEqual(get_voucher_offers_cache_version(VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY), version)
+
+    @responses.activate
+    @ddt.data(1, 5)
+    def test_offers_query_count(self, quantity):
+        """ Verify the products of a page of offers are resolved with a fixed number of queries. """
+        self.mock_access_token_response()
+        __, request, voucher = self.prepare_get_offers_response(quantity=quantity)
+        voucher = Voucher.objects.get(id=voucher.id)
+
+        with self.assertNumQueries(3):
+            offers = VoucherViewSet().get_offers(request=request, voucher=voucher)['results']
+        self.assertEqual(len(offers), quantity)
+
     def test_omitting_expired_courses(self):
         """Verify professional courses who's enrollment end datetime have passed are omitted."""
         no_enrollment_end_seat = CourseFactory(partner=self.partner).create_or_update_seat('professional', False, 100)
@@ -2,10 +2,12 @@
 
 
 import logging
+import time
 import warnings
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import transaction
 from django.http import HttpResponseBadRequest, HttpResponseForbidden
 from django.utils.decorators import method_decorator
@@ -360,6 +362,8 @@ class BasketCalculateView(generics.GenericAPIView):
     permission_classes = (IsAuthenticated,)
     throttle_classes = (ServiceUserThrottle,)
     MARKETING_USER = 'marketing_site_worker'
+    # Seconds between checks for the result of an anonymous basket calculation made by another request.
+    ANONYMOUS_BASKET_CALCULATE_POLL_INTERVAL = 0.05
 
     def _report_bad_request(self, developer_message, user_message):
         """Log error and create a response containing conventional error messaging."""
@@ -507,24 +511,53 @@ class BasketCalculateView(generics.GenericAPIView):
                 api_exceptions.LMS_USER_ID_NOT_FOUND_USER_MESSAGE
             )
 
-        cache_key = None
-        bundle_id = request.GET.get('bundle')
         if use_default_basket:
-            # For an anonymous user we can directly get the cached price, because
-            # there can't be any enrollments or entitlements.
-            # We want bundle_id to be in the cache_key, since calls without bundle_id will produce different results
-            cache_key = get_cache_key(
-                site_domain=request.site,
-                resource_name='calculate',
-                skus=skus,
-                bundle_id=bundle_id
-            )
+            response = self.calculate_anonymous_basket(request, products, voucher, skus, code)
+        else:
+            response = self._calculate_temporary_basket_atomic(basket_owner, request, products, voucher, skus, code)
+
+        return Response(response)
+
+    def calculate_anonymous_basket(self, request, products, voucher, skus, code, refresh=False):
+        """ Calculate the totals of a temporary basket for an anonymous user, through the cache.
+
+        For an anonymous user we can directly get the cached price, because there can't be any enrollments
+        or entitlements. When the price is not cached, only one request at a time calculates it for the
+        same SKUs; the others wait for its result for up to ANONYMOUS_BASKET_CALCULATE_LOCK_WAIT seconds,
+        before calculating it themselves.
+
+        Arguments:
+            refresh (bool): Calculate the price, and cache it, even if it is already cached.
+        """
+        # We want bundle_id to be in the cache_key, since calls without bundle_id will produce different results
+        cache_key = get_cache_key(
+            site_domain=request.site,
+            resource_name='calculate',
+            skus=skus,
+            bundle_id=request.GET.get('bundle')
+        )
+        if not refresh:
             cached_response = TieredCache.get_cached_response(cache_key)
             if cached_response.is_found:
-                return Response(cached_response.value)
-
-        response = self._calculate_temporary_basket_atomic(basket_owner, request, products, voucher, skus, code)
-        if response and use_default_basket:
-            TieredCache.set_all_tiers(cache_key, response, settings.ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT)
+                return cached_response.value
+
+        lock_key = '{}_lock'.format(cache_key)
+        if not cache.add(lock_key, True, settings.ANONYMOUS_BASKET_CALCULATE_LOCK_TIMEOUT):
+            # Another request is already calculating this basket.
+            deadline = time.monotonic() + settings.ANONYMOUS_BASKET_CALCULATE_LOCK_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(self.ANONYMOUS_BASKET_CALCULATE_POLL_INTERVAL)
+                cached_response = TieredCache.get_cached_response(cache_key)
+                if cached_response.is_found:
+                    return cached_response.value
+            logger.warning('Timed out waiting for the calculation of anonymous basket for SKUs [%s].', skus)
+            lock_key = None
 
-        return Response(response)
+        try:
+            response = self._calculate_temporary_basket_atomic(None, request, products, voucher, skus, code)
+            if response:
+                TieredCache.set_all_tiers(cache_key, response, settings.ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT)
+        finally:
+            if lock_key:
+                cache.delete(lock_key)
+        return response
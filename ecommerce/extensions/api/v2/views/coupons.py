@@ -69,9 +69,7 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
         )
         # Now that we have switched completely to using enterprise offers, ensure that enterprise coupons do not show up
         # in the regular coupon list view.
-        return product_filter.exclude(
-            attributes__code='enterprise_customer_uuid',
-        )
+        return product_filter.filter(enterprise_customer_uuid__isnull=True)
 
     def get_serializer_class(self):
         if self.action == 'list':
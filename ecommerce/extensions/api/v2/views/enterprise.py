@@ -4,7 +4,7 @@ from urllib.parse import urlparse
 import django_filters
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Q, prefetch_related_objects
+from django.db.models import Count, Min, Q, prefetch_related_objects
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -21,6 +21,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet, ViewSet
 
 from ecommerce.core.constants import COUPON_PRODUCT_CLASS_NAME, DEFAULT_CATALOG_PAGE_SIZE
+from ecommerce.core.db_router import ReadReplicaMixin
 from ecommerce.coupons.utils import is_coupon_available
 from ecommerce.enterprise.utils import (
     get_enterprise_catalog,
@@ -146,6 +147,60 @@ class EnterpriseCustomerCatalogsViewSet(ViewSet):
         return Response(catalog)
 
 
+class OfferAssignmentRollup:
+    """
+    Lazy sequence of offer assignments "rolled up" by code, for pagination.
+
+    Each item is a dictionary with the first offerAssignment object of a code, and the count of how many
+    offerAssignment objects of the queryset share that code. The grouping and the slicing are done by the
+    database, so only the offerAssignments of the requested page are loaded.
+    """
+    ordered = True
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self.codes = queryset.order_by().values('code').annotate(
+            count=Count('id'),
+            first_id=Min('id'),
+        ).order_by('first_id')
+
+    def count(self):
+        return self.codes.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            if index < 0:
+                index += self.count()
+            items = self[index:index + 1] if index >= 0 else []
+            if not items:
+                raise IndexError('OfferAssignmentRollup index out of range')
+            return items[0]
+
+        if (index.start or 0) < 0 or (index.stop or 0) < 0:
+            # As with a list, negative bounds count from the end. The database only takes non-negative bounds.
+            start, stop, __ = index.indices(self.count())
+            index = slice(start, max(start, stop), index.step)
+
+        rows = list(self.codes[index])
+        # Note that we can get away with just dropping in the first
+        # offerAssignment object of particular code that we see
+        # because most of the data we are returning lives on related
+        # objects that each of these offerAssignments share (e.g. the benefit)
+        offer_assignments = OfferAssignment.objects.select_related(
+            'offer__benefit',
+            'offer__condition',
+        ).prefetch_related(
+            'offer__vouchers',
+        ).in_bulk([row['first_id'] for row in rows])
+        return [{'count': row['count'], 'obj': offer_assignments[row['first_id']]} for row in rows]
+
+
 class OfferAssignmentSummaryViewSet(ModelViewSet):
     """
     Viewset to return OfferAssignment coupon data.
@@ -159,7 +214,7 @@ class OfferAssignmentSummaryViewSet(ModelViewSet):
 
     def get_queryset(self):
         """
-        Return a list of dictionaries to be serialized.
+        Return a lazy sequence of dictionaries to be serialized.
 
         Each dictionary contains one offerAssignment object, and the count of
         how many total offerAssignment objects the DB returned with the same
@@ -172,13 +227,8 @@ class OfferAssignmentSummaryViewSet(ModelViewSet):
         queryset = OfferAssignment.objects.filter(
             user_email=self.request.user.email,
             status__in=[OFFER_ASSIGNED, OFFER_ASSIGNMENT_EMAIL_PENDING],
-        ).select_related(
-            'offer__benefit',
-            'offer__condition',
         )
 
-        offer_assignments_with_counts = {}
-
         if self.request.query_params.get('full_discount_only'):
             queryset = queryset.filter(offer__benefit__value=100.0)
 
@@ -201,34 +251,21 @@ class OfferAssignmentSummaryViewSet(ModelViewSet):
         if enterprise_uuid:
             queryset = queryset.filter(offer__condition__enterprise_customer_uuid=enterprise_uuid)
 
-        for offer_assignment in queryset:
-            if offer_assignment.code not in offer_assignments_with_counts:
-                # Note that we can get away with just dropping in the first
-                # offerAssignment object of particular code that we see
-                # because most of the data we are returning lives on related
-                # objects that each of these offerAssignments share (e.g. the benefit)
-                offer_assignments_with_counts[offer_assignment.code] = {
-                    'count': 1,
-                    'obj': offer_assignment,
-                }
-            else:
-                offer_assignments_with_counts[offer_assignment.code]['count'] += 1
-
-        return list(offer_assignments_with_counts.values())
+        return OfferAssignmentRollup(queryset)
 
 
-class EnterpriseCouponViewSet(CouponViewSet):
+class EnterpriseCouponViewSet(ReadReplicaMixin, CouponViewSet):
     """ Coupon resource. """
     pagination_class = DatatablesDefaultPagination
 
     def get_queryset(self):
         filter_kwargs = {
             'product_class__name': COUPON_PRODUCT_CLASS_NAME,
-            'attributes__code': 'enterprise_customer_uuid',
+            'enterprise_customer_uuid__isnull': False,
         }
         enterprise_id = self.kwargs.get('enterprise_id')
         if enterprise_id:
-            filter_kwargs['attribute_values__value_text'] = enterprise_id
+            filter_kwargs['enterprise_customer_uuid'] = enterprise_id
 
         coupons = Product.objects.filter(**filter_kwargs)
 
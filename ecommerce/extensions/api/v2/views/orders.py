@@ -22,6 +22,7 @@ from rest_framework.permissions import DjangoModelPermissions, IsAdminUser, IsAu
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
+from ecommerce.core.db_router import ReadReplicaMixin
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_run_detail
 from ecommerce.enterprise.mixins import EnterpriseDiscountMixin
@@ -51,7 +52,7 @@ Benefit = get_model('offer', 'Benefit')
 
 
 @method_decorator(transaction.non_atomic_requests, name='dispatch')
-class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+class OrderViewSet(ReadReplicaMixin, viewsets.ReadOnlyModelViewSet):
     lookup_field = 'number'
     permission_classes = (IsAuthenticated, IsStaffOrOwner, DjangoModelPermissions,)
     queryset = Order.objects.all()
@@ -60,6 +61,18 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = (django_filters.rest_framework.DjangoFilterBackend,)
     filterset_class = OrderFilter
 
+    def get_queryset(self):
+        queryset = super(OrderViewSet, self).get_queryset()
+        if self.action == 'list':
+            # Load everything the serializer reads for the whole page, instead of order by order.
+            serializer_class = self.get_serializer_class()
+            queryset = queryset.select_related(
+                *serializer_class.select_related_fields
+            ).prefetch_related(
+                *serializer_class.prefetch_related_lookups
+            )
+        return queryset
+
     def filter_queryset(self, queryset):
         queryset = super(OrderViewSet, self).filter_queryset(queryset)
 
@@ -188,9 +201,10 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
         """ Returns existing OrderLine object purchased by user whether in the form of course entitlement
         or course enrollment."""
         course_uuid = get_course_run_detail(site, seat_product.course.id)['course_uuid']
-        products = Product.objects.filter(
-            Q(pk=seat_product.pk) | Q(attributes__code='UUID', attribute_values__value_text=course_uuid)
-        )
+        product_query = Q(pk=seat_product.pk)
+        if course_uuid:
+            product_query |= Q(uuid=course_uuid)
+        products = Product.objects.filter(product_query)
         return OrderLine.objects.filter(product__in=products, order__user=user, status=LINE.COMPLETE).first()
 
     def create(self, request):
@@ -278,10 +292,7 @@ class ManualCourseEnrollmentOrderViewSet(EdxOrderPlacementMixin, EnterpriseDisco
         except Course.DoesNotExist:
             return dict(enrollment, status=self.FAILURE, detail="Course not found", new_order_created=None)
 
-        seat_product = course.seat_products.filter(
-            attributes__name='certificate_type',
-            attribute_values__value_text=mode
-        ).first()
+        seat_product = course.seat_products.filter(certificate_type=mode).first()
 
         # check if an order already exists with the requested data
         try:
@@ -1,15 +1,20 @@
 """HTTP endpoints for interacting with vouchers."""
 
 
+import functools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 import django_filters
 import pytz
 from dateutil.parser import parse
 from dateutil.utils import default_tzinfo
+from django.conf import settings
+from django.db.models import Count, Prefetch, prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from django.utils.timezone import now
+from edx_django_utils.cache import TieredCache
 from opaque_keys.edx.keys import CourseKey
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError as ReqConnectionError
@@ -19,6 +24,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
+from ecommerce.core.utils import get_cache_key
 from ecommerce.coupons.utils import fetch_course_catalog, get_catalog_course_runs
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_info_from_catalog
@@ -26,14 +32,30 @@ from ecommerce.enterprise.utils import get_enterprise_catalog
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndStaff
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
+from ecommerce.extensions.offer.constants import (
+    VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY,
+    VOUCHER_OFFERS_RANGE_VERSION_CACHE_KEY
+)
+from ecommerce.extensions.offer.utils import get_benefit_type, get_voucher_offers_cache_version
 
 logger = logging.getLogger(__name__)
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
 
 
+def _call_concurrently(calls):
+    """ Runs the given callables, at most VOUCHER_OFFERS_MAX_WORKERS at a time, and returns their results in order. """
+    max_workers = min(settings.VOUCHER_OFFERS_MAX_WORKERS, len(calls))
+    if max_workers <= 1:
+        return [call() for call in calls]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda call: call(), calls))
+
+
 class VoucherFilter(django_filters.rest_framework.FilterSet):
     """
     Filter for vouchers via query string parameters.
@@ -109,7 +131,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             course_seat_types(str): Comma-separated list of accepted seat types.
 
         Returns:
-            Querysets of products and stock records retrieved from results.
+            The products and a queryset of their stock records retrieved from results.
         """
         course_run_metadata = {}
 
@@ -143,25 +165,38 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             elif is_course_run_enrollable(result):
                 course_run_metadata[result['key']] = result
 
-        products = []
-        for seat_type in course_seat_types.split(','):
-            products.extend(Product.objects.filter(
-                course_id__in=list(course_run_metadata.keys()),
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
-            ))
+        seat_types = course_seat_types.split(',')
+        products = Product.objects.filter(
+            course_id__in=list(course_run_metadata.keys()),
+            certificate_type__in=seat_types,
+        ).select_related('course', 'parent__product_class', 'product_class')
+
+        # Products are listed grouped by seat type, in the order of the accepted seat types.
+        products = sorted(products, key=lambda product: seat_types.index(product.certificate_type))
         stock_records = StockRecord.objects.filter(product__in=products)
         return products, stock_records, course_run_metadata
 
-    def convert_catalog_response_to_offers(self, request, voucher, response):
-        offers = []
+    def get_offer_candidates(self, request, voucher, response):
+        """ Converts a page of catalog results into offer candidates, which do not depend on the requesting user.
+
+        Each candidate holds the offer data for one product, or None if the course of the product is missing,
+        along with the credit provider details of the product if it is a credit seat. Credit seats still have to
+        be filtered for the requesting user, see filter_offer_candidates.
+
+        Args:
+            request (WSGIRequest): Request data.
+            voucher (Voucher): Oscar Voucher for which the offers are returned.
+            response (dict): Page of course catalog results.
+
+        Returns:
+            list: The offer candidates.
+        """
+        candidates = []
         benefit = voucher.best_offer.benefit
         # default course_seat_types value to all paid seat types.
         course_seat_types = 'verified,professional,credit'
         if benefit.range and benefit.range.course_seat_types:
             course_seat_types = benefit.range.course_seat_types
-        multiple_credit_providers = False
-        credit_provider_price = None
 
         logger.info('[Voucher Offers] CourseSeatTypes: [%s], Voucher: [%s]', course_seat_types, voucher.id)
 
@@ -169,70 +204,149 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             response['results'], course_seat_types
         )
         contains_verified_course = ('verified' in course_seat_types)
+        is_staff = getattr(request.strategy.user, 'is_staff', False)
+        product_stock_records = {}
+        for stock_record in stock_records.order_by('-pk'):
+            # The first stock record of each product wins, as it does for the strategy.
+            product_stock_records[stock_record.product_id] = stock_record
+        credit_products = [
+            product for product in products
+            if course_seat_types == 'credit' or product.certificate_type == 'credit'
+        ]
+        credit_seat_counts = {}
+        if credit_products:
+            credit_seat_counts = dict(
+                Product.objects.filter(
+                    parent_id__in={product.parent_id for product in credit_products},
+                    attributes__name='credit_provider'
+                ).order_by().values('parent_id').annotate(count=Count('id')).values_list('parent_id', 'count')
+            )
         for product in products:
             logger.info('[Voucher Offers] Constructing offer data. Product: [%s]', product.id)
+            stock_record = product_stock_records.get(product.id)
+            if not stock_record:
+                # Seats without stock records are not available to buy.
+                logger.error('Stock Record for product %s not found.', product.id)
+                continue
+
             # Omit unavailable seats from the offer results so that one seat does not cause an
             # error message for every seat in the query result.
-            if not request.strategy.fetch_for_product(product).availability.is_available_to_buy:
+            if not request.strategy.fetch_for_product(product, stock_record).availability.is_available_to_buy:
                 logger.info('%s is unavailable to buy. Omitting it from the results.', product)
                 continue
 
             course_id = product.course_id
             course_catalog_data = course_run_metadata[course_id]
-            if course_seat_types == 'credit' or product.attr.certificate_type == 'credit':
-                logger.info('[Voucher Offers] Constructing offer data for credit.')
-                # Omit credit seats for which the user is not eligible or which the user already bought.
-                if not request.user.is_eligible_for_credit(product.course_id, request.site.siteconfiguration):
-                    continue
-                if Order.objects.filter(user=request.user, lines__product=product).exists():
-                    continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
+            # Seats and course runs become unavailable as time passes, without any change that would invalidate
+            # the cached candidates, so the time until which the seat can be bought is checked on every request.
+            available_until = [
+                default_tzinfo(parse(course_catalog_data[field]), pytz.UTC)
+                for field in ('end', 'enrollment_end') if course_catalog_data.get(field)
+            ]
+            if product.expires and not is_staff:
+                available_until.append(product.expires)
+            course = product.course
+            if not course:  # pragma: no cover
+                logger.error('Course %s not found.', course_id)
 
-                if credit_seats.count() > 1:
-                    multiple_credit_providers = True
-                    credit_provider_price = None
+            credit = None
+            if product in credit_products:
+                logger.info('[Voucher Offers] Constructing offer data for credit.')
+                if credit_seat_counts.get(product.parent_id, 0) > 1:
+                    credit = {'multiple_credit_providers': True, 'credit_provider_price': None}
                 else:
-                    multiple_credit_providers = False
-                    credit_provider_price = StockRecord.objects.get(product=product).price
+                    credit = {'multiple_credit_providers': False, 'credit_provider_price': stock_record.price}
 
-            try:
-                stock_record = stock_records.get(product__id=product.id)
-            except StockRecord.DoesNotExist:
-                stock_record = None
-                logger.error('Stock Record for product %s not found.', product.id)
-
-            try:
-                course = Course.objects.get(id=course_id)
-            except Course.DoesNotExist:  # pragma: no cover
-                course = None
-                logger.error('Course %s not found.', course_id)
-
-            if course_catalog_data and course and stock_record:
-                offers.append(self.get_course_offer_data(
+            offer = None
+            if course_catalog_data and course:
+                offer = self.get_course_offer_data(
                     benefit=benefit,
                     course=course,
                     course_info=course_catalog_data,
-                    credit_provider_price=credit_provider_price,
-                    multiple_credit_providers=multiple_credit_providers,
+                    credit_provider_price=None,
+                    multiple_credit_providers=False,
                     is_verified=contains_verified_course,
                     product=product,
                     stock_record=stock_record,
-                    voucher=voucher
+                    voucher=voucher,
+                    seat_type=product.certificate_type,
+                )
+            candidates.append({
+                'course_id': course_id,
+                'product_id': product.id,
+                'available_until': min(available_until, default=None),
+                'credit': credit,
+                'offer': offer,
+            })
+
+        return candidates
+
+    def filter_offer_candidates(self, request, candidates):
+        """ Returns the offers of the given candidates which are available to the requesting user.
+
+        Seats which can no longer be bought, and credit seats for which the user is not eligible or which the
+        user already bought, are omitted. The eligibility of the user is checked concurrently for all credit
+        courses of the page.
+        """
+        current_time = now()
+        candidates = [
+            candidate for candidate in candidates
+            if not candidate['available_until'] or candidate['available_until'] > current_time
+        ]
+        credit_candidates = [candidate for candidate in candidates if candidate['credit']]
+        credit_course_ids = list(dict.fromkeys(candidate['course_id'] for candidate in credit_candidates))
+        eligibilities = {}
+        purchased_product_ids = set()
+        if credit_course_ids:
+            site_configuration = request.site.siteconfiguration
+            user = request.user
+            eligibilities = dict(zip(credit_course_ids, _call_concurrently([
+                functools.partial(user.is_eligible_for_credit, course_id, site_configuration)
+                for course_id in credit_course_ids
+            ])))
+            purchased_product_ids = set(Order.objects.filter(
+                user=user,
+                lines__product_id__in=[candidate['product_id'] for candidate in credit_candidates]
+            ).values_list('lines__product_id', flat=True))
+
+        offers = []
+        # The credit provider details of the last credit seat offered carry over to the following offers.
+        multiple_credit_providers = False
+        credit_provider_price = None
+        for candidate in candidates:
+            if candidate['credit']:
+                # Omit credit seats for which the user is not eligible or which the user already bought.
+                if not eligibilities[candidate['course_id']]:
+                    continue
+                if candidate['product_id'] in purchased_product_ids:
+                    continue
+                multiple_credit_providers = candidate['credit']['multiple_credit_providers']
+                credit_provider_price = candidate['credit']['credit_provider_price']
+
+            if candidate['offer']:
+                offers.append(dict(
+                    candidate['offer'],
+                    multiple_credit_providers=multiple_credit_providers,
+                    credit_provider_price=credit_provider_price,
                 ))
 
         return offers
 
-    def get_offers_from_catalog(self, request, voucher):
-        """ Helper method for collecting offers from catalog query or enterprise catalog.
+    def convert_catalog_response_to_offers(self, request, voucher, response):
+        candidates = self.get_offer_candidates(request, voucher, response)
+        return self.filter_offer_candidates(request, candidates)
+
+    def get_offer_candidates_from_catalog(self, request, voucher):
+        """ Helper method for collecting offer candidates from catalog query or enterprise catalog.
 
         Args:
             request (WSGIRequest): Request data.
             voucher (Voucher): Oscar Voucher for which the offers are returned.
 
         Returns:
-            A list of dictionaries with retrieved offers and a link to the next
-            page of the Course Discovery results.
-            """
+            A tuple of the offer candidates (see get_offer_candidates) and a link to the next
+            page of the Course Discovery results, or None if there is no catalog related data for the voucher.
+        """
         benefit = voucher.best_offer.benefit
         condition = voucher.best_offer.condition
 
@@ -244,26 +358,45 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         enterprise_catalog = (condition.enterprise_customer_catalog_uuid or
                               (benefit.range and benefit.range.enterprise_customer_catalog))
 
+        site = request.site
+        limit = request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE)
+        # The remote lookups below run in worker threads, which must not query the database.
+        site.siteconfiguration.partner  # pylint: disable=pointless-statement
+
+        catalog = None
+        response = None
+        if catalog_id and enterprise_catalog:
+            # The enterprise catalog does not depend on the course catalog, so both are fetched at the same time.
+            catalog, response = _call_concurrently([
+                functools.partial(fetch_course_catalog, site, catalog_id),
+                functools.partial(
+                    get_enterprise_catalog,
+                    site=site, enterprise_catalog=enterprise_catalog, limit=limit, page=request.GET.get('page'),
+                ),
+            ])
+        elif catalog_id:
+            catalog = fetch_course_catalog(site, catalog_id)
+
         if catalog_id:
-            catalog = fetch_course_catalog(request.site, catalog_id)
             catalog_query = catalog.get("query") if catalog else catalog_query
 
         # There is no catalog related data specified for this condition, so return None.
         if not catalog_query and not enterprise_customer:
-            return None, None
+            return None
 
         if enterprise_catalog:
-            response = get_enterprise_catalog(
-                site=request.site,
-                enterprise_catalog=enterprise_catalog,
-                limit=request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE),
-                page=request.GET.get('page'),
-            )
+            if response is None:
+                response = get_enterprise_catalog(
+                    site=site,
+                    enterprise_catalog=enterprise_catalog,
+                    limit=limit,
+                    page=request.GET.get('page'),
+                )
         elif catalog_query:
             response = get_catalog_course_runs(
-                site=request.site,
+                site=site,
                 query=catalog_query,
-                limit=request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE),
+                limit=limit,
                 offset=request.GET.get('offset'),
             )
         else:
@@ -273,10 +406,67 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             )
             return [], None
 
-        next_page = response['next']
-        offers = self.convert_catalog_response_to_offers(request, voucher, response)
+        return self.get_offer_candidates(request, voucher, response), response['next']
+
+    def get_offers_from_catalog(self, request, voucher):
+        """ Helper method for collecting offers from catalog query or enterprise catalog.
+
+        The offer candidates of each page are cached per voucher, offer condition and benefit, page and page size.
+        The cache is invalidated when the range of the voucher, or any seat or ranged product or its stock record,
+        changes. Expired seats and credit seats are filtered for the requesting user on every request.
+
+        Args:
+            request (WSGIRequest): Request data.
+            voucher (Voucher): Oscar Voucher for which the offers are returned.
+
+        Returns:
+            A list of dictionaries with retrieved offers and a link to the next
+            page of the Course Discovery results.
+            """
+        cache_key = self.get_offers_cache_key(request, voucher)
+        cached_response = TieredCache.get_cached_response(cache_key)
+        if cached_response.is_found:
+            page = cached_response.value
+        else:
+            page = self.get_offer_candidates_from_catalog(request, voucher)
+            TieredCache.set_all_tiers(cache_key, page, settings.VOUCHER_OFFERS_CACHE_TIMEOUT)
+
+        if page is None:
+            return None, None
 
-        return offers, next_page
+        candidates, next_page = page
+        return self.filter_offer_candidates(request, candidates), next_page
+
+    def get_offers_cache_key(self, request, voucher):
+        """ Returns the key of the cached offer candidates of the requested page of the voucher's offers. """
+        offer = voucher.best_offer
+        benefit = offer.benefit
+        condition = offer.condition
+        return get_cache_key(
+            resource='voucher_offers',
+            site_domain=request.site.domain,
+            voucher_id=voucher.id,
+            voucher_end_datetime=voucher.end_datetime,
+            offer_id=offer.id,
+            benefit_id=benefit.id,
+            benefit_type=get_benefit_type(benefit),
+            benefit_value=benefit.value,
+            condition_id=condition.id,
+            condition_proxy_class=condition.proxy_class,
+            condition_value=condition.value,
+            condition_range_id=condition.range_id,
+            condition_enterprise_customer_uuid=condition.enterprise_customer_uuid,
+            condition_enterprise_customer_catalog_uuid=condition.enterprise_customer_catalog_uuid,
+            range_version=get_voucher_offers_cache_version(
+                VOUCHER_OFFERS_RANGE_VERSION_CACHE_KEY.format(range_id=benefit.range_id)
+            ),
+            catalog_version=get_voucher_offers_cache_version(VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY),
+            # The availability of seats depends on whether the user of the strategy is staff.
+            is_staff=getattr(request.strategy.user, 'is_staff', False),
+            limit=request.GET.get('limit', DEFAULT_CATALOG_PAGE_SIZE),
+            page=request.GET.get('page'),
+            offset=request.GET.get('offset'),
+        )
 
     def get_offers(self, request, voucher):
         """
@@ -288,6 +478,10 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             dict: Dictionary containing a link to the next page of Course Discovery results and
                   a List of course offers where each offer is represented as a dictionary.
         """
+        # Resolve the offers of the voucher once, rather than each time its best offer is looked up.
+        prefetch_related_objects([voucher], Prefetch(
+            'offers', queryset=ConditionalOffer.objects.select_related('condition__range', 'benefit__range')
+        ))
         offers, next_page = self.get_offers_from_catalog(request, voucher)
         if offers is None:
             offers = []
@@ -319,7 +513,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
 
     def get_course_offer_data(
             self, benefit, course, course_info, credit_provider_price, is_verified,
-            multiple_credit_providers, product, stock_record, voucher
+            multiple_credit_providers, product, stock_record, voucher, seat_type=None
     ):
         """
         Gets course offer data.
@@ -330,6 +524,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             is_verified (bool): Indicated whether or not the voucher's range of products contains a verified course seat
             stock_record (StockRecord): Stock record associated with the course seat
             voucher (Voucher): Voucher for which the course offer data is being fetched
+            seat_type (str): Certificate type of the course seat, read from the product if not given
         Returns:
             dict: Course offer data
         """
@@ -348,7 +543,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             'multiple_credit_providers': multiple_credit_providers,
             'organization': CourseKey.from_string(course.id).org,
             'credit_provider_price': credit_provider_price,
-            'seat_type': product.attr.certificate_type,
+            'seat_type': seat_type or product.attr.certificate_type,
             'stockrecords': serializers.StockRecordSerializer(stock_record).data,
             'title': course_info.get('title', course.name),
             'voucher_end_date': voucher.end_datetime
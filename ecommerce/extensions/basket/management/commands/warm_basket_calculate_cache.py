@@ -0,0 +1,105 @@
+"""
+Management command that pre-warms the cached basket calculations of anonymous users.
+
+The marketing site requests the price of the same baskets over and over. Calculating them ahead of time, for
+example on a schedule shorter than ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT, keeps the requests of a traffic
+spike from all calculating the same baskets at once.
+"""
+
+
+import datetime
+import logging
+
+import crum
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
+from oscar.core.loading import get_model
+from oscar.test.utils import RequestFactory
+from threadlocals.threadlocals import set_thread_variable
+
+from ecommerce.core.db_router import read_replica
+from ecommerce.extensions.api.v2.views.baskets import BasketCalculateView
+from ecommerce.extensions.basket.constants import TEMPORARY_BASKET_CACHE_KEY
+
+logger = logging.getLogger(__name__)
+Line = get_model('order', 'Line')
+Product = get_model('catalogue', 'Product')
+
+
+class Command(BaseCommand):
+    help = 'Pre-warm the cached basket calculations of anonymous users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sku',
+                            action='append',
+                            dest='sku_sets',
+                            default=[],
+                            help='Comma-separated SKUs of a basket to calculate. Can be repeated.')
+        parser.add_argument('--top',
+                            action='store',
+                            dest='top',
+                            default=0,
+                            type=int,
+                            help='Also calculate single-SKU baskets for this many of the most ordered SKUs.')
+        parser.add_argument('--days',
+                            action='store',
+                            dest='days',
+                            default=30,
+                            type=int,
+                            help='Number of days of orders from which the most ordered SKUs are counted.')
+        parser.add_argument('--site-id',
+                            action='store',
+                            dest='site_id',
+                            type=int,
+                            help='ID of the site whose baskets are calculated. Defaults to all sites.')
+
+    def handle(self, *args, **options):
+        sites = Site.objects.filter(siteconfiguration__isnull=False).select_related('siteconfiguration__partner')
+        if options['site_id']:
+            sites = sites.filter(id=options['site_id'])
+
+        view = BasketCalculateView()
+        for site in sites:
+            partner = site.siteconfiguration.partner
+            sku_sets = [sorted(sku_set.split(',')) for sku_set in options['sku_sets']]
+            if options['top']:
+                sku_sets.extend([sku] for sku in self._get_most_ordered_skus(partner, options['top'], options['days']))
+
+            calculated = 0
+            for skus in sku_sets:
+                products = Product.objects.filter(stockrecords__partner=partner, stockrecords__partner_sku__in=skus)
+                if not products:
+                    logger.warning('Products with SKU(s) [%s] do not exist for site [%s].', ', '.join(skus), site)
+                    continue
+
+                request = self._get_request(site, skus)
+                try:
+                    view.calculate_anonymous_basket(request, products, None, skus, None, refresh=True)
+                except Exception:  # pylint: disable=broad-except
+                    # The error is logged by the view. The remaining baskets are still calculated.
+                    continue
+                calculated += 1
+
+            logger.info('Calculated [%d] anonymous baskets for site [%s].', calculated, site)
+
+    def _get_most_ordered_skus(self, partner, count, days):
+        since = timezone.now() - datetime.timedelta(days=days)
+        with read_replica():
+            return list(Line.objects.filter(
+                partner=partner,
+                order__date_placed__gte=since
+            ).values('partner_sku').annotate(
+                num_lines=Count('id')
+            ).order_by('-num_lines', 'partner_sku').values_list('partner_sku', flat=True)[:count])
+
+    def _get_request(self, site, skus):
+        """ Returns a request like the one made by the marketing site, set as the current request. """
+        request = RequestFactory().get('/', {'sku': skus, 'is_anonymous': 'true'})
+        request.site = site
+        crum.set_current_request(request)
+        set_thread_variable('request', request)
+        DEFAULT_REQUEST_CACHE.set(TEMPORARY_BASKET_CACHE_KEY, True)
+        return request
@@ -4,9 +4,11 @@ from io import StringIO
 
 from django.contrib.sites.models import Site
 from django.core.management import CommandError, call_command
+from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 from oscar.test import factories
 
+from ecommerce.core.utils import get_cache_key
 from ecommerce.extensions.test.factories import create_order
 from ecommerce.invoice.models import Invoice
 from ecommerce.tests.testcases import TestCase
@@ -134,3 +136,37 @@ class AddSiteToBasketsBasketsCommandTests(TestCase):
         """ Verify an error is raised if no site ID is specified. """
         with self.assertRaisesMessage(CommandError, 'A valid Site ID must be specified!'):
             call_command(self.command, commit=False)
+
+
+class WarmBasketCalculateCacheCommandTests(TestCase):
+    command = 'warm_basket_calculate_cache'
+
+    def setUp(self):
+        super(WarmBasketCalculateCacheCommandTests, self).setUp()
+        self.products = factories.ProductFactory.create_batch(2, stockrecords__partner=self.partner, categories=[])
+        self.skus = sorted(product.stockrecords.first().partner_sku for product in self.products)
+
+    def get_cached_calculation(self, skus):
+        cache_key = get_cache_key(site_domain=self.site, resource_name='calculate', skus=skus, bundle_id=None)
+        return TieredCache.get_cached_response(cache_key)
+
+    def test_warm_sku_sets(self):
+        """ Verify the given SKU sets are calculated and cached for anonymous users. """
+        call_command(self.command, '--sku', ','.join(self.skus), '--site-id', str(self.site.id))
+
+        cached_response = self.get_cached_calculation(self.skus)
+        self.assertTrue(cached_response.is_found)
+        total = sum(product.stockrecords.first().price for product in self.products)
+        self.assertEqual(cached_response.value['total_incl_tax'], total)
+        self.assertFalse(self.get_cached_calculation(self.skus[:1]).is_found)
+
+    def test_warm_most_ordered_skus(self):
+        """ Verify the most ordered SKUs are calculated and cached for anonymous users. """
+        basket = factories.BasketFactory(site=self.site)
+        basket.add_product(self.products[0])
+        create_order(basket=basket)
+
+        call_command(self.command, '--top', '1', '--site-id', str(self.site.id))
+
+        sku = self.products[0].stockrecords.first().partner_sku
+        self.assertTrue(self.get_cached_calculation([sku]).is_found)
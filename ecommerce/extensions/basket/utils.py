@@ -15,6 +15,7 @@ from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.signals import voucher_addition
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.core.url_utils import absolute_url
 from ecommerce.courses.utils import mode_for_product
 from ecommerce.extensions.analytics.utils import track_segment_event
@@ -25,6 +26,7 @@ from ecommerce.extensions.basket.constants import (
     PURCHASER_BEHALF_ATTRIBUTE,
     REDIRECT_WITH_WAFFLE_TESTING_QUERYSTRING
 )
+from ecommerce.extensions.catalogue.attribute_utils import prefetch_product_attributes
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.order.utils import UserAlreadyPlacedOrder
 from ecommerce.extensions.payment.constants import DISABLE_MICROFRONTEND_FOR_BASKET_PAGE_FLAG_NAME
@@ -35,7 +37,6 @@ from ecommerce.referrals.models import Referral
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
 BUNDLE = 'bundle_identifier'
@@ -265,10 +266,11 @@ def _find_seat_enrollment_toggle_sku(product, target_structure):
     """
 
     # Note: This query filter will not perform well with products that do not have a course_id
-    stock_records = StockRecord.objects.filter(
+    stock_records = list(StockRecord.objects.filter(
         product__course_id=product.course_id,
         product__structure=target_structure
-    )
+    ).select_related('product'))
+    prefetch_product_attributes([stock_record.product for stock_record in stock_records])
 
     # Determine the proper partner SKU to embed in the single/multiple basket switch link
     # The logic here is a little confusing.  "Seat" products have "certificate_type" attributes, and
@@ -378,7 +380,7 @@ def basket_add_organization_attribute(basket, request_data):
     purchaser = request_data.get(PURCHASER_BEHALF_ATTRIBUTE)
 
     if business_client:
-        organization_attribute, __ = BasketAttributeType.objects.get_or_create(name=ORGANIZATION_ATTRIBUTE_TYPE)
+        organization_attribute, __ = basket_attribute_types.get_or_create(ORGANIZATION_ATTRIBUTE_TYPE)
         BasketAttribute.objects.get_or_create(
             basket=basket,
             attribute_type=organization_attribute,
@@ -386,7 +388,7 @@ def basket_add_organization_attribute(basket, request_data):
         )
         # Also add the 'purchaser' attribute to the carts of all business client purchases. This way we can track
         # how many people read/paid attention to the checkbox during purchases.
-        purchaser_attribute, __ = BasketAttributeType.objects.get_or_create(name=PURCHASER_BEHALF_ATTRIBUTE)
+        purchaser_attribute, __ = basket_attribute_types.get_or_create(PURCHASER_BEHALF_ATTRIBUTE)
         BasketAttribute.objects.get_or_create(
             basket=basket,
             attribute_type=purchaser_attribute,
@@ -405,7 +407,7 @@ def basket_add_payment_intent_id_attribute(basket, payment_intent_id):
 
     """
 
-    payment_intent_id_attribute, __ = BasketAttributeType.objects.get_or_create(name=PAYMENT_INTENT_ID_ATTRIBUTE)
+    payment_intent_id_attribute, __ = basket_attribute_types.get_or_create(PAYMENT_INTENT_ID_ATTRIBUTE)
     # Do a get_or_create and update value_text after (instead of update_or_create)
     # to prevent a particularly slow full table scan that uses a LIKE
     basket_attribute, __ = BasketAttribute.objects.get_or_create(
@@ -430,9 +432,7 @@ def basket_add_enterprise_catalog_attribute(basket, request_data):
     # Value of enterprise catalog UUID is being passed as `catalog` from
     # basket page
     enterprise_catalog_uuid = request_data.get('catalog') if request_data else None
-    enterprise_catalog_attribute, __ = BasketAttributeType.objects.get_or_create(
-        name=ENTERPRISE_CATALOG_ATTRIBUTE_TYPE
-    )
+    enterprise_catalog_attribute, __ = basket_attribute_types.get_or_create(ENTERPRISE_CATALOG_ATTRIBUTE_TYPE)
     if enterprise_catalog_uuid:
         BasketAttribute.objects.update_or_create(
             basket=basket,
@@ -467,7 +467,7 @@ def _set_basket_bundle_status(bundle, basket):
     if bundle:
         BasketAttribute.objects.update_or_create(
             basket=basket,
-            attribute_type=BasketAttributeType.objects.get(name=BUNDLE),
+            attribute_type=basket_attribute_types.get(BUNDLE),
             defaults={'value_text': bundle}
         )
         basket.clear_vouchers()
@@ -517,7 +517,7 @@ def validate_voucher(voucher, user, basket, request_site):
     # Do not allow single course run coupons used on bundles.
     bundle_attribute = BasketAttribute.objects.filter(
         basket=basket,
-        attribute_type=BasketAttributeType.objects.get(name=BUNDLE)
+        attribute_type=basket_attribute_types.get(BUNDLE)
     )
     is_bundle_purchase = len(bundle_attribute) > 0
     voucher_program_uuid = voucher.best_offer.condition.program_uuid
@@ -630,6 +630,6 @@ def set_email_preference_on_basket(request, basket):
     """
     BasketAttribute.objects.update_or_create(
         basket=basket,
-        attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
+        attribute_type=basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE),
         defaults={'value_text': request.GET.get('email_opt_in') == 'true'},
     )
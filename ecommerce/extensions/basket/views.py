@@ -11,6 +11,7 @@ from decimal import Decimal
 import dateutil.parser
 import newrelic.agent
 import waffle
+from django.db.models import prefetch_related_objects
 from django.http import HttpResponseBadRequest, HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
@@ -30,7 +31,11 @@ from rest_framework.views import APIView
 
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.url_utils import absolute_redirect, get_lms_course_about_url, get_lms_url
-from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_catalog
+from ecommerce.courses.utils import (
+    get_certificate_type_display_value,
+    get_course_info_from_catalog,
+    prefetch_course_info_from_catalog
+)
 from ecommerce.enterprise.utils import (
     CONSENT_FAILED_PARAM,
     construct_enterprise_course_consent_url,
@@ -62,6 +67,7 @@ from ecommerce.extensions.basket.utils import (
     set_email_preference_on_basket,
     validate_voucher
 )
+from ecommerce.extensions.catalogue.attribute_utils import prefetch_product_attributes
 from ecommerce.extensions.offer.constants import DYNAMIC_DISCOUNT_FLAG
 from ecommerce.extensions.offer.dynamic_conditional_offer import get_percentage_from_request
 from ecommerce.extensions.offer.utils import (
@@ -118,6 +124,9 @@ class BasketLogicMixin:
             'is_enrollment_code_purchase': False
         }
 
+        lines = list(lines)
+        self._prefetch_line_products(lines)
+
         lines_data = []
         for line in lines:
             product = line.product
@@ -138,10 +147,9 @@ class BasketLogicMixin:
                 }
 
             context_updates['order_details_msg'] = self._get_order_details_message(product)
-            context_updates['switch_link_text'], context_updates['partner_sku'] = get_basket_switch_data(product)
 
             line_data.update({
-                'sku': product.stockrecords.first().partner_sku,
+                'sku': min(product.stockrecords.all(), key=lambda stock_record: stock_record.pk).partner_sku,
                 'benefit_value': self._get_benefit_value(line),
                 'enrollment_code': product.is_enrollment_code_product,
                 'line': line,
@@ -149,8 +157,28 @@ class BasketLogicMixin:
             })
             lines_data.append(line_data)
 
+        if lines:
+            # Only the switch link of the last line is displayed.
+            context_updates['switch_link_text'], context_updates['partner_sku'] = get_basket_switch_data(
+                lines[-1].product
+            )
+
         return context_updates, lines_data
 
+    def _prefetch_line_products(self, lines):
+        """
+        Loads what process_basket_lines reads about the products of the lines (product classes, stock records,
+        attributes and course information) for all lines at once.
+        """
+        products = [line.product for line in lines]
+        prefetch_related_objects(products, 'parent__product_class', 'product_class', 'stockrecords')
+        prefetch_product_attributes(products)
+        prefetch_course_info_from_catalog(self.request.site, [
+            product for product in products
+            if product.is_seat_product or product.is_course_entitlement_product or
+            product.is_enrollment_code_product
+        ])
+
     def process_totals(self, context):
         """
         Returns a Dictionary of data related to total price and discounts.
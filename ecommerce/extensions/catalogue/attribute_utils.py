@@ -0,0 +1,54 @@
+"""
+Helpers to read the attributes of many products without querying the attribute values of each product.
+"""
+from collections import defaultdict
+
+from oscar.core.loading import get_model
+
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+
+
+def load_product_attribute_values(product, attribute_values):
+    """
+    Initialize `product.attr` with attribute values already loaded, so reading the attributes does not query them.
+
+    This mirrors ProductAttributesContainer.initialize, which queries the values again: the values listed first
+    take precedence, and values already set on `product.attr` are kept.
+
+    Arguments:
+        product (Product): Product whose attributes are going to be read.
+        attribute_values (iterable): Attribute values of the product, followed by those inherited from its parent.
+    """
+    container = product.attr
+    # Marked first, as initialize does, so that checking for an attribute below does not load the values.
+    container.initialized = True
+    for attribute_value in attribute_values:
+        code = attribute_value.attribute.code
+        if not hasattr(container, code):
+            setattr(container, code, attribute_value.value)
+
+
+def prefetch_product_attributes(products):
+    """
+    Load the attribute values of the given products, and of their parents, with a single query.
+
+    Afterwards, reading `product.attr` no longer queries the attribute values of each product.
+
+    Arguments:
+        products (iterable): Products whose attributes are going to be read.
+    """
+    products = [product for product in products if not product.attr.initialized]
+    if not products:
+        return
+
+    product_ids = {product.id for product in products}
+    product_ids.update(product.parent_id for product in products if product.parent_id)
+    values_by_product = defaultdict(list)
+    for value in ProductAttributeValue.objects.filter(product_id__in=product_ids).select_related('attribute'):
+        values_by_product[value.product_id].append(value)
+
+    for product in products:
+        values = values_by_product[product.id]
+        if product.parent_id:
+            values = values + values_by_product[product.parent_id]
+        load_product_attribute_values(product, values)
@@ -0,0 +1,88 @@
+# Generated by Django 3.2.25 on 2026-10-18 21:24
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+DENORMALIZED_ATTRIBUTE_FIELDS = {
+    'course_key': 'course_key',
+    'certificate_type': 'certificate_type',
+    'UUID': 'uuid',
+    'enterprise_customer_uuid': 'enterprise_customer_uuid',
+}
+
+
+def copy_denormalized_attributes(apps, schema_editor):
+    """Copy the hot attribute values of existing products to their new columns. Empty values are left NULL."""
+    Product = apps.get_model('catalogue', 'Product')
+    ProductAttributeValue = apps.get_model('catalogue', 'ProductAttributeValue')
+
+    for code, field_name in DENORMALIZED_ATTRIBUTE_FIELDS.items():
+        values = ProductAttributeValue.objects.filter(
+            attribute__code=code, value_text__isnull=False
+        ).exclude(value_text='')
+        Product.objects.filter(
+            pk__in=values.values('product_id')
+        ).update(**{
+            field_name: Subquery(values.filter(product_id=OuterRef('pk')).order_by('pk').values('value_text')[:1])
+        })
+        # Same as product.attr, children without a value of their own get the value of their parent.
+        Product.objects.filter(
+            parent_id__in=values.values('product_id')
+        ).exclude(
+            attribute_values__attribute__code=code
+        ).update(**{
+            field_name: Subquery(
+                values.filter(product_id=OuterRef('parent_id')).order_by('pk').values('value_text')[:1]
+            )
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0057_auto_20231205_1034'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='certificate_type',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='course_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='enterprise_customer_uuid',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='uuid',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='certificate_type',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='course_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='enterprise_customer_uuid',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='uuid',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(copy_denormalized_attributes, migrations.RunPython.noop),
+    ]
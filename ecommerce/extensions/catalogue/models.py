@@ -3,7 +3,7 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import models
-from django.db.models.signals import post_init, post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.catalogue.abstract_models import (
@@ -26,6 +26,15 @@ from ecommerce.core.constants import (
 from ecommerce.core.utils import log_message_and_raise_validation_error
 from ecommerce.courses.constants import CertificateType
 
+# Hot product attributes, copied to indexed columns of Product so that products can be filtered on them without
+# joining the attribute values. Maps the attribute codes to the names of the columns.
+DENORMALIZED_ATTRIBUTE_FIELDS = {
+    'course_key': 'course_key',
+    'certificate_type': 'certificate_type',
+    'UUID': 'uuid',
+    'enterprise_customer_uuid': 'enterprise_customer_uuid',
+}
+
 
 class CreateSafeHistoricalRecords(HistoricalRecords):
     """
@@ -70,6 +79,14 @@ class Product(AbstractProduct):
                                    help_text=_('Last date/time on which this product can be purchased.'))
     original_expires = None
 
+    # Indexed copies of the attributes in DENORMALIZED_ATTRIBUTE_FIELDS, kept in sync whenever the product or one
+    # of its attribute values is saved. Read the attributes through `attr`; filter on these columns.
+    course_key = models.CharField(max_length=255, null=True, blank=True, db_index=True, editable=False)
+    certificate_type = models.CharField(max_length=255, null=True, blank=True, db_index=True, editable=False)
+    uuid = models.CharField(max_length=255, null=True, blank=True, db_index=True, editable=False)
+    enterprise_customer_uuid = models.CharField(max_length=255, null=True, blank=True, db_index=True,
+                                                editable=False)
+
     history = HistoricalRecords()
 
     @property
@@ -116,9 +133,16 @@ class Product(AbstractProduct):
         except AttributeError:
             pass
 
+        for code, field_name in DENORMALIZED_ATTRIBUTE_FIELDS.items():
+            setattr(self, field_name, _get_denormalized_value(getattr(self.attr, code, None)))
+
         super(Product, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
 
 
+def _get_denormalized_value(value):
+    return None if value is None or value == '' else str(value)
+
+
 @receiver(post_init, sender=Product)
 def update_original_expires(sender, **kwargs):  # pylint: disable=unused-argument
     """Updates original_expires value of an instance.
@@ -155,6 +179,37 @@ class ProductAttributeValue(AbstractProductAttributeValue):
     history = CreateSafeHistoricalRecords()
 
 
+@receiver(post_save, sender=ProductAttributeValue)
+@receiver(post_delete, sender=ProductAttributeValue)
+def update_denormalized_attribute(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Copies a saved or deleted attribute value to the matching column of its product and of its children.
+
+    Empty values are stored as NULL. Product.save already copies the attributes set through `attr`, in which
+    case the product held by the attribute value is up to date and is not written again. Same as `attr`,
+    children without a value of their own inherit the value of their parent, and a child whose own value is
+    deleted falls back to it.
+    """
+    field_name = DENORMALIZED_ATTRIBUTE_FIELDS.get(instance.attribute.code)
+    if field_name is None or kwargs.get('raw'):
+        return
+
+    product = instance.product if ProductAttributeValue.product.is_cached(instance) else None
+    if kwargs['signal'] is post_delete:
+        value = Product.objects.filter(children=instance.product_id).values_list(field_name, flat=True).first()
+    else:
+        value = _get_denormalized_value(instance.value)
+
+    if product is None or getattr(product, field_name) != value:
+        if product is not None:
+            setattr(product, field_name, value)
+        Product.objects.filter(pk=instance.product_id).update(**{field_name: value})
+
+    if product is None or product.is_parent:
+        Product.objects.filter(parent_id=instance.product_id).exclude(
+            attribute_values__attribute_id=instance.attribute_id
+        ).update(**{field_name: value})
+
+
 class Catalog(models.Model):
     name = models.CharField(max_length=255)
     partner = models.ForeignKey('partner.Partner', related_name='catalogs', on_delete=models.CASCADE)
@@ -122,3 +122,39 @@ class ProductTests(CouponMixin, DiscoveryTestMixin, TestCase):
 
         exception = ve.exception
         self.assertIn('Notification email must be a valid email address.', exception.message)
+
+    def test_denormalized_attributes(self):
+        """Verify the hot attributes of a product are copied to its indexed columns."""
+        __, seat, __ = self.create_course_seat_and_enrollment_code()
+        seat.refresh_from_db()
+        self.assertEqual(seat.course_key, seat.attr.course_key)
+        self.assertEqual(seat.certificate_type, seat.attr.certificate_type)
+
+        # Attribute values saved or deleted on their own also update the columns.
+        attribute_value = seat.attribute_values.get(attribute__code='certificate_type')
+        attribute_value.value = 'professional'
+        attribute_value.save()
+        self.assertEqual(Product.objects.get(id=seat.id).certificate_type, 'professional')
+
+        attribute_value.delete()
+        self.assertIsNone(Product.objects.get(id=seat.id).certificate_type)
+
+    def test_denormalized_attributes_inherited(self):
+        """Verify children without a value of their own follow the indexed columns of their parent."""
+        course, seat, __ = self.create_course_seat_and_enrollment_code()
+        parent = course.parent_seat_product
+
+        # A child whose own value is deleted falls back to the value of its parent.
+        seat.attribute_values.get(attribute__code='course_key').delete()
+        self.assertEqual(Product.objects.get(id=seat.id).course_key, course.id)
+
+        attribute_value = parent.attribute_values.get(attribute__code='course_key')
+        attribute_value.value = 'course-v1:edX+Other+2024'
+        attribute_value.save()
+        self.assertEqual(Product.objects.get(id=seat.id).course_key, 'course-v1:edX+Other+2024')
+
+        # Empty values are stored as NULL.
+        attribute_value.value = ''
+        attribute_value.save()
+        self.assertIsNone(Product.objects.get(id=parent.id).course_key)
+        self.assertIsNone(Product.objects.get(id=seat.id).course_key)
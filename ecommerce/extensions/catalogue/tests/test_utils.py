@@ -9,6 +9,7 @@ from oscar.core.loading import get_model
 
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.attribute_utils import prefetch_product_attributes
 from ecommerce.extensions.catalogue.tests.mixins import DiscoveryTestMixin
 from ecommerce.extensions.catalogue.utils import (
     create_coupon_product,
@@ -40,6 +41,18 @@ class UtilsTests(DiscoveryTestMixin, TestCase):
         self.seat = self.course.create_or_update_seat('verified', False, 0)
         self.catalog = Catalog.objects.create(name='Test', partner_id=self.partner.id)
 
+    def test_prefetch_product_attributes(self):
+        """ Verify the attributes of products, and of their parents, are loaded with a single query. """
+        seats = [self.seat, self.course.create_or_update_seat('audit', False, 0)]
+        seats = list(Product.objects.filter(id__in=[seat.id for seat in seats]).order_by('id'))
+
+        with self.assertNumQueries(1):
+            prefetch_product_attributes(seats)
+        with self.assertNumQueries(0):
+            self.assertEqual(seats[0].attr.certificate_type, 'verified')
+            self.assertFalse(seats[0].attr.id_verification_required)
+            self.assertEqual(seats[1].attr.course_key, self.course.id)
+
     def test_generate_sku_with_missing_product_class(self):
         """Verify the method raises an exception if the product class is missing."""
         with self.assertRaises(AttributeError):
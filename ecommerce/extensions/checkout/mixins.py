@@ -11,6 +11,7 @@ from ecommerce_worker.fulfillment.v1.tasks import fulfill_order
 from oscar.apps.checkout.mixins import OrderPlacementMixin
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.lookup_registry import basket_attribute_types, payment_event_types
 from ecommerce.core.models import BusinessClient
 from ecommerce.extensions.analytics.utils import audit_log, track_segment_event
 from ecommerce.extensions.api import data as data_api
@@ -34,7 +35,6 @@ OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
 post_checkout = get_class('checkout.signals', 'post_checkout')
 PaymentEvent = get_model('order', 'PaymentEvent')
-PaymentEventType = get_model('order', 'PaymentEventType')
 Source = get_model('payment', 'Source')
 SourceType = get_model('payment', 'SourceType')
 
@@ -151,7 +151,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin, metaclass=abc.ABCMeta):
             label=handled_processor_response.card_number,
             card_type=handled_processor_response.card_type
         )
-        event_type, __ = PaymentEventType.objects.get_or_create(name=PaymentEventTypeName.PAID)
+        event_type, __ = payment_event_types.get_or_create(PaymentEventTypeName.PAID)
         payment_event = PaymentEvent(event_type=event_type, amount=total, reference=reference,
                                      processor_name=self.payment_processor.NAME)
         self.add_payment_source(source)
@@ -218,7 +218,7 @@ class EdxOrderPlacementMixin(OrderPlacementMixin, metaclass=abc.ABCMeta):
         try:
             email_opt_in = BasketAttribute.objects.get(
                 basket=order.basket,
-                attribute_type=BasketAttributeType.objects.get(name=EMAIL_OPT_IN_ATTRIBUTE),
+                attribute_type=basket_attribute_types.get(EMAIL_OPT_IN_ATTRIBUTE),
             ).value_text == 'True'
         except BasketAttribute.DoesNotExist:
             email_opt_in = False
@@ -301,8 +301,9 @@ class EdxOrderPlacementMixin(OrderPlacementMixin, metaclass=abc.ABCMeta):
             line.product.is_enrollment_code_product for line in order.basket.all_lines()
         )
 
-        organization_attribute = BasketAttributeType.objects.filter(name=ORGANIZATION_ATTRIBUTE_TYPE).first()
-        if not organization_attribute:
+        try:
+            organization_attribute = basket_attribute_types.get(ORGANIZATION_ATTRIBUTE_TYPE)
+        except BasketAttributeType.DoesNotExist:
             return
 
         business_client = BasketAttribute.objects.filter(
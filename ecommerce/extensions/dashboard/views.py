@@ -2,8 +2,10 @@
 
 from oscar.apps.dashboard.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
 
+from ecommerce.core.db_router import ReadReplicaMixin
 
-class ExtendedIndexView(IndexView):
+
+class ExtendedIndexView(ReadReplicaMixin, IndexView):
     def get_stats(self):
         """
         Statistics for the store dashboard.
@@ -8,6 +8,7 @@ can successfully fulfill the product. Success can be reported back based on each
 
 
 import logging
+from functools import lru_cache
 from importlib import import_module
 
 from django.conf import settings
@@ -93,8 +94,16 @@ def fulfill_order(order, lines, email_opt_in=False):
 
 
 def get_fulfillment_modules():
-    """ Retrieves all fulfillment modules declared in settings. """
-    module_paths = getattr(settings, 'FULFILLMENT_MODULES', [])
+    """ Retrieves all fulfillment modules declared in settings.
+
+    Module classes are only imported the first time a given list of module paths is seen by the process.
+    """
+    return list(_load_fulfillment_modules(tuple(getattr(settings, 'FULFILLMENT_MODULES', []))))
+
+
+@lru_cache(maxsize=None)
+def _load_fulfillment_modules(module_paths):
+    """ Imports the fulfillment module classes at the given paths. """
     modules = []
 
     for cls_path in module_paths:
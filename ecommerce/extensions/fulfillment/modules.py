@@ -9,12 +9,15 @@ import abc
 import datetime
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode, urljoin
 
 import requests
 import waffle
 from django.conf import settings
 from django.urls import reverse
+from edx_django_utils import monitoring as monitoring_utils
 from getsmarter_api_clients.geag import GetSmarterEnterpriseApiClient
 from oscar.core.loading import get_model
 from requests.exceptions import ConnectionError as ReqConnectionError  # pylint: disable=ungrouped-imports
@@ -27,6 +30,7 @@ from ecommerce.core.constants import (
     HUBSPOT_FORMS_INTEGRATION_ENABLE,
     ISO_8601_FORMAT
 )
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.core.url_utils import get_lms_enrollment_api_url, get_lms_entitlement_api_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_info_from_catalog, mode_for_product
@@ -190,9 +194,7 @@ class EnrollmentFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmentModule
             messages if the LMS user id cannot be found.
     """
 
-    def _post_to_enrollment_api(self, data, user, usage):
-        enrollment_api_url = get_lms_enrollment_api_url()
-        timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
+    def _get_enrollment_api_headers(self, user, usage):
         headers = {
             'Content-Type': 'application/json',
             'X-Edx-Api-Key': settings.EDX_API_KEY
@@ -206,8 +208,59 @@ class EnrollmentFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmentModule
         if ip:
             headers['X-Forwarded-For'] = ip
 
+        return headers
+
+    def _post_to_enrollment_api(self, data, user, usage):
+        enrollment_api_url = get_lms_enrollment_api_url()
+        headers = self._get_enrollment_api_headers(user, usage)
+        return self._send_enrollment_api_request(enrollment_api_url, data, headers)
+
+    def _send_enrollment_api_request(self, enrollment_api_url, data, headers):
+        """ Posts to the Enrollment API. Safe to call from a worker thread, since it does not touch the database. """
+        timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
         return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
 
+    def _post_enrollments(self, enrollment_api_url, enrollments, headers):
+        """ Posts the given enrollments to the Enrollment API, several at a time.
+
+        At most ENROLLMENT_FULFILLMENT_MAX_WORKERS requests are in flight at once.
+
+        Arguments:
+            enrollment_api_url (str): URL of the Enrollment API.
+            enrollments (list of dict): POST data of each enrollment.
+            headers (dict): Headers sent with every request.
+
+        Returns:
+            list of tuple: (response, exception) for each enrollment, in the same order. Only one of the two is set.
+        """
+        def post(data):
+            try:
+                return self._send_enrollment_api_request(enrollment_api_url, data, headers), None
+            except (ReqConnectionError, Timeout) as exc:
+                return None, exc
+
+        max_workers = min(settings.ENROLLMENT_FULFILLMENT_MAX_WORKERS, len(enrollments))
+        if max_workers <= 1:
+            return [post(data) for data in enrollments]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(post, enrollments))
+
+    def _set_enrollment_error_status(self, order, line, exc):
+        """ Records a failure to reach the Enrollment API, or a service it depends on, for the given line. """
+        if isinstance(exc, Timeout):
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
+            )
+            order.notes.create(message='Fulfillment of order failed due to a request time out.', note_type='Error')
+            line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+        else:
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
+            )
+            order.notes.create(message='Fulfillment of order failed due to a network problem.', note_type='Error')
+            line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
+
     def _add_enterprise_data_to_enrollment_api_post(self, data, order):
         """ Augment enrollment api POST data with enterprise specific data.
 
@@ -305,6 +358,9 @@ class EnrollmentFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmentModule
 
             return order, lines
 
+        # Gather the enrollments first, so that they can be posted to the Enrollment API concurrently.
+        # Everything touching the database happens on this thread.
+        enrollments = []
         for line in lines:
             try:
                 mode = mode_for_product(line.product)
@@ -352,51 +408,56 @@ class EnrollmentFulfillmentModule(EnterpriseDiscountMixin, BaseFulfillmentModule
                 self._add_enterprise_data_to_enrollment_api_post(data, order)
                 logger.info("Updating orderline with enterprise discount metadata for order [%s]", order.number)
                 self.update_orderline_with_enterprise_discount_metadata(order, line)
+            except (ReqConnectionError, Timeout) as exc:
+                self._set_enrollment_error_status(order, line, exc)
+                continue
 
-                # Post to the Enrollment API. The LMS will take care of posting a new EnterpriseCourseEnrollment to
-                # the Enterprise service if the user+course has a corresponding EnterpriseCustomerUser.
-                logger.info("Posting to enrollment api for order [%s]", order.number)
-                response = self._post_to_enrollment_api(data, user=order.user, usage='fulfill enrollment')
-                logger.info("Finished posting to enrollment api for order [%s]", order.number)
-
-                if response.status_code == status.HTTP_200_OK:
-                    line.set_status(LINE.COMPLETE)
-
-                    audit_log(
-                        'line_fulfilled',
-                        order_line_id=line.id,
-                        order_number=order.number,
-                        product_class=line.product.get_product_class().name,
-                        course_id=course_key,
-                        mode=mode,
-                        user_id=order.user.id,
-                        credit_provider=provider,
-                    )
-                else:
-                    try:
-                        data = response.json()
-                        reason = data.get('message')
-                    except Exception:  # pylint: disable=broad-except
-                        reason = '(No detail provided.)'
-
-                    logger.error(
-                        "Fulfillment of line [%d] on order [%s] failed with status code [%d]: %s",
-                        line.id, order.number, response.status_code, reason
-                    )
-                    order.notes.create(message=reason, note_type='Error')
-                    line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
-            except ReqConnectionError:
-                logger.error(
-                    "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
+            enrollments.append((line, data, course_key, mode, provider))
+
+        results = []
+        if enrollments:
+            # Post to the Enrollment API. The LMS will take care of posting a new EnterpriseCourseEnrollment to
+            # the Enterprise service if the user+course has a corresponding EnterpriseCustomerUser.
+            logger.info("Posting [%d] enrollments to enrollment api for order [%s]", len(enrollments), order.number)
+            start = time.time()
+            results = self._post_enrollments(
+                get_lms_enrollment_api_url(),
+                [data for __, data, __, __, __ in enrollments],
+                self._get_enrollment_api_headers(order.user, usage='fulfill enrollment'),
+            )
+            monitoring_utils.set_custom_attribute('enrollment_fulfillment_line_count', len(enrollments))
+            monitoring_utils.set_custom_attribute('enrollment_fulfillment_post_seconds', time.time() - start)
+            logger.info("Finished posting to enrollment api for order [%s]", order.number)
+
+        for (line, __, course_key, mode, provider), (response, exc) in zip(enrollments, results):
+            if exc is not None:
+                self._set_enrollment_error_status(order, line, exc)
+            elif response.status_code == status.HTTP_200_OK:
+                line.set_status(LINE.COMPLETE)
+
+                audit_log(
+                    'line_fulfilled',
+                    order_line_id=line.id,
+                    order_number=order.number,
+                    product_class=line.product.get_product_class().name,
+                    course_id=course_key,
+                    mode=mode,
+                    user_id=order.user.id,
+                    credit_provider=provider,
                 )
-                order.notes.create(message='Fulfillment of order failed due to a network problem.', note_type='Error')
-                line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
-            except Timeout:
+            else:
+                try:
+                    data = response.json()
+                    reason = data.get('message')
+                except Exception:  # pylint: disable=broad-except
+                    reason = '(No detail provided.)'
+
                 logger.error(
-                    "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
+                    "Fulfillment of line [%d] on order [%s] failed with status code [%d]: %s",
+                    line.id, order.number, response.status_code, reason
                 )
-                order.notes.create(message='Fulfillment of order failed due to a request time out.', note_type='Error')
-                line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+                order.notes.create(message=reason, note_type='Error')
+                line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
         logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
         return order, lines
 
@@ -549,12 +610,9 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
 
         for line in lines:
             name = 'Enrollment Code Range for {}'.format(line.product.attr.course_key)
-            seat = Product.objects.filter(
-                attributes__name='course_key',
-                attribute_values__value_text=line.product.attr.course_key
-            ).get(
-                attributes__name='certificate_type',
-                attribute_values__value_text=line.product.attr.seat_type
+            seat = Product.objects.get(
+                course_key=line.product.attr.course_key,
+                certificate_type=line.product.attr.seat_type
             )
             _range, created = Range.objects.get_or_create(name=name)
             if created:
@@ -612,7 +670,7 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
             # extract basket info needed to determine if purchase was made on behalf of an Enterprise
             basket_attrib_purchaser = BasketAttribute.objects.get(
                 basket=order.basket,
-                attribute_type=BasketAttributeType.objects.get(name=PURCHASER_BEHALF_ATTRIBUTE))
+                attribute_type=basket_attribute_types.get(PURCHASER_BEHALF_ATTRIBUTE))
             enterprise_purchase = basket_attrib_purchaser.value_text == "True"
         except (BasketAttribute.DoesNotExist, BasketAttributeType.DoesNotExist):
             logger.exception("Error occurred attempting to retrieve Basket Attribute '%s' from basket for order [%s]",
@@ -674,7 +732,7 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         try:
             organization = BasketAttribute.objects.get(
                 basket=order.basket,
-                attribute_type=BasketAttributeType.objects.get(name="organization"))
+                attribute_type=basket_attribute_types.get("organization"))
         except (BasketAttribute.DoesNotExist, BasketAttributeType.DoesNotExist):
             logger.exception("Error occurred attempting to retrieve Basket Attribute 'organization' from basket for "
                              "order [%s]", order.number)
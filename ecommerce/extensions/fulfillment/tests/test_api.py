@@ -27,6 +27,7 @@ class FulfillmentApiTests(FulfillmentTestMixin, TestCase):
     def setUp(self):
         super(FulfillmentApiTests, self).setUp()
         self.order = self.generate_open_order()
+        api._load_fulfillment_modules.cache_clear()  # pylint: disable=protected-access
 
     @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule', ])
     def test_fulfill_order_successful_fulfillment(self):
@@ -94,6 +95,23 @@ class FulfillmentApiTests(FulfillmentTestMixin, TestCase):
                 'Could not load module at [ecommerce.extensions.fulfillment.tests.modules.NotARealModule]'
             ))
 
+    def test_get_fulfillment_modules_cached(self):
+        """
+        Verify the modules are only imported once for a given configuration.
+        """
+        module_paths = ['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule']
+        with patch('ecommerce.extensions.fulfillment.api.import_module', wraps=api.import_module) as mock_import:
+            with override_settings(FULFILLMENT_MODULES=module_paths):
+                self.assertEqual(get_fulfillment_modules(), [FakeFulfillmentModule])
+                self.assertEqual(get_fulfillment_modules(), [FakeFulfillmentModule])
+                self.assertEqual(mock_import.call_count, 1)
+
+            with override_settings(FULFILLMENT_MODULES=module_paths + [
+                'ecommerce.extensions.fulfillment.tests.modules.FulfillmentNothingModule'
+            ]):
+                self.assertEqual(len(get_fulfillment_modules()), 2)
+                self.assertEqual(mock_import.call_count, 3)
+
     @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule',
                                             'ecommerce.extensions.fulfillment.tests.modules.FulfillNothingModule'])
     def test_get_fulfillment_modules_for_line(self):
@@ -3,6 +3,7 @@
 
 import datetime
 import json
+import threading
 import uuid
 from decimal import Decimal
 from urllib.parse import urlencode
@@ -324,6 +325,47 @@ class EnrollmentFulfillmentModuleTests(
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_TIMEOUT_ERROR, self.order.lines.all()[0].status)
 
+    @override_settings(ENROLLMENT_FULFILLMENT_MAX_WORKERS=3)
+    def test_enrollment_module_fulfill_multiple_lines(self):
+        """Test that the enrollments of a multi-line order are posted concurrently and each line keeps its status."""
+        course_ids = ['edX/DemoX/Course_{}'.format(i) for i in range(3)]
+        basket = factories.BasketFactory(owner=self.user, site=self.site)
+        for course_id in course_ids:
+            course = CourseFactory(id=course_id, name='Demo Course', partner=self.partner)
+            basket.add_product(course.create_or_update_seat(self.certificate_type, False, 100), 1)
+        order = create_order(number=3, basket=basket, user=self.user)
+
+        responses_by_course = {
+            course_ids[0]: mock.Mock(status_code=200),
+            course_ids[1]: Timeout(),
+            course_ids[2]: mock.Mock(status_code=500, json=mock.Mock(return_value={'message': 'Oops!'})),
+        }
+        thread_names = set()
+
+        def send_enrollment_api_request(_url, data, _headers):
+            thread_names.add(threading.current_thread().name)
+            result = responses_by_course[data['course_details']['course_id']]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with mock.patch.object(
+                EnrollmentFulfillmentModule, '_send_enrollment_api_request', side_effect=send_enrollment_api_request
+        ):
+            __, lines = EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.all()))
+
+        statuses = {line.product.attr.course_key: line.status for line in lines}
+        self.assertEqual(statuses, {
+            course_ids[0]: LINE.COMPLETE,
+            course_ids[1]: LINE.FULFILLMENT_TIMEOUT_ERROR,
+            course_ids[2]: LINE.FULFILLMENT_SERVER_ERROR,
+        })
+        self.assertEqual(
+            sorted(order.notes.values_list('message', flat=True)),
+            ['Fulfillment of order failed due to a request time out.', 'Oops!']
+        )
+        self.assertNotIn(threading.current_thread().name, thread_names)
+
     @responses.activate
     @ddt.data(None, '{"message": "Oops!"}')
     def test_enrollment_module_server_error(self, body):
@@ -4,7 +4,6 @@ import time
 
 import app_store_notifications_v2_validator as asn2
 import httplib2
-from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.http import JsonResponse
@@ -79,6 +78,8 @@ from ecommerce.extensions.iap.processors.ios_iap import IOSIAP
 from ecommerce.extensions.order.exceptions import AlreadyPlacedOrderException
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment.exceptions import RedundantPaymentNotificationError
+from ecommerce.extensions.payment.registry import payment_processor_registry
+from ecommerce.extensions.payment.utils import get_first_processor_transaction
 from ecommerce.extensions.refund.api import create_refunds, find_orders_associated_with_course
 from ecommerce.extensions.refund.status import REFUND
 
@@ -263,8 +264,7 @@ class BaseRefund(APIView):
     def refund(self, transaction_id, processor_response):
         """ Get a transaction id and create a refund against that transaction. """
         is_refunded = False
-        original_purchase = PaymentProcessorResponse.objects.filter(transaction_id=transaction_id,
-                                                                    processor_name=self.processor_name).first()
+        original_purchase = get_first_processor_transaction(transaction_id, self.processor_name)
         if not original_purchase:
             logger.error(ERROR_TRANSACTION_NOT_FOUND_FOR_REFUND, transaction_id, self.processor_name)
             return is_refunded
@@ -312,8 +312,7 @@ class AndroidRefundView(BaseRefund):
         and call refund method on every refund.
         """
 
-        partner_short_code = request.site.siteconfiguration.partner.short_code
-        configuration = settings.PAYMENT_PROCESSOR_CONFIG[partner_short_code.lower()][self.processor_name.lower()]
+        configuration = payment_processor_registry.get_site_configuration(request.site, self.processor_name)
         service = self._get_service(configuration)
 
         refunds_age = IAPProcessorConfiguration.get_solo().android_refunds_age_in_days
@@ -1,6 +1,6 @@
 from ecommerce.extensions.iap.api.v1.google_validator import GooglePlayValidator
 from ecommerce.extensions.iap.processors.base_iap import BaseIAP
-from ecommerce.extensions.payment.models import PaymentProcessorResponse
+from ecommerce.extensions.payment.utils import processor_transaction_exists
 
 
 class AndroidIAP(BaseIAP):  # pylint: disable=W0223
@@ -18,6 +18,4 @@ class AndroidIAP(BaseIAP):  # pylint: disable=W0223
         """
         Return True if the transaction_id has previously been processed for a purchase.
         """
-        return PaymentProcessorResponse.objects.filter(
-            processor_name=self.NAME,
-            transaction_id=transaction_id).exists()
+        return processor_transaction_exists(transaction_id, processor_name=self.NAME)
@@ -1,6 +1,6 @@
 from ecommerce.extensions.iap.api.v1.ios_validator import IOSValidator
 from ecommerce.extensions.iap.processors.base_iap import BaseIAP
-from ecommerce.extensions.payment.models import PaymentProcessorResponse
+from ecommerce.extensions.payment.models import PaymentProcessorResponse, PaymentProcessorTransaction
 
 
 class IOSIAP(BaseIAP):  # pylint: disable=W0223
@@ -20,4 +20,7 @@ class IOSIAP(BaseIAP):  # pylint: disable=W0223
         """
         return PaymentProcessorResponse.objects.filter(
             processor_name=self.NAME,
-            extension__original_transaction_id=original_transaction_id).exists()
+            extension__original_transaction_id=original_transaction_id).exists() or \
+            PaymentProcessorTransaction.objects.filter(
+                processor_name=self.NAME,
+                original_transaction_id=original_transaction_id).exists()
@@ -6,6 +6,7 @@ from itertools import chain
 from oscar.apps.offer.applicator import Applicator as OscarApplicator
 from oscar.core.loading import get_model
 
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.enterprise.api import get_enterprise_id_for_user
 
 logger = logging.getLogger(__name__)
@@ -113,12 +114,11 @@ class Applicator(OscarApplicator):
             list of Offer: List of all the offers applicable to the program.
         """
         BasketAttribute = get_model('basket', 'BasketAttribute')
-        BasketAttributeType = get_model('basket', 'BasketAttributeType')
         ConditionalOffer = get_model('offer', 'ConditionalOffer')
 
         bundle_attributes = BasketAttribute.objects.filter(
             basket=basket,
-            attribute_type=BasketAttributeType.objects.get(name=BUNDLE)
+            attribute_type=basket_attribute_types.get(BUNDLE)
         )
         program_uuid = bundle_id if bundle_attributes.count() == 0 else bundle_attributes.first().value_text
         if program_uuid:
@@ -11,6 +11,10 @@ OFFER_ASSIGNMENT_REVOKED = 'REVOKED'
 
 OFFER_MAX_USES_DEFAULT = 10000
 
+# Versions of the cached voucher offer pages, see get_voucher_offers_cache_version.
+VOUCHER_OFFERS_RANGE_VERSION_CACHE_KEY = 'voucher_offers_range_version_{range_id}'
+VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY = 'voucher_offers_catalog_version'
+
 # Coupon code filters
 VOUCHER_NOT_ASSIGNED = 'unassigned'
 VOUCHER_NOT_REDEEMED = 'unredeemed'
@@ -0,0 +1,97 @@
+"""
+This command rebuilds the local catalog membership index of dynamic ranges.
+"""
+
+
+import logging
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from oscar.core.loading import get_model
+from requests.exceptions import RequestException
+
+from ecommerce.coupons.utils import fetch_course_catalog, get_catalog_query_identifiers
+
+logger = logging.getLogger(__name__)
+Range = get_model('offer', 'Range')
+RangeCatalogMembership = get_model('offer', 'RangeCatalogMembership')
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the catalog membership index of ranges defined by a catalog query or a Discovery course catalog.
+
+    Ranges whose catalog cannot be retrieved from the Discovery Service keep their previous index.
+    Meant to be run periodically, for example from cron.
+
+    Example:
+
+        ./manage.py refresh_range_catalog_index --site-id 1
+    """
+
+    help = 'Rebuild the local catalog membership index of dynamic ranges.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--site-id',
+                            action='store',
+                            dest='site_id',
+                            type=int,
+                            required=True,
+                            help='ID of the Site used to query the Discovery Service.')
+        parser.add_argument('--range-id',
+                            action='append',
+                            dest='range_ids',
+                            type=int,
+                            help='ID of a range to refresh. May be given several times. Defaults to all '
+                                 'dynamic ranges.')
+        parser.add_argument('--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            type=int,
+                            default=1000,
+                            help='Number of index rows inserted per query.')
+
+    def handle(self, *args, **options):
+        try:
+            site = Site.objects.get(id=options['site_id'])
+        except Site.DoesNotExist as site_no_exist:
+            raise CommandError('A valid Site ID must be specified!') from site_no_exist
+
+        ranges = Range.objects.filter(
+            Q(catalog_query__isnull=False) | Q(course_catalog__isnull=False),
+            course_seat_types__isnull=False,
+        )
+        if options['range_ids']:
+            ranges = ranges.filter(id__in=options['range_ids'])
+
+        identifiers_by_query = {}
+        refreshed = failed = 0
+        for offer_range in ranges.iterator():
+            try:
+                query = offer_range.catalog_query
+                if query is None:
+                    query = fetch_course_catalog(site, offer_range.course_catalog)['query']
+                if query not in identifiers_by_query:
+                    identifiers_by_query[query] = get_catalog_query_identifiers(site, query)
+            except (KeyError, RequestException):
+                logger.exception('Failed to retrieve the catalog of range [%d]. Keeping its existing index.',
+                                 offer_range.id)
+                failed += 1
+                continue
+
+            with transaction.atomic():
+                offer_range.catalog_memberships.all().delete()
+                RangeCatalogMembership.objects.bulk_create(
+                    [
+                        RangeCatalogMembership(range=offer_range, identifier=identifier)
+                        for identifier in identifiers_by_query[query]
+                    ],
+                    batch_size=options['batch_size'],
+                )
+            logger.info('Indexed [%d] catalog entries for range [%d].',
+                        len(identifiers_by_query[query]), offer_range.id)
+            refreshed += 1
+
+        logger.info('Refreshed the catalog index of [%d] ranges, [%d] failed.', refreshed, failed)
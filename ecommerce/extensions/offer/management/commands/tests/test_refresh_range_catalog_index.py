@@ -0,0 +1,86 @@
+
+
+import responses
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from oscar.core.loading import get_model
+from oscar.test import factories
+from testfixtures import LogCapture
+
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.extensions.offer.management.commands.refresh_range_catalog_index'
+RangeCatalogMembership = get_model('offer', 'RangeCatalogMembership')
+
+
+class RefreshRangeCatalogIndexTests(TestCase):
+    """Tests for refresh_range_catalog_index management command."""
+
+    def setUp(self):
+        super(RefreshRangeCatalogIndexTests, self).setUp()
+        self.query_range = factories.RangeFactory(catalog_query='key:*', course_seat_types='verified')
+        self.catalog_range = factories.RangeFactory(course_catalog=1, course_seat_types='verified')
+        self.discovery_api_url = self.site_configuration.discovery_api_url
+
+    def mock_course_runs_endpoint(self, results, status=200):
+        responses.add(
+            responses.GET,
+            '{}course_runs/'.format(self.discovery_api_url),
+            json={'count': len(results), 'next': None, 'results': results},
+            status=status,
+        )
+
+    def test_invalid_site(self):
+        """Test that command raises an error for an unknown site."""
+        with self.assertRaisesRegex(CommandError, 'A valid Site ID must be specified!'):
+            call_command('refresh_range_catalog_index', '--site-id=0')
+
+    @responses.activate
+    def test_refresh_index(self):
+        """Test that the index of every dynamic range is rebuilt from the Discovery Service."""
+        self.mock_access_token_response()
+        responses.add(
+            responses.GET,
+            '{}catalogs/1/'.format(self.discovery_api_url),
+            json={'id': 1, 'name': 'All Courses', 'query': 'key:*'},
+        )
+        self.mock_course_runs_endpoint([
+            {'key': 'course-v1:edX+DemoX+1T2024', 'course_uuid': 'dd7f1d8d-1a4e-4d3b-8a8b-6e0f5c1b2a3c'},
+            {'key': 'course-v1:edX+DemoX+2T2024', 'course_uuid': 'dd7f1d8d-1a4e-4d3b-8a8b-6e0f5c1b2a3c'},
+        ])
+        RangeCatalogMembership.objects.create(range=self.query_range, identifier='course-v1:edX+Old+Run')
+
+        call_command('refresh_range_catalog_index', '--site-id={}'.format(self.site.id))
+
+        expected = {
+            'course-v1:edX+DemoX+1T2024', 'course-v1:edX+DemoX+2T2024', 'dd7f1d8d-1a4e-4d3b-8a8b-6e0f5c1b2a3c'
+        }
+        for offer_range in (self.query_range, self.catalog_range):
+            self.assertEqual(
+                set(offer_range.catalog_memberships.values_list('identifier', flat=True)), expected
+            )
+
+        # Both ranges share the same query, so the course runs are only fetched once.
+        course_runs_calls = [call for call in responses.calls if 'course_runs' in call.request.url]
+        self.assertEqual(len(course_runs_calls), 1)
+
+    @responses.activate
+    def test_refresh_index_failure_keeps_index(self):
+        """Test that a range keeps its existing index when the Discovery Service fails."""
+        self.mock_access_token_response()
+        self.mock_course_runs_endpoint([], status=500)
+        RangeCatalogMembership.objects.create(range=self.query_range, identifier='course-v1:edX+Old+Run')
+
+        with LogCapture(LOGGER_NAME) as log:
+            call_command(
+                'refresh_range_catalog_index', '--site-id={}'.format(self.site.id),
+                '--range-id={}'.format(self.query_range.id)
+            )
+            log.check_present(
+                (LOGGER_NAME, 'INFO', 'Refreshed the catalog index of [0] ranges, [1] failed.')
+            )
+
+        self.assertEqual(
+            list(self.query_range.catalog_memberships.values_list('identifier', flat=True)),
+            ['course-v1:edX+Old+Run']
+        )
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer', '0055_auto_20231108_1355'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RangeCatalogMembership',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', django_extensions.db.fields.CreationDateTimeField(auto_now_add=True, verbose_name='created')),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(auto_now=True, verbose_name='modified')),
+                ('identifier', models.CharField(db_index=True, help_text='Course run key or course UUID included in the catalog of the range.', max_length=255)),
+                ('range', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='catalog_memberships', to='offer.range')),
+            ],
+            options={
+                'unique_together': {('range', 'identifier')},
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 import logging
 import re
+from collections import Counter
 from datetime import datetime
 from urllib.parse import urljoin
 
@@ -16,6 +17,7 @@ from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
+from edx_django_utils import monitoring as monitoring_utils
 from edx_django_utils.cache import TieredCache
 from jsonfield.fields import JSONField
 from oscar.apps.offer.abstract_models import (
@@ -31,6 +33,7 @@ from requests.exceptions import RequestException, Timeout
 from simple_history.models import HistoricalRecords
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.core.cache_utils import get_many_from_all_tiers, set_many_all_tiers
 from ecommerce.core.utils import get_cache_key, log_message_and_raise_validation_error
 from ecommerce.extensions.offer.constants import (
     EMAIL_TEMPLATE_TYPES,
@@ -90,20 +93,30 @@ class Benefit(AbstractBenefit):
             line.product.attr.certificate_type.lower() in applicable_range.course_seat_types
         ]
 
-    def _identify_uncached_product_identifiers(self, lines, domain, partner_code, query):
+    def _identify_uncached_product_identifiers(self, lines, domain, partner_code, query, applicable_range=None):
         """
         Checks the cache to see if each line is in the catalog range specified by the given query
         and tracks identifiers for which discovery service data is still needed.
+
+        Lines listed in the local catalog membership index of the range are applicable without a
+        cache lookup. The remaining lines are looked up with a single cache call, and lines sharing
+        a course run or course are tracked under one identifier so Discovery is only asked about it once.
+
+        Returns:
+            tuple: dicts mapping the uncached course run IDs and course UUIDs to their cache key and
+                lines, and the lines that are not known to be outside of the range.
         """
-        uncached_course_run_ids = []
-        uncached_course_uuids = []
+        uncached_course_run_ids = {}
+        uncached_course_uuids = {}
 
-        applicable_lines = lines
-        for line in applicable_lines:
+        line_cache_keys = []
+        for line in lines:
             if line.product.is_seat_product:
                 product_id = line.product.course.id
+                uncached_identifiers = uncached_course_run_ids
             else:  # All lines passed to this method should either have a seat or an entitlement product
                 product_id = line.product.attr.UUID
+                uncached_identifiers = uncached_course_uuids
 
             cache_key = get_cache_key(
                 site_domain=domain,
@@ -112,15 +125,34 @@ class Benefit(AbstractBenefit):
                 course_id=product_id,
                 query=query
             )
-            in_catalog_range_cached_response = TieredCache.get_cached_response(cache_key)
+            line_cache_keys.append((line, cache_key, product_id, uncached_identifiers))
 
-            if not in_catalog_range_cached_response.is_found:
-                if line.product.is_seat_product:
-                    uncached_course_run_ids.append({'id': product_id, 'cache_key': cache_key, 'line': line})
-                else:
-                    uncached_course_uuids.append({'id': product_id, 'cache_key': cache_key, 'line': line})
-            elif not in_catalog_range_cached_response.value:
-                applicable_lines.remove(line)
+        applicable_range = applicable_range or self.range
+        indexed_identifiers = applicable_range.get_indexed_catalog_identifiers(
+            {product_id for __, __, product_id, __ in line_cache_keys}
+        )
+        cached_values = get_many_from_all_tiers({
+            cache_key for __, cache_key, product_id, __ in line_cache_keys if str(product_id) not in indexed_identifiers
+        })
+
+        applicable_lines = []
+        lines_by_source = Counter()
+        for line, cache_key, product_id, uncached_identifiers in line_cache_keys:
+            if str(product_id) in indexed_identifiers:
+                lines_by_source['index'] += 1
+                applicable_lines.append(line)
+            elif cache_key not in cached_values:
+                lines_by_source['discovery'] += 1
+                metadata = uncached_identifiers.setdefault(product_id, {'cache_key': cache_key, 'lines': []})
+                metadata['lines'].append(line)
+                applicable_lines.append(line)
+            else:
+                lines_by_source['cache'] += 1
+                if cached_values[cache_key]:
+                    applicable_lines.append(line)
+
+        for source in ('index', 'cache', 'discovery'):
+            monitoring_utils.accumulate('catalog_range_lines_from_{}'.format(source), lines_by_source[source])
 
         return uncached_course_run_ids, uncached_course_uuids, applicable_lines
 
@@ -138,7 +170,7 @@ class Benefit(AbstractBenefit):
             site = basket.site
             partner_code = site.siteconfiguration.partner.short_code
             course_run_ids, course_uuids, applicable_lines = self._identify_uncached_product_identifiers(
-                applicable_lines, site.domain, partner_code, query
+                applicable_lines, site.domain, partner_code, query, applicable_range=applicable_range
             )
 
             if course_run_ids or course_uuids:
@@ -152,8 +184,8 @@ class Benefit(AbstractBenefit):
                     response = api_client.get(
                         discovery_api_url,
                         params={
-                            "course_run_ids": ','.join([metadata['id'] for metadata in course_run_ids]),
-                            "course_uuids": ','.join([metadata['id'] for metadata in course_uuids]),
+                            "course_run_ids": ','.join(course_run_ids),
+                            "course_uuids": ','.join(course_uuids),
                             "query": query,
                             "partner": partner_code
                         }
@@ -179,18 +211,21 @@ class Benefit(AbstractBenefit):
                     response,
                 )
 
-                # Cache range-state individually for each course or run identifier and remove lines not in the range.
-                for metadata in course_run_ids + course_uuids:
-                    in_range = response[str(metadata['id'])]
+                # Cache range-state for every course or run identifier at once and remove lines not in the range.
+                range_states = {}
+                for product_id, metadata in list(course_run_ids.items()) + list(course_uuids.items()):
+                    in_range = response[str(product_id)]
 
                     # Convert to int, because this is what memcached will return, and the request cache should return
                     # the same value.
                     # Note: once the TieredCache is fixed to handle this case, we could remove this line.
                     in_range = int(in_range)
-                    TieredCache.set_all_tiers(metadata['cache_key'], in_range, settings.COURSES_API_CACHE_TIMEOUT)
+                    range_states[metadata['cache_key']] = in_range
 
                     if not in_range:
-                        applicable_lines.remove(metadata['line'])
+                        applicable_lines = [line for line in applicable_lines if line not in metadata['lines']]
+
+                set_many_all_tiers(range_states, settings.COURSES_API_CACHE_TIMEOUT)
 
             logger.info(
                 "Basket [%s] with offer [%s] has applicable lines: %s",
@@ -472,6 +507,13 @@ class Range(AbstractRange):
 
     def save(self, *args, **kwargs):  # pylint: disable=arguments-differ
         self.clean()
+        if self.pk:
+            catalog_changed = Range.objects.filter(pk=self.pk).exclude(
+                catalog_query=self.catalog_query, course_catalog=self.course_catalog
+            ).exists()
+            if catalog_changed:
+                # The catalog membership index is only valid for the catalog it was built from.
+                self.catalog_memberships.all().delete()
         super(Range, self).save(*args, **kwargs)  # pylint: disable=bad-super-call
 
     def clean(self):
@@ -535,6 +577,21 @@ class Range(AbstractRange):
                              'Product: %s, Message: %s, Range: %s', product.id, exc, self.id)
             raise Exception('Unable to connect to Discovery Service for catalog contains endpoint.') from exc
 
+    def get_indexed_catalog_identifiers(self, identifiers):
+        """
+        Returns the subset of the given course run keys and course UUIDs that the local
+        catalog membership index lists as part of this range.
+
+        Identifiers missing from the index are not necessarily outside of the range; the
+        index may not have been refreshed since they were added to the catalog.
+        """
+        identifiers = [str(identifier) for identifier in identifiers]
+        if not identifiers:
+            return set()
+        return set(
+            self.catalog_memberships.filter(identifier__in=identifiers).values_list('identifier', flat=True)
+        )
+
     def contains_product(self, product):
         """
         Assert if the range contains the product.
@@ -544,10 +601,13 @@ class Range(AbstractRange):
         if self.course_catalog and self.course_seat_types:
             # Product certificate type should belongs to range seat types.
             if product.attr.certificate_type.lower() in self.course_seat_types:  # pylint: disable=unsupported-membership-test
-                response = self.catalog_contains_product(product)
-                # Range can have a catalog query and 'regular' products in it,
-                # therefor an OR is used to check for both possibilities.
-                contains_product = ((response['courses'][product.course_id]) or contains_product)
+                if self.get_indexed_catalog_identifiers([product.course_id]):
+                    contains_product = True
+                else:
+                    response = self.catalog_contains_product(product)
+                    # Range can have a catalog query and 'regular' products in it,
+                    # therefor an OR is used to check for both possibilities.
+                    contains_product = ((response['courses'][product.course_id]) or contains_product)
 
         elif self.catalog:
             contains_product = (
@@ -575,6 +635,27 @@ class Range(AbstractRange):
         return super(Range, self).all_products()  # pylint: disable=bad-super-call
 
 
+class RangeCatalogMembership(TimeStampedModel):
+    """
+    Locally materialized membership of a course run or course in the Discovery catalog of a dynamic Range.
+
+    Rows are rebuilt by the refresh_range_catalog_index management command and consulted before
+    asking the Discovery Service whether a product belongs to the range.
+    """
+    range = models.ForeignKey('offer.Range', related_name='catalog_memberships', on_delete=models.CASCADE)
+    identifier = models.CharField(
+        max_length=255,
+        db_index=True,
+        help_text=_('Course run key or course UUID included in the catalog of the range.'),
+    )
+
+    class Meta:
+        unique_together = ('range', 'identifier')
+
+    def __str__(self):
+        return '{range_id}-{identifier}'.format(range_id=self.range_id, identifier=self.identifier)
+
+
 class Condition(AbstractCondition):
     enterprise_customer_uuid = models.UUIDField(
         null=True,
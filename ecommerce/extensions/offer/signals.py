@@ -0,0 +1,65 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from edx_django_utils.cache import TieredCache
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.offer.constants import (
+    VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY,
+    VOUCHER_OFFERS_RANGE_VERSION_CACHE_KEY
+)
+
+Product = get_model('catalogue', 'Product')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+@receiver(post_save, sender=Range)
+def invalidate_range_voucher_offers(*_args, **kwargs):
+    """
+    When a range is updated, the cached offer pages of the vouchers using it must be invalidated.
+    """
+    TieredCache.delete_all_tiers(VOUCHER_OFFERS_RANGE_VERSION_CACHE_KEY.format(range_id=kwargs['instance'].id))
+
+
+@receiver(post_save, sender=RangeProduct)
+@receiver(post_delete, sender=RangeProduct)
+def invalidate_range_product_voucher_offers(*_args, **kwargs):
+    """
+    When products are added to or removed from a range, the cached offer pages of the vouchers using it
+    must be invalidated.
+    """
+    TieredCache.delete_all_tiers(
+        VOUCHER_OFFERS_RANGE_VERSION_CACHE_KEY.format(range_id=kwargs['instance'].range_id)
+    )
+
+
+def _is_offered_product(product):
+    """
+    Returns True if the product can appear on a voucher offer page, that is if it is a seat listed by the
+    course catalogs, or if it, or its parent, belongs to a range.
+    """
+    if product.is_seat_product:
+        return True
+    product_ids = [product.id, product.parent_id] if product.parent_id else [product.id]
+    return RangeProduct.objects.filter(product_id__in=product_ids).exists()
+
+
+@receiver(post_save, sender=Product)
+def invalidate_product_voucher_offers(*_args, **kwargs):
+    """
+    Changes to offered products, such as seat expiration, affect the offer pages of any voucher, so all cached
+    offer pages must be invalidated. Other products, such as coupons, do not appear on offer pages.
+    """
+    if _is_offered_product(kwargs['instance']):
+        TieredCache.delete_all_tiers(VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY)
+
+
+@receiver(post_save, sender=StockRecord)
+def invalidate_stock_record_voucher_offers(*_args, **kwargs):
+    """
+    Changes to the stock records of offered products, such as prices, affect the offer pages of any voucher,
+    so all cached offer pages must be invalidated.
+    """
+    if _is_offered_product(kwargs['instance'].product):
+        TieredCache.delete_all_tiers(VOUCHER_OFFERS_CATALOG_VERSION_CACHE_KEY)
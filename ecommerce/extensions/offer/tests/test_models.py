@@ -12,10 +12,11 @@ import mock
 import pytz
 import responses
 from botocore.exceptions import ClientError
+from django.core.cache import cache as django_cache
 from django.core.exceptions import ValidationError
 from django.db.models.signals import post_delete
 from django.utils.timezone import now
-from edx_django_utils.cache import TieredCache
+from edx_django_utils.cache import DEFAULT_REQUEST_CACHE, TieredCache
 from mock import patch
 from oscar.core.loading import get_model
 from oscar.test import factories
@@ -38,6 +39,7 @@ OfferAssignmentEmailTemplates = get_model('offer', 'OfferAssignmentEmailTemplate
 TemplateFileAttachment = get_model('offer', 'TemplateFileAttachment')
 OfferAssignmentEmailSentRecord = get_model('offer', 'OfferAssignmentEmailSentRecord')
 Range = get_model('offer', 'Range')
+RangeCatalogMembership = get_model('offer', 'RangeCatalogMembership')
 CodeAssignmentNudgeEmails = get_model('offer', 'CodeAssignmentNudgeEmails')
 CodeAssignmentNudgeEmailTemplates = get_model('offer', 'CodeAssignmentNudgeEmailTemplates')
 
@@ -146,6 +148,37 @@ class RangeTests(CouponMixin, DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         # checking if course exists in course runs against the course catalog.
         self._assert_num_requests(2)
 
+    def test_course_catalog_range_contains_indexed_product(self):
+        """
+        Verify that "contains_product" answers from the catalog membership index without
+        calling the Discovery Service.
+        """
+        course, seat = self.create_course_and_seat()
+        self.range.catalog_query = None
+        self.range.course_seat_types = 'verified'
+        self.range.course_catalog = 1
+        self.range.save()
+        RangeCatalogMembership.objects.create(range=self.range, identifier=course.id)
+
+        self.assertTrue(self.range.contains_product(seat))
+        self._assert_num_requests(0)
+
+    def test_catalog_change_clears_index(self):
+        """ Verify that changing the catalog of a range clears its catalog membership index. """
+        self.range.catalog_query = 'key:*'
+        self.range.course_seat_types = 'verified'
+        self.range.save()
+        RangeCatalogMembership.objects.create(range=self.range, identifier='course-v1:edX+DemoX+Demo')
+
+        self.range.course_seat_types = 'verified,professional'
+        self.range.save()
+        self.assertEqual(self.range.get_indexed_catalog_identifiers(['course-v1:edX+DemoX+Demo']),
+                         {'course-v1:edX+DemoX+Demo'})
+
+        self.range.catalog_query = 'key:edX*'
+        self.range.save()
+        self.assertFalse(self.range.catalog_memberships.exists())
+
     @ddt.data(ReqConnectionError, RequestException, Timeout)
     def test_course_catalog_query_range_contains_product_for_failure(self, error):
         """
@@ -660,6 +693,53 @@ class BenefitTests(DiscoveryTestMixin, DiscoveryMockMixin, TestCase):
         responses.reset()
         self.assertEqual(self.benefit.get_applicable_lines(self.offer, basket), applicable_lines)
 
+    @responses.activate
+    def test_get_applicable_lines_from_index(self):
+        """ Assert that lines listed in the catalog membership index are applicable without calling Discovery. """
+        basket = factories.BasketFactory(site=self.site, owner=self.user)
+        entitlement_product = self.create_entitlement_product()
+        course, seat = self.create_course_and_seat()
+        basket.add_product(entitlement_product)
+        basket.add_product(seat)
+        applicable_lines = [(line.product.stockrecords.first().price, line) for line in basket.all_lines()]
+
+        for identifier in (course.id, entitlement_product.attr.UUID):
+            RangeCatalogMembership.objects.create(range=self.benefit.range, identifier=identifier)
+
+        self.assertEqual(self.benefit.get_applicable_lines(self.offer, basket), applicable_lines)
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_get_applicable_lines_batches_lookups(self):
+        """ Assert that lines of the same course run are resolved together with a single cache lookup. """
+        basket = factories.BasketFactory(site=self.site, owner=self.user)
+        course, verified_seat = self.create_course_and_seat()
+        professional_seat = course.create_or_update_seat('professional', False, 100)
+        absent_course, absent_seat = self.create_course_and_seat(course_id='edX/Absent/Course')
+
+        basket.add_product(verified_seat)
+        basket.add_product(professional_seat)
+        basket.add_product(absent_seat)
+        applicable_lines = [
+            (line.product.stockrecords.first().price, line) for line in basket.all_lines()
+            if line.product != absent_seat
+        ]
+
+        self.mock_access_token_response()
+        # The course run shared by two lines is only sent to Discovery once.
+        self.mock_catalog_query_contains_endpoint(
+            course_run_ids=[course.id, absent_course.id], course_uuids=[], absent_ids=[absent_course.id],
+            query=self.benefit.range.catalog_query, discovery_api_url=self.site_configuration.discovery_api_url
+        )
+        self.assertEqual(self.benefit.get_applicable_lines(self.offer, basket), applicable_lines)
+
+        # Verify that every line is read from the cache with a single call once the results are cached.
+        responses.reset()
+        with patch('ecommerce.core.cache_utils.django_cache.get_many', wraps=django_cache.get_many) as get_many:
+            DEFAULT_REQUEST_CACHE.clear()
+            self.assertEqual(self.benefit.get_applicable_lines(self.offer, basket), applicable_lines)
+            self.assertEqual(get_many.call_count, 1)
+
 
 @ddt.ddt
 class TestOfferAssignmentEmailSentRecord(TestCase):
@@ -5,6 +5,7 @@ import logging
 import string  # pylint: disable=W0402
 from decimal import Decimal
 from urllib.parse import urlencode
+from uuid import uuid4
 
 import bleach
 import waffle
@@ -13,6 +14,7 @@ from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.translation import ugettext as _
 from ecommerce_worker.email.v1.api import send_offer_assignment_email, send_offer_update_email
+from edx_django_utils.cache import TieredCache
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import ENABLE_BRAZE
@@ -406,3 +408,17 @@ def update_assignments_for_multi_use_per_customer(voucher):
                 for __ in range(offer_assignments_available)
             ]
             OfferAssignment.objects.bulk_create(assignments)
+
+
+def get_voucher_offers_cache_version(version_cache_key):
+    """
+    Returns the current version stored under the given key, which is part of the keys of the cached voucher
+    offer pages. Deleting the version invalidates all pages cached with it.
+    """
+    cached_response = TieredCache.get_cached_response(version_cache_key)
+    if cached_response.is_found:
+        return cached_response.value
+
+    version = uuid4().hex
+    TieredCache.set_all_tiers(version_cache_key, version, settings.VOUCHER_OFFERS_CACHE_TIMEOUT)
+    return version
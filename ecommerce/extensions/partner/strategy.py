@@ -2,9 +2,9 @@
 
 from django.utils import timezone
 from oscar.apps.partner import availability, strategy
-from oscar.core.loading import get_model
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.lookup_registry import product_classes
 
 
 class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
@@ -17,8 +17,7 @@ class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
 
     @property
     def seat_class(self):
-        ProductClass = get_model('catalogue', 'ProductClass')
-        return ProductClass.objects.get(name=SEAT_PRODUCT_CLASS_NAME)
+        return product_classes.get(SEAT_PRODUCT_CLASS_NAME)
 
     def availability_policy(self, product, stockrecord):
         """ A product is unavailable for non-admin users if the current date is
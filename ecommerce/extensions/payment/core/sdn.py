@@ -4,7 +4,10 @@ import io
 import logging
 import re
 import string
+import threading
+import time
 import unicodedata
+from collections import defaultdict
 from datetime import datetime, timezone
 from urllib.parse import urlencode
 
@@ -24,6 +27,9 @@ BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 
 COUNTRY_CODES = {country.alpha_2 for country in pycountry.countries}
+SDN_FALLBACK_SOURCE = 'Specially Designated Nationals (SDN) - Treasury Department'
+SDN_FALLBACK_TYPE = 'Individual'
+SDN_FALLBACK_IMPORT_BATCH_SIZE = 1000
 
 
 def checkSDN(request, name, city, country):
@@ -88,10 +94,22 @@ def checkSDNFallback(name, city, country):
         3. Punctuation between words or at the beginning/end of a given word doesn’t matter
         4. If a subset of words match, it still counts as a match
         5. Capitalization doesn’t matter
+
+    The comparison is done against an in-memory token index of the current records (see SDNFallbackIndex),
+    which is built once per import and process.
+    """
+    return sdn_fallback_index.count_hits(name, city, country)
+
+
+def check_sdn_fallback_by_scan(name, city, country):
+    """
+    Same check as checkSDNFallback, done by loading and comparing every record of the given country.
+
+    Kept as the reference implementation the token index is benchmarked and tested against.
     """
     hit_count = 0
     records = SDNFallbackData.get_current_records_and_filter_by_source_and_type(
-        'Specially Designated Nationals (SDN) - Treasury Department', 'Individual'
+        SDN_FALLBACK_SOURCE, SDN_FALLBACK_TYPE
     )
     records = records.filter(countries__contains=country)
     processed_name, processed_city = process_text(name), process_text(city)
@@ -102,6 +120,108 @@ def checkSDNFallback(name, city, country):
     return hit_count
 
 
+class SDNFallbackIndex:
+    """
+    Process-local inverted index of the 'Current' SDNFallbackData records.
+
+    Records are partitioned by country, and each partition maps every name and address token
+    to the IDs of the records containing it. A check then only intersects the (small) sets of
+    record IDs of the tokens it is given, instead of loading and comparing every record.
+
+    The index is tied to the 'Current' SDNFallbackMetadata row it was built from, and is
+    rebuilt the first time it is used after another import becomes current.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._partitions = {}
+
+    @staticmethod
+    def _get_current_version():
+        try:
+            current_metadata = SDNFallbackMetadata.objects.get(import_state='Current')
+        except SDNFallbackMetadata.DoesNotExist as fallback_metadata_no_exist:
+            logger.warning(
+                "SDNFallback: SDNFallbackMetadata is empty! Run this: "
+                "./manage.py populate_sdn_fallback_data_and_metadata"
+            )
+            raise SDNFallbackDataEmptyError from fallback_metadata_no_exist
+        return current_metadata.id, current_metadata.file_checksum
+
+    @staticmethod
+    def _build_partitions(metadata_id):
+        """
+        Returns a dict mapping each country to a tuple of
+        (all record IDs, name token -> record IDs, address token -> record IDs).
+        """
+        partitions = {}
+        records = SDNFallbackData.objects.filter(
+            sdn_fallback_metadata_id=metadata_id,
+            source=SDN_FALLBACK_SOURCE,
+            sdn_type=SDN_FALLBACK_TYPE,
+        ).values_list('id', 'names', 'addresses', 'countries')
+        for record_id, names, addresses, countries in records.iterator():
+            for country in set(countries.split()):
+                record_ids, names_index, addresses_index = partitions.setdefault(
+                    country, (set(), defaultdict(set), defaultdict(set))
+                )
+                record_ids.add(record_id)
+                for token in set(names.split()):
+                    names_index[token].add(record_id)
+                for token in set(addresses.split()):
+                    addresses_index[token].add(record_id)
+        return partitions
+
+    def _get_partitions(self):
+        version = self._get_current_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    start = time.time()
+                    self._partitions = self._build_partitions(version[0])
+                    self._version = version
+                    logger.info(
+                        'SDNFallback: Built the token index of metadata id %s for %d countries in %.3f seconds.',
+                        version[0], len(self._partitions), time.time() - start
+                    )
+        return self._partitions
+
+    def count_hits(self, name, city, country):
+        """
+        Returns the number of current records matching all of the name and city words in the given country.
+        """
+        partition = self._get_partitions().get(country)
+        if partition is None:
+            return 0
+
+        record_ids, names_index, addresses_index = partition
+        postings = [names_index.get(token, ()) for token in process_text(name)]
+        postings += [addresses_index.get(token, ()) for token in process_text(city)]
+        if not postings:
+            return len(record_ids)
+
+        # Intersect the rarest tokens first, so the candidate set shrinks as fast as possible.
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return len(candidates)
+
+    def invalidate(self):
+        """
+        Drops the index. It is rebuilt the next time it is used.
+        """
+        with self._lock:
+            self._version = None
+            self._partitions = {}
+
+
+sdn_fallback_index = SDNFallbackIndex()
+
+
 class SDNClient:
     """A utility class that handles SDN related operations."""
 
@@ -285,6 +405,58 @@ def populate_sdn_fallback_metadata(sdn_csv_string):
     return metadata_entry
 
 
+def build_sdn_fallback_record(row, metadata_entry):
+    """
+    Build (without saving) the SDNFallbackData record of one csv row
+
+    Args:
+        row (dict): Row of the sdn csv, as read by csv.DictReader
+        metadata_entry (SDNFallbackMetadata): Instance of the current SDNFallbackMetadata class
+    """
+    sdn_source, sdn_type, names, addresses, alt_names, ids = (
+        row['source'] or '', row['type'] or '', row['name'] or '',
+        row['addresses'] or '', row['alt_names'] or '', row['ids'] or ''
+    )
+    processed_names = ' '.join(process_text(' '.join(filter(None, [names, alt_names]))))
+    processed_addresses = ' '.join(process_text(addresses))
+    countries = extract_country_information(addresses, ids)
+    return SDNFallbackData(
+        sdn_fallback_metadata=metadata_entry,
+        source=sdn_source,
+        sdn_type=sdn_type,
+        names=processed_names,
+        addresses=processed_addresses,
+        countries=countries
+    )
+
+
+def import_sdn_fallback_records(sdn_csv_lines, metadata_entry, batch_size=SDN_FALLBACK_IMPORT_BATCH_SIZE):
+    """
+    Read the csv rows one at a time and insert their SDNFallbackData records in batches,
+    so that at most batch_size records are held in memory at once.
+
+    Args:
+        sdn_csv_lines (iterable): Lines of the sdn csv, e.g. a text file object
+        metadata_entry (SDNFallbackMetadata): Instance of the current SDNFallbackMetadata class
+        batch_size (int): Number of records inserted per query
+
+    Returns:
+        int: Number of imported records
+    """
+    imported = 0
+    batch = []
+    for row in csv.DictReader(sdn_csv_lines):
+        batch.append(build_sdn_fallback_record(row, metadata_entry))
+        if len(batch) >= batch_size:
+            SDNFallbackData.objects.bulk_create(batch)
+            imported += len(batch)
+            batch = []
+    if batch:
+        SDNFallbackData.objects.bulk_create(batch)
+        imported += len(batch)
+    return imported
+
+
 def populate_sdn_fallback_data(sdn_csv_string, metadata_entry):
     """
     Process CSV data and create SDNFallbackData records
@@ -293,26 +465,17 @@ def populate_sdn_fallback_data(sdn_csv_string, metadata_entry):
         sdn_csv_string (str): String of the sdn csv
         metadata_entry (SDNFallbackMetadata): Instance of the current SDNFallbackMetadata class
     """
-    sdn_csv_reader = csv.DictReader(io.StringIO(sdn_csv_string))
-    processed_records = []
-    for row in sdn_csv_reader:
-        sdn_source, sdn_type, names, addresses, alt_names, ids = (
-            row['source'] or '', row['type'] or '', row['name'] or '',
-            row['addresses'] or '', row['alt_names'] or '', row['ids'] or ''
-        )
-        processed_names = ' '.join(process_text(' '.join(filter(None, [names, alt_names]))))
-        processed_addresses = ' '.join(process_text(addresses))
-        countries = extract_country_information(addresses, ids)
-        processed_records.append(SDNFallbackData(
-            sdn_fallback_metadata=metadata_entry,
-            source=sdn_source,
-            sdn_type=sdn_type,
-            names=processed_names,
-            addresses=processed_addresses,
-            countries=countries
-        ))
-    # Bulk create should be more efficient for a few thousand records without needing to use SQL directly.
-    SDNFallbackData.objects.bulk_create(processed_records)
+    import_sdn_fallback_records(io.StringIO(sdn_csv_string), metadata_entry)
+
+
+def _complete_sdn_fallback_import(metadata_entry):
+    """
+    Once data is successfully imported, update the metadata import timestamp and state
+    """
+    now = datetime.now(timezone.utc)
+    metadata_entry.import_timestamp = now
+    metadata_entry.save()
+    metadata_entry.swap_all_states()
 
 
 def populate_sdn_fallback_data_and_metadata(sdn_csv_string):
@@ -326,9 +489,40 @@ def populate_sdn_fallback_data_and_metadata(sdn_csv_string):
     metadata_entry = populate_sdn_fallback_metadata(sdn_csv_string)
     if metadata_entry:
         populate_sdn_fallback_data(sdn_csv_string, metadata_entry)
-        # Once data is successfully imported, update the metadata import timestamp and state
-        now = datetime.now(timezone.utc)
-        metadata_entry.import_timestamp = now
-        metadata_entry.save()
-        metadata_entry.swap_all_states()
+        _complete_sdn_fallback_import(metadata_entry)
+    return metadata_entry
+
+
+def populate_sdn_fallback_data_and_metadata_from_file(sdn_csv_file, file_checksum,
+                                                      batch_size=SDN_FALLBACK_IMPORT_BATCH_SIZE):
+    """
+    Same as populate_sdn_fallback_data_and_metadata, streaming the rows from a file instead of a string.
+
+    Should be called inside a transaction, so that a failed import does not leave partial data behind.
+
+    Args:
+        sdn_csv_file (file): Binary file object holding the utf-8 encoded sdn csv
+        file_checksum (str): sha256 hex digest of the file content
+        batch_size (int): Number of records inserted per query
+
+    Returns:
+        sdn_fallback_metadata_entry (SDNFallbackMetadata): Instance of the imported SDNFallbackMetadata class
+        or None if the csv did not change
+    """
+    metadata_entry = SDNFallbackMetadata.insert_new_sdn_fallback_metadata_entry(file_checksum)
+    if metadata_entry:
+        sdn_csv_file.seek(0)
+        sdn_csv_lines = io.TextIOWrapper(sdn_csv_file, encoding='utf-8', newline='')
+        start = time.time()
+        try:
+            imported = import_sdn_fallback_records(sdn_csv_lines, metadata_entry, batch_size)
+        finally:
+            # Leave the underlying file open for the caller.
+            sdn_csv_lines.detach()
+        duration = time.time() - start
+        logger.info(
+            'SDNFallback: Imported %d rows in %.2f seconds (%.0f rows/second).',
+            imported, duration, imported / duration if duration else imported
+        )
+        _complete_sdn_fallback_import(metadata_entry)
     return metadata_entry
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import io
 import json
 import logging
 import random
@@ -16,13 +17,16 @@ from requests.exceptions import HTTPError, Timeout
 from ecommerce.core.models import User
 from ecommerce.extensions.payment.core.sdn import (
     SDNClient,
+    check_sdn_fallback_by_scan,
     checkSDN,
     checkSDNFallback,
     extract_country_information,
+    import_sdn_fallback_records,
     populate_sdn_fallback_data,
     populate_sdn_fallback_data_and_metadata,
     populate_sdn_fallback_metadata,
-    process_text
+    process_text,
+    sdn_fallback_index
 )
 from ecommerce.extensions.payment.exceptions import SDNFallbackDataEmptyError
 from ecommerce.extensions.payment.models import SDNCheckFailure, SDNFallbackData, SDNFallbackMetadata
@@ -265,6 +269,20 @@ Joshuafort, MD 72104, TH",,,,,,,,,,,,,,https://banks-bender.com/,Michael Anderso
         populate_sdn_fallback_data(csv, metadata)
         self.assertEqual(len(SDNFallbackData.objects.filter()), 30)
 
+    def test_import_sdn_fallback_records_in_batches(self):
+        """ Verify the csv rows are inserted in batches of the given size """
+        row = """94734218,Specially Designated Nationals (SDN) - Treasury Department,96663868,Individual,material,Juan {},Dr.,"17472 Christie Stream Apt. 976 North Kristinaport, HI 91033, SN",,,,,,,,,,,,,,https://www.juarez-collier.org/,Wendy Brock,DJ,1944-03-05,Faroe Islands,PK,http://richardson-richardson.org/,CI\n"""  # pylint: disable=line-too-long
+        csv_lines = io.StringIO(self.csv_header + ''.join(row.format(index) for index in range(5)))
+        metadata_entry = extensions_factories.SDNFallbackMetadataFactory.create(import_state='New')
+
+        with mock.patch.object(
+                SDNFallbackData.objects, 'bulk_create', wraps=SDNFallbackData.objects.bulk_create
+        ) as bulk_create_mock:
+            self.assertEqual(import_sdn_fallback_records(csv_lines, metadata_entry, batch_size=2), 5)
+
+        self.assertEqual([len(call[0][0]) for call in bulk_create_mock.call_args_list], [2, 2, 1])
+        self.assertEqual(SDNFallbackData.objects.filter(sdn_fallback_metadata=metadata_entry).count(), 5)
+
     def test_populate_sdn_fallback_data_empty(self):
         """ Verify that we are able to correctly import empty data entries """
         metadata = populate_sdn_fallback_metadata('test')
@@ -519,6 +537,49 @@ Port Andrewport, OR 39456, EE",,,,,,,,,,,,,,http://douglas.com/,Misty Johnson,CV
         sdn_fallback_hit_count = checkSDNFallback('Juan Cruz', 'North Kristinaport', 'SN')
         self.assertEqual(sdn_fallback_hit_count, 2)
 
+    @ddt.data(
+        ('Juan Cruz', 'North Kristinaport', 'SN'),
+        ('Wendy', 'Kristinaport', 'SN'),
+        ('Juan', 'Main', 'SN'),
+        ('Sarah Jones', 'Port', 'EE'),
+        ('Sarah', 'Kristinaport', 'EE'),
+        ('Juan', 'Kristinaport', 'EE'),
+        ('...', 'North', 'SN'),
+        ('Juan', 'North', 'AB'),
+    )
+    @ddt.unpack
+    def test_sdn_fallback_index_matches_scan(self, name, city, country):
+        """
+        Verify the token index returns the same hit count as a scan of the records.
+        """
+        csv_string = self.csv_header + """94734218,Specially Designated Nationals (SDN) - Treasury Department,96663868,Individual,material,Juan M. de la Cruz,Dr.,"17472 Christie Stream Apt. 976
+North Kristinaport, HI 91033, SN",,,,,,,,,,,,,,https://www.cruz.org/,Wendy Brock,DJ,1944-03-05,Faroe Islands,PK,http://juan.org/,CI
+94734219,Specially Designated Nationals (SDN) - Treasury Department,96663869,Individual,material,Juan Cruz,Dr.,"123 Main Street
+North Kristinaport, HI 91033, SN",,,,,,,,,,,,,,https://www.juarez-collier.org/,Wendy Brock,DJ,1944-03-05,Faroe Islands,PK,http://richardson-richardson.org/,CI
+37539856,Specially Designated Nationals (SDN) - Treasury Department,55159852,Individual,hotel,Sarah Jones,Mrs.,"3699 Daniel Highway
+Port Andrewport, OR 39456, EE",,,,,,,,,,,,,,http://douglas.com/,Misty Johnson,CV,1998-02-15,Ukraine,BO,https://townsend.com/,TM"""
+        populate_sdn_fallback_data_and_metadata(csv_string)
+        self.assertEqual(checkSDNFallback(name, city, country), check_sdn_fallback_by_scan(name, city, country))
+
+    def test_sdn_fallback_index_rebuilt_after_import(self):
+        """
+        Verify the token index is built once per import, and rebuilt when a new import becomes current.
+        """
+        row = """94734218,Specially Designated Nationals (SDN) - Treasury Department,96663868,Individual,material,{name},Dr.,"17472 Christie Stream Apt. 976 North Kristinaport, HI 91033, SN",,,,,,,,,,,,,,https://www.juarez-collier.org/,Wendy Brock,DJ,1944-03-05,Faroe Islands,PK,http://richardson-richardson.org/,CI"""  # pylint: disable=line-too-long
+        populate_sdn_fallback_data_and_metadata(self.csv_header + row.format(name='Juan M. de la Cruz'))
+        self.assertEqual(checkSDNFallback('Juan', 'Kristinaport', 'SN'), 1)
+
+        with mock.patch.object(
+                sdn_fallback_index, '_build_partitions', wraps=sdn_fallback_index._build_partitions
+        ) as build_mock:
+            self.assertEqual(checkSDNFallback('Cruz', 'North', 'SN'), 1)
+            self.assertFalse(build_mock.called)
+
+            populate_sdn_fallback_data_and_metadata(self.csv_header + row.format(name='Pedro Alvarez'))
+            self.assertEqual(checkSDNFallback('Juan', 'Kristinaport', 'SN'), 0)
+            self.assertEqual(checkSDNFallback('Pedro', 'Kristinaport', 'SN'), 1)
+            self.assertEqual(build_mock.call_count, 1)
+
 
 class SDNFallbackTestsWithoutSetup(TestCase):
     def test_SDNFallback_empty_data(self):
@@ -0,0 +1,139 @@
+"""
+Management command that archives aged payment processor responses.
+
+Every raw response received from a payment processor is kept in the PaymentProcessorResponse table, which is
+also queried by transaction ID when refunding in-app purchases and checking for redundant payments. Responses
+older than a cut-off are moved, in batches, to a compressed archive table. Their transaction IDs are kept in a
+slim lookup table, where those lookups still find them.
+"""
+
+
+import datetime
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+PaymentProcessorResponseArchive = get_model('payment', 'PaymentProcessorResponseArchive')
+PaymentProcessorTransaction = get_model('payment', 'PaymentProcessorTransaction')
+
+
+class Command(BaseCommand):
+    help = 'Move aged payment processor responses to the compressed archive table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days',
+                            action='store',
+                            dest='days',
+                            default=365,
+                            type=int,
+                            help='Responses received more than this many days ago are archived.')
+        # Batched archival prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of responses to be archived.')
+        # Sleeping between each batch gives MySQL time to process other connections.
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=1,
+                            type=float,
+                            help='Seconds to sleep between each batch.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually archive the responses.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options['days'])
+        queryset = PaymentProcessorResponse.objects.filter(created__lt=cutoff)
+        count = queryset.count()
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have archived [{}] payment processor responses.'.format(count)
+            self.stderr.write(msg)
+            return
+
+        if not count:
+            self.stderr.write('No payment processor responses to archive.')
+            return
+
+        self.stderr.write('Archiving [{}] payment processor responses received before [{}].'.format(count, cutoff))
+        batch_size = options['batch_size']
+        total_moved = 0
+        total_seconds = 0.0
+        while True:
+            start = time.time()
+            moved = self._archive_batch(queryset, batch_size)
+            if not moved:
+                break
+
+            seconds = time.time() - start
+            total_moved += moved
+            total_seconds += seconds
+            self.stderr.write('Archived [{}] responses in [{:.2f}] seconds ([{:.1f}] rows/second).'.format(
+                moved, seconds, moved / seconds if seconds else moved
+            ))
+            if moved < batch_size:
+                break
+            time.sleep(options['sleep_seconds'])
+
+        self.stderr.write('Archived [{}] payment processor responses ([{:.1f}] rows/second).'.format(
+            total_moved, total_moved / total_seconds if total_seconds else total_moved
+        ))
+
+    def _archive_batch(self, queryset, batch_size):
+        """ Moves the oldest batch of the given responses to the archive. Returns the number of responses moved. """
+        with transaction.atomic():
+            rows = list(queryset.order_by('id').values(
+                'id',
+                'processor_name',
+                'transaction_id',
+                'basket_id',
+                'response',
+                'created',
+                'extension__original_transaction_id',
+                'extension__meta_data',
+            )[:batch_size])
+            if not rows:
+                return 0
+
+            archives = []
+            transactions = []
+            for row in rows:
+                original_transaction_id = row['extension__original_transaction_id']
+                archives.append(PaymentProcessorResponseArchive(
+                    id=row['id'],
+                    processor_name=row['processor_name'],
+                    transaction_id=row['transaction_id'],
+                    basket_id=row['basket_id'],
+                    compressed_response=PaymentProcessorResponseArchive.compress({
+                        'response': row['response'],
+                        'original_transaction_id': original_transaction_id,
+                        'meta_data': row['extension__meta_data'],
+                    }),
+                    created=row['created'],
+                ))
+                if row['transaction_id'] or original_transaction_id:
+                    transactions.append(PaymentProcessorTransaction(
+                        processor_response_id=row['id'],
+                        processor_name=row['processor_name'],
+                        transaction_id=row['transaction_id'],
+                        original_transaction_id=original_transaction_id,
+                        basket_id=row['basket_id'],
+                        created=row['created'],
+                    ))
+
+            PaymentProcessorResponseArchive.objects.bulk_create(archives)
+            PaymentProcessorTransaction.objects.bulk_create(transactions)
+            # Also deletes the in-app purchase extensions of the responses, which were archived with them.
+            PaymentProcessorResponse.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            return len(rows)
@@ -0,0 +1,86 @@
+import datetime
+
+from django.core.management import call_command
+from django.utils import timezone
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.iap.models import PaymentProcessorResponseExtension
+from ecommerce.extensions.payment.utils import get_first_processor_transaction, processor_transaction_exists
+from ecommerce.tests.testcases import TestCase
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+PaymentProcessorResponseArchive = get_model('payment', 'PaymentProcessorResponseArchive')
+PaymentProcessorTransaction = get_model('payment', 'PaymentProcessorTransaction')
+
+
+class ArchivePaymentProcessorResponsesCommandTests(TestCase):
+    command = 'archive_payment_processor_responses'
+
+    def setUp(self):
+        super(ArchivePaymentProcessorResponsesCommandTests, self).setUp()
+        self.basket = factories.BasketFactory(site=self.site)
+        self.old_responses = [
+            self._create_response('cybersource', 'old-{}'.format(index), days_ago=400) for index in range(3)
+        ]
+        self.iap_response = self._create_response('ios-iap', 'old-iap', days_ago=400)
+        PaymentProcessorResponseExtension.objects.create(
+            processor_response=self.iap_response, original_transaction_id='original-iap', meta_data={'price': '10'}
+        )
+        self.new_response = self._create_response('cybersource', 'new', days_ago=10)
+
+    def _create_response(self, processor_name, transaction_id, days_ago):
+        response = PaymentProcessorResponse.objects.create(
+            processor_name=processor_name,
+            transaction_id=transaction_id,
+            basket=self.basket,
+            response={'transaction_id': transaction_id},
+        )
+        # `created` is set automatically on creation.
+        PaymentProcessorResponse.objects.filter(id=response.id).update(
+            created=timezone.now() - datetime.timedelta(days=days_ago)
+        )
+        return response
+
+    def test_without_commit(self):
+        """ Verify the command does not archive responses without the commit flag. """
+        call_command(self.command)
+        self.assertEqual(PaymentProcessorResponse.objects.count(), 5)
+        self.assertFalse(PaymentProcessorResponseArchive.objects.exists())
+
+    def test_archive(self):
+        """ Verify aged responses are moved, in batches, to the archive and the transaction lookup table. """
+        call_command(self.command, commit=True, batch_size=2, sleep_seconds=0)
+
+        self.assertEqual(list(PaymentProcessorResponse.objects.all()), [self.new_response])
+        self.assertFalse(PaymentProcessorResponseExtension.objects.exists())
+        self.assertEqual(PaymentProcessorResponseArchive.objects.count(), 4)
+        self.assertEqual(PaymentProcessorTransaction.objects.count(), 4)
+
+        archive = PaymentProcessorResponseArchive.objects.get(id=self.iap_response.id)
+        self.assertEqual(archive.transaction_id, 'old-iap')
+        self.assertEqual(archive.basket_id, self.basket.id)
+        self.assertEqual(archive.data, {
+            'response': {'transaction_id': 'old-iap'},
+            'original_transaction_id': 'original-iap',
+            'meta_data': {'price': '10'},
+        })
+        self.assertEqual(
+            PaymentProcessorTransaction.objects.get(processor_response_id=self.iap_response.id).original_transaction_id,
+            'original-iap'
+        )
+
+        # Archived transactions are still found by the lookups done on payments and refunds.
+        self.assertTrue(processor_transaction_exists('old-0'))
+        self.assertTrue(processor_transaction_exists('old-iap', processor_name='ios-iap'))
+        self.assertTrue(processor_transaction_exists('new'))
+        self.assertFalse(processor_transaction_exists('old-0', processor_name='ios-iap'))
+        self.assertEqual(get_first_processor_transaction('old-1', 'cybersource').basket, self.basket)
+        self.assertEqual(get_first_processor_transaction('new', 'cybersource'), self.new_response)
+        self.assertIsNone(get_first_processor_transaction('unknown', 'cybersource'))
+
+    def test_archive_nothing(self):
+        """ Verify the command does nothing if no response is old enough. """
+        call_command(self.command, commit=True, days=1000)
+        self.assertEqual(PaymentProcessorResponse.objects.count(), 5)
+        self.assertFalse(PaymentProcessorResponseArchive.objects.exists())
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 21:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('basket', '0017_alter_lineattribute_value'),
+        ('payment', '0033_auto_20231108_1355'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentProcessorResponseArchive',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('processor_name', models.CharField(max_length=255, verbose_name='Payment Processor')),
+                ('transaction_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='Transaction ID')),
+                ('basket_id', models.IntegerField(blank=True, null=True)),
+                ('compressed_response', models.BinaryField()),
+                ('created', models.DateTimeField()),
+                ('archived', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Payment Processor Response',
+                'verbose_name_plural': 'Archived Payment Processor Responses',
+                'get_latest_by': 'created',
+            },
+        ),
+        migrations.CreateModel(
+            name='PaymentProcessorTransaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('processor_response_id', models.IntegerField(unique=True)),
+                ('processor_name', models.CharField(max_length=255, verbose_name='Payment Processor')),
+                ('transaction_id', models.CharField(blank=True, db_index=True, max_length=255, null=True, verbose_name='Transaction ID')),
+                ('original_transaction_id', models.CharField(blank=True, max_length=255, null=True, verbose_name='Original Transaction ID')),
+                ('created', models.DateTimeField()),
+                ('basket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='basket.basket', verbose_name='Basket')),
+            ],
+            options={
+                'verbose_name': 'Payment Processor Transaction',
+                'verbose_name_plural': 'Payment Processor Transactions',
+                'index_together': {('processor_name', 'transaction_id'), ('processor_name', 'original_transaction_id')},
+            },
+        ),
+    ]
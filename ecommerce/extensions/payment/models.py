@@ -1,8 +1,11 @@
+import json
 import logging
+import zlib
 from datetime import datetime
 from decimal import Decimal
 
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinLengthValidator
 from django.db import models
 from django.db.transaction import atomic
@@ -37,6 +40,60 @@ class PaymentProcessorResponse(models.Model):
         verbose_name_plural = _('Payment Processor Responses')
 
 
+class PaymentProcessorResponseArchive(models.Model):
+    """
+    Compressed copy of a PaymentProcessorResponse moved out of the live table once it has aged
+    (see the archive_payment_processor_responses management command).
+    """
+    # Same ID as the archived PaymentProcessorResponse.
+    id = models.IntegerField(primary_key=True)
+    processor_name = models.CharField(max_length=255, verbose_name=_('Payment Processor'))
+    transaction_id = models.CharField(max_length=255, verbose_name=_('Transaction ID'), null=True, blank=True)
+    basket_id = models.IntegerField(null=True, blank=True)
+    # zlib-compressed JSON holding the response and, for in-app purchases, the metadata of its extension.
+    compressed_response = models.BinaryField()
+    created = models.DateTimeField()
+    archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        get_latest_by = 'created'
+        verbose_name = _('Archived Payment Processor Response')
+        verbose_name_plural = _('Archived Payment Processor Responses')
+
+    @staticmethod
+    def compress(data):
+        return zlib.compress(json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8'))
+
+    @property
+    def data(self):
+        """ Returns the archived response and extension metadata. """
+        return json.loads(zlib.decompress(bytes(self.compressed_response)).decode('utf-8'))
+
+
+class PaymentProcessorTransaction(models.Model):
+    """
+    Slim record of the transaction IDs of archived PaymentProcessorResponses, so that lookups by transaction ID
+    (refunds, redundant payment checks) still find the transactions of archived responses.
+    """
+    processor_response_id = models.IntegerField(unique=True)
+    processor_name = models.CharField(max_length=255, verbose_name=_('Payment Processor'))
+    transaction_id = models.CharField(max_length=255, verbose_name=_('Transaction ID'), null=True, blank=True,
+                                      db_index=True)
+    original_transaction_id = models.CharField(max_length=255, verbose_name=_('Original Transaction ID'),
+                                               null=True, blank=True)
+    basket = models.ForeignKey('basket.Basket', verbose_name=_('Basket'), null=True, blank=True,
+                               on_delete=models.SET_NULL)
+    created = models.DateTimeField()
+
+    class Meta:
+        index_together = (
+            ('processor_name', 'transaction_id'),
+            ('processor_name', 'original_transaction_id'),
+        )
+        verbose_name = _('Payment Processor Transaction')
+        verbose_name_plural = _('Payment Processor Transactions')
+
+
 class Source(AbstractSource):
     card_type = models.CharField(max_length=255, choices=CARD_TYPE_CHOICES, null=True, blank=True)
 
@@ -9,6 +9,8 @@ from django.conf import settings
 from django.utils.functional import cached_property
 from oscar.core.loading import get_model
 
+from ecommerce.extensions.payment.registry import payment_processor_registry
+
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
 HandledProcessorResponse = namedtuple('HandledProcessorResponse',
@@ -82,8 +84,7 @@ class BasePaymentProcessor(metaclass=abc.ABCMeta):  # pragma: no cover
         Raises:
             KeyError: If no settings found for this payment processor
         """
-        partner_short_code = self.site.siteconfiguration.partner.short_code
-        return settings.PAYMENT_PROCESSOR_CONFIG[partner_short_code.lower()][self.NAME.lower()]
+        return payment_processor_registry.get_configuration(self)
 
     @property
     def client_side_payment_url(self):
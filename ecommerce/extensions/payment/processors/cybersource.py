@@ -58,7 +58,7 @@ from ecommerce.extensions.payment.processors import (
     BaseClientSidePaymentProcessor,
     HandledProcessorResponse
 )
-from ecommerce.extensions.payment.utils import clean_field_value, get_basket_program_uuid
+from ecommerce.extensions.payment.utils import clean_field_value, get_basket_program_uuid, processor_transaction_exists
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +67,6 @@ BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
 Order = get_model('order', 'Order')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
-PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
 
 def del_none(d):  # pragma: no cover
@@ -307,7 +306,7 @@ class CybersourceREST(ApplePayMixin, BaseClientSidePaymentProcessor):
         transaction_id = response.transaction_id
         if transaction_id and response.decision == Decision.accept:
             if Order.objects.filter(number=response.order_id).exists():
-                if PaymentProcessorResponse.objects.filter(transaction_id=transaction_id).exists():
+                if processor_transaction_exists(transaction_id):
                     raise RedundantPaymentNotificationError
                 raise ExcessivePaymentForOrderError
 
@@ -7,6 +7,7 @@ import stripe
 from oscar.apps.payment.exceptions import GatewayError
 from oscar.core.loading import get_model
 
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.extensions.basket.constants import PAYMENT_INTENT_ID_ATTRIBUTE
 from ecommerce.extensions.basket.models import Basket
@@ -24,11 +25,9 @@ from ecommerce.extensions.payment.processors import (
 logger = logging.getLogger(__name__)
 
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
 PaymentEvent = get_model('order', 'PaymentEvent')
-PaymentEventType = get_model('order', 'PaymentEventType')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 Source = get_model('payment', 'Source')
 SourceType = get_model('payment', 'SourceType')
@@ -137,7 +136,7 @@ class Stripe(ApplePayMixin, BaseClientSidePaymentProcessor):
                 # it from Stripe using the payment_intent_id BasketAttribute.
                 # Note that we update the PI's price in handle_processor_response
                 # before hitting the confirm endpoint, so we don't need to do that here
-                payment_intent_id_attribute = BasketAttributeType.objects.get(name=PAYMENT_INTENT_ID_ATTRIBUTE)
+                payment_intent_id_attribute = basket_attribute_types.get(PAYMENT_INTENT_ID_ATTRIBUTE)
                 payment_intent_attr = BasketAttribute.objects.get(
                     basket=basket,
                     attribute_type=payment_intent_id_attribute
@@ -0,0 +1,133 @@
+"""
+Process-wide registry of the payment processors available to each site.
+
+Every basket page and payment API call asks the site configuration for its payment processors. Answering used
+to import every class listed in PAYMENT_PROCESSORS, parse the site's payment_processors field, check the waffle
+switch of every processor and look up the site's partner to find each processor's configuration. The registry
+imports the classes once per process, and remembers which processors are enabled for a site. Processor
+configurations are plain settings lookups, so they are not remembered.
+
+What the registry remembers is tied to a version token shared through the cache. Toggling a payment processor
+switch, or saving a site configuration, deletes the token, so every process drops what it remembers the next
+time it is used.
+"""
+import logging
+import threading
+from uuid import uuid4
+
+from django.conf import settings
+from edx_django_utils.cache import TieredCache
+
+from ecommerce.extensions.payment.helpers import get_processor_class
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY = 'payment_processor_registry_version'
+
+
+class PaymentProcessorRegistry:
+    """
+    Thread-safe registry of payment processor classes and the processors enabled for each site.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classes = {}
+        self._version = None
+        self._enabled_processors = {}
+
+    @staticmethod
+    def _get_current_version():
+        cached_response = TieredCache.get_cached_response(PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY)
+        if cached_response.is_found:
+            return cached_response.value
+
+        version = uuid4().hex
+        TieredCache.set_all_tiers(
+            PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY, version, settings.PAYMENT_PROCESSOR_REGISTRY_TIMEOUT
+        )
+        return version
+
+    def _get_versioned_state(self):
+        """ Returns the enabled processors remembered for the current version. """
+        version = self._get_current_version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    self._enabled_processors = {}
+                    self._version = version
+        return self._enabled_processors
+
+    def get_processor_classes(self):
+        """
+        Returns all processor classes declared in settings, in the order they are declared.
+
+        Returns:
+            list[BasePaymentProcessor]
+        """
+        paths = tuple(settings.PAYMENT_PROCESSORS)
+        processor_classes = self._classes.get(paths)
+        if processor_classes is None:
+            processor_classes = [get_processor_class(path) for path in paths]
+            with self._lock:
+                self._classes[paths] = processor_classes
+        return processor_classes
+
+    def get_processor_class_by_name(self, name):
+        """
+        Returns the processor class declared in settings with the given name, or None if there is none.
+        """
+        for processor_class in self.get_processor_classes():
+            if processor_class.NAME == name:
+                return processor_class
+        return None
+
+    def get_enabled_processors(self, processor_names):
+        """
+        Returns the processor classes with the given names whose waffle switch is active.
+
+        Args:
+            processor_names (frozenset[str]): Names of the processors configured for a site.
+
+        Returns:
+            list[BasePaymentProcessor]: The processor classes, in the order they are declared in settings.
+        """
+        enabled_processors = self._get_versioned_state()
+        key = (tuple(settings.PAYMENT_PROCESSORS), processor_names)
+        processors = enabled_processors.get(key)
+        if processors is None:
+            processors = [
+                processor for processor in self.get_processor_classes()
+                if processor.NAME in processor_names and processor.is_enabled()
+            ]
+            enabled_processors[key] = processors
+        return processors
+
+    def get_configuration(self, processor):
+        """
+        Returns the configuration (set in Django settings) of the given processor instance.
+
+        Raises:
+            KeyError: If no settings found for the processor.
+        """
+        return self.get_site_configuration(processor.site, processor.NAME)
+
+    def get_site_configuration(self, site, processor_name):
+        """
+        Returns the configuration (set in Django settings) of the named processor for the partner of the site.
+
+        Raises:
+            KeyError: If no settings found for the processor.
+        """
+        partner_short_code = site.siteconfiguration.partner.short_code
+        return settings.PAYMENT_PROCESSOR_CONFIG[partner_short_code.lower()][processor_name.lower()]
+
+    def invalidate(self):
+        """
+        Drops the enabled processors remembered by every process.
+        """
+        TieredCache.delete_all_tiers(PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY)
+        logger.info('Invalidated the payment processor registry.')
+
+
+payment_processor_registry = PaymentProcessorRegistry()
@@ -3,21 +3,25 @@
 import logging
 
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from edx_django_utils.cache import TieredCache
 from waffle.models import Switch
 
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.payment.core.sdn import sdn_fallback_index
+from ecommerce.extensions.payment.models import SDNFallbackMetadata
+from ecommerce.extensions.payment.registry import payment_processor_registry
 
 logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=Switch)
+@receiver(post_delete, sender=Switch)
 def invalidate_processor_cache(*_args, **kwargs):
     """
-    When Waffle switches for payment processors are toggled, the
-    payment processor list view cache must be invalidated.
+    When Waffle switches for payment processors are toggled (or deleted), the payment
+    processor list view cache and the payment processor registry must be invalidated.
     """
     switch = kwargs['instance']
     parts = switch.name.split(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX)
@@ -25,4 +29,15 @@ def invalidate_processor_cache(*_args, **kwargs):
         processor = parts[1]
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
         TieredCache.delete_all_tiers(PAYMENT_PROCESSOR_CACHE_KEY)
+        payment_processor_registry.invalidate()
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
+
+
+@receiver(post_save, sender=SDNFallbackMetadata)
+@receiver(post_delete, sender=SDNFallbackMetadata)
+def invalidate_sdn_fallback_index(*_args, **_kwargs):
+    """
+    When SDNFallbackMetadata rows are swapped (see SDNFallbackMetadata.swap_all_states),
+    the in-memory SDN fallback index of this process must be rebuilt.
+    """
+    sdn_fallback_index.invalidate()
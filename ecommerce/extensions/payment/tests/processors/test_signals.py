@@ -6,6 +6,10 @@ from edx_django_utils.cache import TieredCache
 from waffle.models import Switch
 
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.payment.registry import (
+    PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY,
+    payment_processor_registry
+)
 from ecommerce.tests.testcases import TestCase
 
 
@@ -23,3 +27,15 @@ class SignalTests(TestCase):
         # Toggle a switch to trigger cache deletion
         Switch.objects.get_or_create(name=settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + 'dummy')
         self.assertFalse(TieredCache.get_cached_response(PAYMENT_PROCESSOR_CACHE_KEY).is_found)
+
+    def test_invalidate_processor_registry(self):
+        """ Verify the payment processor registry is invalidated when payment processor switches are toggled. """
+        payment_processor_registry.get_enabled_processors(frozenset(['dummy']))
+        self.assertTrue(TieredCache.get_cached_response(PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY).is_found)
+
+        switch, __ = Switch.objects.get_or_create(name=settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + 'dummy')
+        self.assertFalse(TieredCache.get_cached_response(PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY).is_found)
+
+        payment_processor_registry.get_enabled_processors(frozenset(['dummy']))
+        switch.delete()
+        self.assertFalse(TieredCache.get_cached_response(PAYMENT_PROCESSOR_REGISTRY_VERSION_CACHE_KEY).is_found)
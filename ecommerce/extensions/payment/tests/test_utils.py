@@ -3,10 +3,20 @@ import json
 from urllib.parse import urljoin
 
 import responses
+from oscar.core.loading import get_model
+from oscar.test import factories
 
-from ecommerce.extensions.payment.utils import clean_field_value, middle_truncate
+from ecommerce.extensions.payment.utils import (
+    clean_field_value,
+    get_basket_program_uuid,
+    get_basket_program_uuids,
+    middle_truncate
+)
 from ecommerce.tests.testcases import TestCase
 
+BasketAttribute = get_model('basket', 'BasketAttribute')
+BasketAttributeType = get_model('basket', 'BasketAttributeType')
+
 
 class UtilsTests(TestCase):
     def test_truncation(self):
@@ -29,6 +39,22 @@ class UtilsTests(TestCase):
         value = 'Some^text:\'test-value'
         self.assertEqual(clean_field_value(value), 'Sometexttest-value')
 
+    def test_get_basket_program_uuids(self):
+        """ Verify the program UUIDs of bundled baskets are looked up with a single query. """
+        bundle_basket = factories.BasketFactory(site=self.site)
+        BasketAttribute.objects.create(
+            basket=bundle_basket,
+            attribute_type=BasketAttributeType.objects.get_or_create(name='bundle_identifier')[0],
+            value_text='test-program-uuid',
+        )
+        basket = factories.BasketFactory(site=self.site)
+
+        with self.assertNumQueries(2):
+            program_uuids = get_basket_program_uuids([bundle_basket.id, basket.id])
+        self.assertEqual(program_uuids, {bundle_basket.id: 'test-program-uuid'})
+        self.assertEqual(program_uuids.get(bundle_basket.id), get_basket_program_uuid(bundle_basket))
+        self.assertIsNone(get_basket_program_uuid(basket))
+
 
 class EmbargoCheckTests(TestCase):
     """ Tests for the Embargo check function. """
@@ -82,7 +82,7 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
                 mock_retrieve.side_effect = [fixture_data['retrieve_addr_resp']]
 
             with mock.patch(
-                'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._post_to_enrollment_api'
+                'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._send_enrollment_api_request'
             ) as mock_api_resp:
                 mock_api_resp.return_value = self.mock_enrollment_api_resp
 
@@ -182,7 +182,7 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
             mock_retrieve.return_value = retrieve_addr_resp
 
             with mock.patch(
-                'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._post_to_enrollment_api'
+                'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule._send_enrollment_api_request'
             ) as mock_api_resp:
                 mock_api_resp.return_value = self.mock_enrollment_api_resp
 
@@ -200,6 +200,7 @@ class StripeCheckoutViewTests(PaymentEventsMixin, TestCase):
                 assert mock_retrieve.call_count == 1
                 assert mock_modify.call_count == 1
                 assert mock_confirm.call_count == 1
+                mock_api_resp.assert_called_once()
 
         # Verify BillingAddress was set correctly
         basket.refresh_from_db()
@@ -7,12 +7,15 @@ from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.extensions.analytics.utils import parse_tracking_context
 
 logger = logging.getLogger(__name__)
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+PaymentProcessorTransaction = get_model('payment', 'PaymentProcessorTransaction')
 User = get_user_model()
 
 
@@ -25,7 +28,7 @@ def get_basket_program_uuid(basket):
         string: The program UUID if the basket is associated with a bundled purchase, otherwise None.
     """
     try:
-        attribute_type = BasketAttributeType.objects.get(name='bundle_identifier')
+        attribute_type = basket_attribute_types.get('bundle_identifier')
     except BasketAttributeType.DoesNotExist:
         return None
     bundle_attributes = BasketAttribute.objects.filter(
@@ -36,6 +39,30 @@ def get_basket_program_uuid(basket):
     return bundle_attribute.value_text if bundle_attribute else None
 
 
+def get_basket_program_uuids(basket_ids):
+    """
+    Return the program UUIDs associated with the given baskets, looked up with a single query.
+    Arguments:
+        basket_ids (iterable): IDs of the baskets.
+    Returns:
+        dict: The program UUIDs keyed by basket ID. Baskets not associated with a bundled purchase are left out.
+    """
+    try:
+        attribute_type = basket_attribute_types.get('bundle_identifier')
+    except BasketAttributeType.DoesNotExist:
+        return {}
+    bundle_attributes = BasketAttribute.objects.filter(
+        basket_id__in=basket_ids,
+        attribute_type=attribute_type
+    ).order_by('pk').values_list('basket_id', 'value_text')
+
+    program_uuids = {}
+    for basket_id, program_uuid in bundle_attributes:
+        # Same as get_basket_program_uuid, the first attribute of each basket wins.
+        program_uuids.setdefault(basket_id, program_uuid)
+    return program_uuids
+
+
 def get_program_uuid(order):
     """
     Return the program UUID associated with the given order, if one exists.
@@ -49,6 +76,47 @@ def get_program_uuid(order):
     return get_basket_program_uuid(order.basket)
 
 
+def processor_transaction_exists(transaction_id, processor_name=None):
+    """
+    Return True if a payment processor response, live or archived, was recorded for the given transaction.
+
+    Arguments:
+        transaction_id (str): Identifier of the transaction on the payment processor's servers.
+        processor_name (str, optional): Name of the payment processor. Responses of all processors match if None.
+
+    Returns:
+        bool
+    """
+    filters = {'transaction_id': transaction_id}
+    if processor_name is not None:
+        filters['processor_name'] = processor_name
+    return (
+        PaymentProcessorResponse.objects.filter(**filters).exists() or
+        PaymentProcessorTransaction.objects.filter(**filters).exists()
+    )
+
+
+def get_first_processor_transaction(transaction_id, processor_name):
+    """
+    Return the first payment processor response, live or archived, recorded for the given transaction.
+
+    Archived responses are older than live ones, so they are looked up first.
+
+    Arguments:
+        transaction_id (str): Identifier of the transaction on the payment processor's servers.
+        processor_name (str): Name of the payment processor.
+
+    Returns:
+        PaymentProcessorTransaction or PaymentProcessorResponse: Either holds the basket of the transaction. None if
+            no response was recorded for the transaction.
+    """
+    filters = {'transaction_id': transaction_id, 'processor_name': processor_name}
+    archived_transaction = PaymentProcessorTransaction.objects.filter(**filters).order_by(
+        'processor_response_id'
+    ).first()
+    return archived_transaction or PaymentProcessorResponse.objects.filter(**filters).first()
+
+
 def middle_truncate(provided_string, chars):
     """Truncate the provided string, if necessary.
 
@@ -17,6 +17,7 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.basket.utils import (
     add_stripe_flag_to_url,
@@ -43,7 +44,6 @@ logger = logging.getLogger(__name__)
 Applicator = get_class('offer.applicator', 'Applicator')
 Basket = get_model('basket', 'Basket')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BillingAddress = get_model('order', 'BillingAddress')
 BUNDLE = 'bundle_identifier'
 Country = get_model('address', 'Country')
@@ -325,7 +325,7 @@ class CybersourceOrderCompletionView(EdxOrderPlacementMixin):
 
         bundle_attributes = BasketAttribute.objects.filter(
             basket=old_basket,
-            attribute_type=BasketAttributeType.objects.get(name=BUNDLE)
+            attribute_type=basket_attribute_types.get(BUNDLE)
         )
         bundle = bundle_attributes.first().value_text if bundle_attributes.count() > 0 else None
 
@@ -337,7 +337,7 @@ class CybersourceOrderCompletionView(EdxOrderPlacementMixin):
         if bundle:
             BasketAttribute.objects.update_or_create(
                 basket=new_basket,
-                attribute_type=BasketAttributeType.objects.get(name=BUNDLE),
+                attribute_type=basket_attribute_types.get(BUNDLE),
                 defaults={'value_text': bundle}
             )
 
@@ -12,6 +12,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from stripe.error import CardError
 
+from ecommerce.core.lookup_registry import basket_attribute_types
 from ecommerce.extensions.basket.constants import PAYMENT_INTENT_ID_ATTRIBUTE
 from ecommerce.extensions.basket.utils import basket_add_organization_attribute, basket_add_payment_intent_id_attribute
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
@@ -25,7 +26,6 @@ logger = logging.getLogger(__name__)
 
 Applicator = get_class('offer.applicator', 'Applicator')
 BasketAttribute = get_model('basket', 'BasketAttribute')
-BasketAttributeType = get_model('basket', 'BasketAttributeType')
 BillingAddress = get_model('order', 'BillingAddress')
 Country = get_model('address', 'Country')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
@@ -127,9 +127,7 @@ class StripeCheckoutView(EdxOrderPlacementMixin, APIView):
             duplicate payment_intent_id* received or any other exception occurred.
         """
         try:
-            payment_intent_id_attribute, __ = BasketAttributeType.objects.get_or_create(
-                name=PAYMENT_INTENT_ID_ATTRIBUTE
-            )
+            payment_intent_id_attribute, __ = basket_attribute_types.get_or_create(PAYMENT_INTENT_ID_ATTRIBUTE)
             basket_attribute = BasketAttribute.objects.get(
                 attribute_type=payment_intent_id_attribute,
                 value_text=payment_intent_id,
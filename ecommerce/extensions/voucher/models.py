@@ -103,6 +103,11 @@ class Voucher(AbstractVoucher):
 
     @property
     def original_offer(self):
+        if 'offers' in getattr(self, '_prefetched_objects_cache', {}):
+            # Same lookup as below, done on the prefetched offers to avoid a query per voucher.
+            offers = list(self.offers.all())
+            ranged_offers = [offer for offer in offers if offer.condition.range_id is not None]
+            return (ranged_offers or sorted(offers, key=lambda offer: offer.date_created))[0]
         try:
             return self.offers.filter(condition__range__isnull=False)[0]
         except (IndexError, ObjectDoesNotExist):
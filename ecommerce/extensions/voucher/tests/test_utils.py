@@ -4,10 +4,12 @@
 import uuid
 
 import ddt
+import mock
 import responses
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.translation import ugettext_lazy as _
 from factory.fuzzy import FuzzyText
 from oscar.templatetags.currency_filters import currency
@@ -33,10 +35,13 @@ from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.offer.models import OFFER_PRIORITY_VOUCHER
 from ecommerce.extensions.test.factories import create_order, prepare_voucher
 from ecommerce.extensions.voucher.utils import (
+    _generate_code_strings,
     create_vouchers,
+    create_vouchers_and_attach_offers,
     generate_coupon_report,
     get_voucher_and_products_from_code,
     get_voucher_discount_info,
+    iter_coupon_report,
     update_voucher_offer
 )
 from ecommerce.tests.factories import UserFactory
@@ -293,6 +298,52 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
             voucher = create_vouchers(**self.data)
             self.assertTrue(Voucher.objects.filter(code__iexact=voucher[0].code).exists())
 
+    def test_generate_code_strings_skips_existing_codes(self):
+        """
+        Test that generated codes are distinct and never collide with an existing voucher code
+        """
+        alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567'
+        for code in alphabet[1:]:
+            self.data.update({'benefit_value': 90.00, 'code': code, 'quantity': 1})
+            create_vouchers(**self.data)
+
+        self.assertEqual(_generate_code_strings(1, 1), ['A'])
+
+        codes = _generate_code_strings(2, 500)
+        self.assertEqual(len(set(codes)), 500)
+
+        self.data['code'] = 'a'
+        create_vouchers(**self.data)
+        with mock.patch('ecommerce.extensions.voucher.utils.VOUCHER_CODE_MAX_ATTEMPTS', 10):
+            with self.assertRaises(ValueError):
+                _generate_code_strings(1, 1)
+
+    def test_create_vouchers_in_bulk(self):
+        """
+        Test that the number of queries run to create vouchers does not depend on their quantity
+        """
+        self.data['quantity'] = 1
+        offer = create_vouchers(**self.data)[0].offers.first()
+        kwargs = {
+            'code': None,
+            'end_datetime': self.data['end_datetime'],
+            'enterprise_customer': None,
+            'enterprise_offers': [],
+            'name': 'Bulk',
+            'offers': [offer],
+            'start_datetime': self.data['start_datetime'],
+            'voucher_type': Voucher.SINGLE_USE,
+        }
+
+        with CaptureQueriesContext(connection) as few_vouchers_queries:
+            create_vouchers_and_attach_offers(quantity=2, **kwargs)
+        with CaptureQueriesContext(connection) as many_vouchers_queries:
+            vouchers = create_vouchers_and_attach_offers(quantity=50, **kwargs)
+
+        self.assertEqual(len(many_vouchers_queries), len(few_vouchers_queries))
+        self.assertEqual(len({voucher.code for voucher in vouchers}), 50)
+        self.assertTrue(all(voucher.offers.get() == offer for voucher in vouchers))
+
     @override_settings(VOUCHER_CODE_LENGTH=0)
     def test_nonpositive_voucher_code_length(self):
         """
@@ -492,6 +543,30 @@ class UtilTests(CouponMixin, DiscoveryMockMixin, DiscoveryTestMixin, LmsApiMockM
         self.assertNotIn('Course Seat Types', field_names)
         self.assertNotIn('Redeemed For Course ID', field_names)
 
+    def test_iter_coupon_report_in_batches(self):
+        """ Verify the report rows are read in batches, with a number of queries independent of the redemptions. """
+        coupon = self.create_coupon(title='Test batches', catalog=self.catalog, quantity=5)
+        coupon_vouchers = coupon.attr.coupon_vouchers
+        vouchers = list(coupon_vouchers.vouchers.all())
+        self.use_voucher('TESTBATCH1', vouchers[0], self.user)
+        self.use_voucher('TESTBATCH2', vouchers[3], self.user)
+
+        with CaptureQueriesContext(connection) as few_redemptions_queries:
+            __, expected_rows = generate_coupon_report([coupon_vouchers])
+        self.assertEqual(len(expected_rows), 8)
+
+        with mock.patch('ecommerce.extensions.voucher.utils.COUPON_REPORT_BATCH_SIZE', 2):
+            __, rows = iter_coupon_report([coupon_vouchers])
+            self.assertEqual(next(rows), expected_rows[0])
+            self.assertEqual(list(rows), expected_rows[1:])
+
+        self.use_voucher('TESTBATCH3', vouchers[1], self.user)
+        self.use_voucher('TESTBATCH4', vouchers[2], UserFactory())
+        with CaptureQueriesContext(connection) as more_redemptions_queries:
+            __, rows = generate_coupon_report([coupon_vouchers])
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(len(more_redemptions_queries), len(few_redemptions_queries))
+
     def test_report_for_dynamic_coupon_with_fixed_benefit_type(self):
         """ Verify the coupon report contains correct data for coupon with fixed benefit type. """
         dynamic_coupon = self.create_coupon(
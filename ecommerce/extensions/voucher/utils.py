@@ -5,12 +5,15 @@ import base64
 import datetime
 import hashlib
 import logging
+import time
 import uuid
+from collections import defaultdict
 from decimal import Decimal, DecimalException
 
 import dateutil.parser
 import pytz
 from django.conf import settings
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 from edx_django_utils.cache import TieredCache
@@ -48,6 +51,13 @@ Voucher = get_model('voucher', 'Voucher')
 VoucherApplication = get_model('voucher', 'VoucherApplication')
 VoucherOffer = get_model('voucher', 'Voucher_offers')
 
+# Number of voucher codes checked for collisions, and of vouchers inserted, per query.
+VOUCHER_CODE_BATCH_SIZE = 1000
+# Number of consecutive batches without any unused code after which code generation gives up.
+VOUCHER_CODE_MAX_ATTEMPTS = 1000
+# Number of vouchers read per query when generating a coupon report.
+COUPON_REPORT_BATCH_SIZE = 500
+
 
 def _add_redemption_course_ids(new_row_to_append, header_row, redemption_course_ids):
     if any(row in [_('Catalog Query'), _('Program UUID')] for row in header_row):
@@ -247,18 +257,10 @@ def _get_redemption_course_ids(voucher_application):
     return redemption_course_ids
 
 
-def generate_coupon_report(coupon_vouchers):
+def _get_coupon_report_field_names(header_row):
     """
-    Generate coupon report data
-
-    Args:
-        coupon_vouchers (List[CouponVouchers]): List of coupon_vouchers the report should be generated for
-
-    Returns:
-        List[str]
-        List[dict]
+    Return the columns of the coupon report, depending on the kind of coupon described by the header row.
     """
-
     field_names = [
         _('Code'),
         _('Coupon Name'),
@@ -288,48 +290,14 @@ def generate_coupon_report(coupon_vouchers):
         _('Coupon Expiry Date'),
         _('Email Domains'),
     ]
-    rows = []
-
-    for coupon_voucher in coupon_vouchers:
-        coupon = coupon_voucher.coupon
-        client = Invoice.objects.get(order__lines__product=coupon).business_client.name
-        rows.append(_get_info_for_coupon_report(coupon, coupon_voucher.vouchers.first()))
-        rows[0][_('Client')] = client
-
-        for voucher in coupon_voucher.vouchers.all().prefetch_related('offers'):
-            row = _get_voucher_info_for_coupon_report(voucher)
 
-            for item in (_('Order Number'), _('Redeemed By Username'),):
-                row[item] = ''
-
-            rows.append(row)
-
-            if voucher.num_orders > 0:
-                voucher_applications = VoucherApplication.objects.filter(
-                    voucher=voucher).prefetch_related('user', 'order__lines')
-
-                for application in voucher_applications:
-                    redemption_course_ids = _get_redemption_course_ids(application)
-                    redemption_user_username = application.user.username
-
-                    new_row = row.copy()
-                    _add_redemption_course_ids(new_row, rows[0], redemption_course_ids)
-                    new_row.update({
-                        _('Status'): _('Redeemed'),
-                        _('Order Number'): application.order.number,
-                        _('Redeemed By Username'): redemption_user_username,
-                        _('Maximum Coupon Usage'): 1,
-                        _('Redemption Count'): 1,
-                    })
-                    rows.append(new_row)
-
-    if _('Program UUID') in rows[0]:
+    if _('Program UUID') in header_row:
         field_names.remove(_('Course ID'))
         field_names.remove(_('Organization'))
         field_names.remove(_('Catalog Query'))
         field_names.remove(_('Course Seat Types'))
         field_names.remove(_('Redeemed For Course ID'))
-    elif _('Catalog Query') in rows[0]:
+    elif _('Catalog Query') in header_row:
         field_names.remove(_('Course ID'))
         field_names.remove(_('Organization'))
         field_names.remove(_('Program UUID'))
@@ -340,7 +308,124 @@ def generate_coupon_report(coupon_vouchers):
         field_names.remove(_('Redeemed For Course IDs'))
         field_names.remove(_('Program UUID'))
 
-    return field_names, rows
+    return field_names
+
+
+def _get_coupon_report_header_rows(coupon_vouchers):
+    """
+    Return the first row of the report of each coupon, which applies to all of its vouchers.
+
+    The clients of all coupons are retrieved with a single query.
+    """
+    coupon_vouchers = list(coupon_vouchers)
+    clients = dict(
+        Invoice.objects.filter(
+            order__lines__product__in=[coupon_voucher.coupon for coupon_voucher in coupon_vouchers]
+        ).values_list('order__lines__product_id', 'business_client__name')
+    )
+
+    header_rows = []
+    for coupon_voucher in coupon_vouchers:
+        coupon = coupon_voucher.coupon
+        if coupon.id not in clients:
+            raise Invoice.DoesNotExist('No invoice found for coupon [{}].'.format(coupon.id))
+        header_row = _get_info_for_coupon_report(
+            coupon, coupon_voucher.vouchers.prefetch_related('offers__condition').first()
+        )
+        header_row[_('Client')] = clients[coupon.id]
+        header_rows.append(header_row)
+    return coupon_vouchers, header_rows
+
+
+def _iter_voucher_rows_for_coupon_report(coupon_voucher, header_row):
+    """
+    Yield the rows of the vouchers of a coupon, and of their redemptions.
+
+    Vouchers are read in batches of COUPON_REPORT_BATCH_SIZE, together with their offers and redemptions,
+    so that the number of queries and the memory used do not depend on the number of vouchers.
+    """
+    # Keep the default (newest first) ordering of vouchers, and page through them on it.
+    vouchers = coupon_voucher.vouchers.order_by('-date_created', '-id').prefetch_related('offers__condition')
+    batch = list(vouchers[:COUPON_REPORT_BATCH_SIZE])
+    while batch:
+
+        applications_by_voucher = defaultdict(list)
+        redeemed_voucher_ids = [voucher.id for voucher in batch if voucher.num_orders > 0]
+        if redeemed_voucher_ids:
+            voucher_applications = VoucherApplication.objects.filter(
+                voucher_id__in=redeemed_voucher_ids
+            ).select_related('user', 'order').prefetch_related('order__lines__product__product_class')
+            for application in voucher_applications:
+                applications_by_voucher[application.voucher_id].append(application)
+
+        for voucher in batch:
+            row = _get_voucher_info_for_coupon_report(voucher)
+
+            for item in (_('Order Number'), _('Redeemed By Username'),):
+                row[item] = ''
+
+            yield row
+
+            for application in applications_by_voucher[voucher.id]:
+                redemption_course_ids = _get_redemption_course_ids(application)
+                redemption_user_username = application.user.username
+
+                new_row = row.copy()
+                _add_redemption_course_ids(new_row, header_row, redemption_course_ids)
+                new_row.update({
+                    _('Status'): _('Redeemed'),
+                    _('Order Number'): application.order.number,
+                    _('Redeemed By Username'): redemption_user_username,
+                    _('Maximum Coupon Usage'): 1,
+                    _('Redemption Count'): 1,
+                })
+                yield new_row
+
+        last_voucher = batch[-1]
+        batch = list(vouchers.filter(
+            Q(date_created__lt=last_voucher.date_created) |
+            Q(date_created=last_voucher.date_created, id__lt=last_voucher.id)
+        )[:COUPON_REPORT_BATCH_SIZE])
+
+
+def iter_coupon_report(coupon_vouchers):
+    """
+    Generate coupon report data, one row at a time
+
+    The header rows, and therefore the field names, are computed before returning, so that errors
+    (e.g. a missing stock record) are raised before any row is consumed.
+
+    Args:
+        coupon_vouchers (List[CouponVouchers]): List of coupon_vouchers the report should be generated for
+
+    Returns:
+        List[str]
+        Iterator[dict]
+    """
+    coupon_vouchers, header_rows = _get_coupon_report_header_rows(coupon_vouchers)
+    field_names = _get_coupon_report_field_names(header_rows[0])
+
+    def rows():
+        for coupon_voucher, header_row in zip(coupon_vouchers, header_rows):
+            yield header_row
+            yield from _iter_voucher_rows_for_coupon_report(coupon_voucher, header_rows[0])
+
+    return field_names, rows()
+
+
+def generate_coupon_report(coupon_vouchers):
+    """
+    Generate coupon report data
+
+    Args:
+        coupon_vouchers (List[CouponVouchers]): List of coupon_vouchers the report should be generated for
+
+    Returns:
+        List[str]
+        List[dict]
+    """
+    field_names, rows = iter_coupon_report(coupon_vouchers)
+    return field_names, list(rows)
 
 
 def generate_offer_name(coupon_id, benefit_type, benefit_value, offer_number=None, is_enterprise=False):
@@ -488,63 +573,124 @@ def get_or_create_enterprise_offer(
     return offer
 
 
-def _generate_code_string(length):
+def _generate_code_strings(length, count):
     """
-    Create a string of random characters of specified length
+    Create distinct strings of random characters of specified length, none of which is already used as
+    a voucher code.
+
+    Candidates are generated in batches and checked against the existing vouchers with a single query per
+    batch. Voucher codes are always stored uppercase (see AbstractVoucher.save), and so are the generated
+    codes, so an exact IN lookup finds the same collisions as a case-insensitive one.
 
     Args:
-        length (int): Defines the length of randomly generated string.
+        length (int): Defines the length of randomly generated strings.
+        count (int): Number of strings to generate.
 
     Raises:
-        ValueError raised if length is less than one.
+        ValueError raised if length is less than one, or if no unused code can be found.
 
     Returns:
-        str
+        list of str
     """
     if length < 1:
         raise ValueError("Voucher code length must be a positive number.")
 
-    h = hashlib.sha256()
-    h.update(uuid.uuid4().bytes)
-    voucher_code = base64.b32encode(h.digest())[0:length].decode('utf-8')
-    if Voucher.objects.filter(code__iexact=voucher_code).exists():
-        return _generate_code_string(length)
+    codes = []
+    seen = set()
+    attempts_without_new_code = 0
+    while len(codes) < count:
+        candidates = set()
+        for __ in range(min(count - len(codes), VOUCHER_CODE_BATCH_SIZE)):
+            h = hashlib.sha256()
+            h.update(uuid.uuid4().bytes)
+            candidates.add(base64.b32encode(h.digest())[0:length].decode('utf-8'))
+        candidates -= seen
+        seen |= candidates
+
+        if candidates:
+            existing = set(Voucher.objects.filter(code__in=candidates).values_list('code', flat=True))
+            candidates -= existing
+        if candidates:
+            codes.extend(candidates)
+            attempts_without_new_code = 0
+        else:
+            attempts_without_new_code += 1
+            if attempts_without_new_code >= VOUCHER_CODE_MAX_ATTEMPTS:
+                raise ValueError("Unable to generate an unused voucher code of length {}.".format(length))
 
-    return voucher_code
+    return codes
 
 
-def create_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
+def _generate_code_string(length):
     """
-    Creates a voucher.
+    Create a string of random characters of specified length
 
-    If randomly generated voucher code already exists, new code will be generated and reverified.
+    Args:
+        length (int): Defines the length of randomly generated string.
+
+    Raises:
+        ValueError raised if length is less than one.
+
+    Returns:
+        str
+    """
+    return _generate_code_strings(length, 1)[0]
+
+
+def _build_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
+    """
+    Builds and validates a voucher, without saving it.
 
     Args:
-        code (str): Code associated with vouchers. If not provided, one will be generated.
+        code (str): Code associated with the voucher.
         end_datetime (datetime): Voucher end date.
         name (str): Voucher name.
-        offer (Offer): Offer associated with voucher.
         start_datetime (datetime): Voucher start date.
         voucher_type (str): Voucher usage.
 
     Returns:
         Voucher
     """
-    voucher_code = code or _generate_code_string(settings.VOUCHER_CODE_LENGTH)
     if not isinstance(start_datetime, datetime.datetime):
         start_datetime = dateutil.parser.parse(start_datetime)
 
     if not isinstance(end_datetime, datetime.datetime):
         end_datetime = dateutil.parser.parse(end_datetime)
 
-    name = name[:128 - len(voucher_code)] + voucher_code
-    voucher = Voucher.objects.create(
+    name = name[:128 - len(code)] + code
+    voucher = Voucher(
         name=name,
-        code=voucher_code,
+        code=code,
         usage=voucher_type,
         start_datetime=start_datetime,
         end_datetime=end_datetime,
     )
+    voucher.clean()
+    # Voucher.save stores codes uppercase, which bulk_create would skip.
+    voucher.code = voucher.code.upper()
+    return voucher
+
+
+def create_new_voucher(code, end_datetime, name, start_datetime, voucher_type):
+    """
+    Creates a voucher.
+
+    If randomly generated voucher code already exists, new code will be generated and reverified.
+
+    Args:
+        code (str): Code associated with vouchers. If not provided, one will be generated.
+        end_datetime (datetime): Voucher end date.
+        name (str): Voucher name.
+        offer (Offer): Offer associated with voucher.
+        start_datetime (datetime): Voucher start date.
+        voucher_type (str): Voucher usage.
+
+    Returns:
+        Voucher
+    """
+    voucher_code = code or _generate_code_string(settings.VOUCHER_CODE_LENGTH)
+    voucher = _build_new_voucher(voucher_code, end_datetime, name, start_datetime, voucher_type)
+    voucher.save()
 
     return voucher
 
@@ -563,6 +709,8 @@ def create_vouchers_and_attach_offers(
     """
     Create vouchers and attach offers with them.
 
+    Vouchers and their offer links are inserted in batches, with bulk_create.
+
     Arguments:
         code (str): Code associated with vouchers. Defaults to None.
         end_datetime (datetime): End date for voucher offer.
@@ -577,31 +725,49 @@ def create_vouchers_and_attach_offers(
     Returns:
         List[Voucher]
     """
-    vouchers = []
-    voucher_offers = []
-    enterprise_voucher_offers = []
-    for i in range(quantity):
-        voucher = create_new_voucher(
+    start = time.time()
+    codes = [code] * quantity if code else _generate_code_strings(settings.VOUCHER_CODE_LENGTH, quantity)
+    vouchers = [
+        _build_new_voucher(
             end_datetime=end_datetime,
             start_datetime=start_datetime,
             voucher_type=voucher_type,
-            code=code,
+            code=voucher_code,
             name=name
         )
+        for voucher_code in codes
+    ]
+    Voucher.objects.bulk_create(vouchers, batch_size=VOUCHER_CODE_BATCH_SIZE)
+
+    # bulk_create does not set the primary keys on every database backend, so read them back.
+    for batch_start in range(0, len(vouchers), VOUCHER_CODE_BATCH_SIZE):
+        batch = vouchers[batch_start:batch_start + VOUCHER_CODE_BATCH_SIZE]
+        ids_by_code = dict(
+            Voucher.objects.filter(code__in=[voucher.code for voucher in batch]).values_list('code', 'id')
+        )
+        for voucher in batch:
+            voucher.id = ids_by_code[voucher.code]
+
+    voucher_offers = []
+    for i, voucher in enumerate(vouchers):
         voucher_offers.append(
             VoucherOffer(voucher=voucher, conditionaloffer=offers[i] if len(offers) > 1 else offers[0])
         )
         if enterprise_customer and enterprise_offers:
-            enterprise_voucher_offers.append(
+            voucher_offers.append(
                 VoucherOffer(
                     voucher=voucher,
                     conditionaloffer=enterprise_offers[i] if len(enterprise_offers) > 1 else enterprise_offers[0]
                 )
             )
-        vouchers.append(voucher)
 
-    VoucherOffer.objects.bulk_create(voucher_offers)
-    VoucherOffer.objects.bulk_create(enterprise_voucher_offers)
+    VoucherOffer.objects.bulk_create(voucher_offers, batch_size=VOUCHER_CODE_BATCH_SIZE)
+
+    duration = time.time() - start
+    logger.info(
+        'Created [%d] vouchers in [%.3f] seconds ([%.0f] vouchers/second).',
+        quantity, duration, quantity / duration if duration else quantity
+    )
     return vouchers
 
 
@@ -2,15 +2,17 @@
 
 import csv
 import logging
+from itertools import chain
 
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View
 from oscar.core.loading import get_model
 
+from ecommerce.core.db_router import ReadReplicaMixin
 from ecommerce.core.views import StaffOnlyMixin
-from ecommerce.extensions.voucher.utils import generate_coupon_report
+from ecommerce.extensions.voucher.utils import iter_coupon_report
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,14 @@ Product = get_model('catalogue', 'Product')
 StockRecord = get_model('partner', 'StockRecord')
 
 
-class CouponReportCSVView(StaffOnlyMixin, View):
+class Echo:
+    """File-like object returning what is written to it, used to stream CSV rows."""
+
+    def write(self, value):
+        return value
+
+
+class CouponReportCSVView(StaffOnlyMixin, ReadReplicaMixin, View):
     """Generates coupon report and returns it in CSV format."""
 
     def get(self, request, coupon_id):  # pylint: disable=unused-argument
@@ -34,18 +43,18 @@ class CouponReportCSVView(StaffOnlyMixin, View):
         filename = "{}.csv".format(slugify(filename))
 
         try:
-            field_names, rows = generate_coupon_report(coupons_vouchers)
+            field_names, rows = iter_coupon_report(coupons_vouchers)
         except StockRecord.DoesNotExist:
             logger.exception(u'Failed to find StockRecord for Coupon [%d].', coupon.id)
             return HttpResponse(_('Failed to find a matching stock record for coupon, report download canceled.'),
                                 status=404)
 
-        response = HttpResponse(content_type='text/csv')
+        # The report is written as it is generated, so that large coupons do not have to fit in memory.
+        writer = csv.DictWriter(Echo(), fieldnames=field_names)
+        response = StreamingHttpResponse(
+            chain([writer.writeheader()], (writer.writerow(row) for row in rows)),
+            content_type='text/csv'
+        )
         response['Content-Disposition'] = 'attachment; filename={}'.format(filename)
 
-        writer = csv.DictWriter(response, fieldnames=field_names)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
-
         return response
@@ -8,6 +8,9 @@ from edx_django_utils.cache import TieredCache
 
 logger = logging.getLogger(__name__)
 
+# Key of the precompiled form of a program (see ecommerce.programs.utils.compile_program), cached alongside the program.
+COMPILED_PROGRAM_CACHE_KEY = '{site_domain}-compiled-program-{uuid}'
+
 
 class ProgramsApiClient:
     """ Client for the Programs API.
@@ -48,5 +51,9 @@ class ProgramsApiClient:
         program = resp.json()
 
         TieredCache.set_all_tiers(cache_key, program, self.cache_ttl)
+        # The program may have changed since it was last compiled.
+        TieredCache.delete_all_tiers(
+            COMPILED_PROGRAM_CACHE_KEY.format(site_domain=self.site_domain, uuid=program_uuid)
+        )
         logging.info('Program [%s] was successfully retrieved and cached.', program_uuid)
         return program
@@ -2,6 +2,7 @@
 
 import logging
 import operator
+from concurrent.futures import ThreadPoolExecutor
 
 from django.conf import settings
 from edx_django_utils.cache import TieredCache
@@ -13,7 +14,8 @@ from requests.exceptions import HTTPError, RequestException, Timeout
 from ecommerce.core.utils import deprecated_traverse_pagination, get_cache_key
 from ecommerce.extensions.offer.decorators import check_condition_applicability
 from ecommerce.extensions.offer.mixins import SingleItemConsumptionConditionMixin
-from ecommerce.programs.utils import get_program
+from ecommerce.programs.api import COMPILED_PROGRAM_CACHE_KEY
+from ecommerce.programs.utils import compile_program, get_program
 
 Condition = get_model('offer', 'Condition')
 logger = logging.getLogger(__name__)
@@ -28,22 +30,25 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
     def name(self):
         return 'Basket contains a seat for every course in program {}'.format(self.program_uuid)
 
+    def _get_compiled_program(self, program, site_configuration):
+        """ Returns the precompiled form of the given program, which is cached alongside the program. """
+        cache_key = COMPILED_PROGRAM_CACHE_KEY.format(
+            site_domain=site_configuration.site.domain, uuid=self.program_uuid
+        )
+        compiled_program_cached_response = TieredCache.get_cached_response(cache_key)
+        if compiled_program_cached_response.is_found:
+            return compiled_program_cached_response.value
+
+        compiled_program = compile_program(program)
+        TieredCache.set_all_tiers(cache_key, compiled_program, settings.PROGRAM_CACHE_TIMEOUT)
+        return compiled_program
+
     def _get_applicable_skus(self, site_configuration):
         """ SKUs to which this condition applies. """
-        program_skus = set()
         program = get_program(self.program_uuid, site_configuration)
         if program:
-            applicable_seat_types = program['applicable_seat_types']
-
-            for course in program['courses']:
-                for course_run in course['course_runs']:
-                    program_skus.update(
-                        {seat['sku'] for seat in course_run['seats'] if seat['type'] in applicable_seat_types}
-                    )
-                for entitlement in course['entitlements']:
-                    if entitlement['mode'].lower() in applicable_seat_types:
-                        program_skus.add(entitlement['sku'])
-        return program_skus
+            return self._get_compiled_program(program, site_configuration).skus
+        return set()
 
     def _get_lms_resource_for_user(self, basket, resource_name, client, endpoint):
         cache_key = get_cache_key(
@@ -71,6 +76,12 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             return []
         return self._get_lms_resource_for_user(basket, resource_name, client, endpoint)
 
+    def _get_entitlements(self, basket, client, entitlements_api_url):
+        response = self._get_lms_resource(basket, 'entitlements', client, entitlements_api_url)
+        if isinstance(response, dict):
+            return deprecated_traverse_pagination(response, client, entitlements_api_url)
+        return response
+
     def _get_user_ownership_data(self, basket, retrieve_entitlements=False):
         """
         Retrieves existing enrollments and entitlements for a user from LMS
@@ -81,31 +92,21 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
         site_configuration = basket.site.siteconfiguration
         if site_configuration.enable_partial_program:
             client = site_configuration.oauth_api_client
-            enrollments = self._get_lms_resource(
-                basket, 'enrollments', client, site_configuration.enrollments_api_url
-            )
-            entitlements_api_url = site_configuration.entitlements_api_url
+            enrollments_api_url = site_configuration.enrollments_api_url
             if retrieve_entitlements:
-                response = self._get_lms_resource(
-                    basket, 'entitlements', client, entitlements_api_url
-                )
-                if isinstance(response, dict):
-                    entitlements = deprecated_traverse_pagination(
-                        response, client, entitlements_api_url
+                # Enrollments are fetched in a worker thread while entitlements are fetched here. The basket's
+                # owner is loaded beforehand, as the worker thread must not query the database.
+                basket.owner  # pylint: disable=pointless-statement
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    enrollments_future = executor.submit(
+                        self._get_lms_resource, basket, 'enrollments', client, enrollments_api_url
                     )
-                else:
-                    entitlements = response
+                    entitlements = self._get_entitlements(basket, client, site_configuration.entitlements_api_url)
+                    enrollments = enrollments_future.result()
+            else:
+                enrollments = self._get_lms_resource(basket, 'enrollments', client, enrollments_api_url)
         return enrollments, entitlements
 
-    def _has_entitlements(self, program):
-        """
-        Determines whether an entitlement product exists for any course in the program.
-        """
-        for course in program['courses']:
-            if course['entitlements']:
-                return True
-        return False
-
     @check_condition_applicability()
     def is_satisfied(self, offer, basket):  # pylint: disable=unused-argument
         """
@@ -124,21 +125,27 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
         except (HTTPError, RequestException, Timeout):
             return False
 
-        if program and program['status'] == 'active':
-            applicable_seat_types = program['applicable_seat_types']
-        else:
+        if not program:
+            return False
+        compiled_program = self._get_compiled_program(program, basket.site.siteconfiguration)
+        if compiled_program.status != 'active':
             return False
 
-        retrieve_entitlements = self._has_entitlements(program)
-        enrollments, entitlements = self._get_user_ownership_data(basket, retrieve_entitlements)
-
-        for course in program['courses']:
+        applicable_seat_types = compiled_program.applicable_seat_types
+        enrollments, entitlements = self._get_user_ownership_data(basket, compiled_program.has_entitlements)
+        enrolled_course_run_keys = {
+            enrollment['course_details']['course_id'] for enrollment in enrollments
+            if enrollment['mode'] in applicable_seat_types
+        }
+        entitled_course_uuids = {
+            entitlement['course_uuid'] for entitlement in entitlements if entitlement['mode'] in applicable_seat_types
+        }
+
+        for course in compiled_program.courses:
             # If the user is already enrolled in a course, we do not need to check their basket for it
-            if any(enrollment['course_details']['course_id'] in [run['key'] for run in course['course_runs']] and
-                   enrollment['mode'] in applicable_seat_types for enrollment in enrollments):
+            if not course.course_run_keys.isdisjoint(enrolled_course_run_keys):
                 continue
-            if any(course['uuid'] == entitlement['course_uuid'] and
-                   entitlement['mode'] in applicable_seat_types for entitlement in entitlements):
+            if course.uuid in entitled_course_uuids:
                 continue
 
             # If the  basket has no SKUs left, but we still have courses over which
@@ -146,18 +153,10 @@ class ProgramCourseRunSeatsCondition(SingleItemConsumptionConditionMixin, Condit
             if not basket_skus:
                 return False
 
-            # Get all of the SKUs that can satisfy this course
-            skus = set()
-            for course_run in course['course_runs']:
-                skus.update({seat['sku'] for seat in course_run['seats'] if seat['type'] in applicable_seat_types})
-            for entitlement in course['entitlements']:
-                if entitlement['mode'].lower() in applicable_seat_types:
-                    skus.add(entitlement['sku'])
-
             # The lack of a difference in the set of SKUs in the basket and the course indicates that
             # that there is no intersection. Therefore, the basket contains no SKUs for the current course.
             # Because the user is also not enrolled in the course, it follows that the program condition is not met.
-            diff = basket_skus.difference(skus)
+            diff = basket_skus.difference(course.skus)
             if diff == basket_skus:
                 return False
 
@@ -134,6 +134,28 @@ class ProgramCourseRunSeatsConditionTests(ProgramTestMixin, TestCase):
                         return_value=program):
             self.assertTrue(self.condition.is_satisfied(offer, basket))
 
+    @responses.activate
+    def test_is_satisfied_uses_compiled_program(self):
+        """ The program should be compiled once, and the compiled program reused by later evaluations. """
+        offer = factories.ProgramOfferFactory(partner=self.partner, condition=self.condition)
+        basket = BasketFactory(site=self.site, owner=UserFactory())
+        program = self.mock_program_detail_endpoint(
+            self.condition.program_uuid, self.site_configuration.discovery_api_url
+        )
+        for course in program['courses']:
+            course_run = Course.objects.get(id=course['course_runs'][0]['key'])
+            for seat in course_run.seat_products:
+                if seat.attr.id_verification_required:
+                    basket.add_product(seat)
+        self.mock_user_data(basket.owner.username)
+        self.mock_user_data(basket.owner.username, mocked_api='entitlements')
+        self.assertTrue(self.condition.is_satisfied(offer, basket))
+
+        with mock.patch('ecommerce.programs.conditions.compile_program') as mock_compile_program:
+            self.assertTrue(self.condition.is_satisfied(offer, basket))
+            self.assertTrue(self.condition.can_apply_condition(basket.all_lines()[0]))
+            mock_compile_program.assert_not_called()
+
     @ddt.data(HTTPError, RequestException, Timeout)
     def test_is_satisfied_with_exception_for_programs(self, value):
         """ The method should return False if there is an exception when trying to get program details. """
@@ -11,7 +11,7 @@ from testfixtures import LogCapture
 
 from ecommerce.programs.api import ProgramsApiClient
 from ecommerce.programs.tests.mixins import ProgramTestMixin
-from ecommerce.programs.utils import get_program
+from ecommerce.programs.utils import compile_program, get_program
 from ecommerce.tests.testcases import TestCase
 
 LOGGER_NAME = 'ecommerce.programs.utils'
@@ -50,3 +50,26 @@ class UtilTests(ProgramTestMixin, TestCase):
                 self.assertIsNone(response)
                 msg = 'Failed to retrieve program details for {}'.format(self.program_uuid)
                 logger.check((LOGGER_NAME, 'DEBUG', msg))
+
+    @responses.activate
+    def test_compile_program(self):
+        """ The compiled program should hold the course run keys and applicable SKUs of each course. """
+        data = self.mock_program_detail_endpoint(self.program_uuid, self.discovery_api_url)
+        compiled_program = compile_program(data)
+
+        self.assertEqual(compiled_program.status, 'active')
+        self.assertTrue(compiled_program.has_entitlements)
+        self.assertEqual(len(compiled_program.courses), len(data['courses']))
+        for course, compiled_course in zip(data['courses'], compiled_program.courses):
+            self.assertEqual(compiled_course.uuid, course['uuid'])
+            self.assertEqual(
+                compiled_course.course_run_keys,
+                {course_run['key'] for course_run in course['course_runs']}
+            )
+            expected_skus = {
+                seat['sku'] for course_run in course['course_runs'] for seat in course_run['seats']
+                if seat['type'] == 'verified'
+            }
+            expected_skus.add(course['entitlements'][0]['sku'])
+            self.assertEqual(compiled_course.skus, expected_skus)
+            self.assertTrue(compiled_course.skus <= compiled_program.skus)
@@ -1,6 +1,7 @@
 
 
 import logging
+from collections import namedtuple
 
 from requests.exceptions import ConnectionError as ReqConnectionError
 from requests.exceptions import HTTPError, Timeout
@@ -9,6 +10,11 @@ from ecommerce.programs.api import ProgramsApiClient
 
 log = logging.getLogger(__name__)
 
+CompiledProgram = namedtuple(
+    'CompiledProgram', ['status', 'applicable_seat_types', 'courses', 'skus', 'has_entitlements']
+)
+CompiledProgramCourse = namedtuple('CompiledProgramCourse', ['uuid', 'course_run_keys', 'skus'])
+
 
 def get_program(program_uuid, siteconfiguration):
     """
@@ -34,3 +40,39 @@ def get_program(program_uuid, siteconfiguration):
         log.debug("Failed to retrieve program details for %s", program_uuid)
 
     return response
+
+
+def compile_program(program):
+    """
+    Precompiles the program details needed to evaluate program offers.
+
+    Args:
+        program (dict): Program details, as returned by get_program.
+
+    Returns:
+        CompiledProgram: The program status, its applicable seat types, and for each of its courses the keys
+            of its course runs and the SKUs of its applicable seats and entitlements. The SKUs of all courses
+            are also gathered in a single set, and whether any course has entitlement products is recorded.
+    """
+    applicable_seat_types = frozenset(program['applicable_seat_types'])
+    courses = []
+    for course in program['courses']:
+        skus = set()
+        for course_run in course['course_runs']:
+            skus.update(seat['sku'] for seat in course_run['seats'] if seat['type'] in applicable_seat_types)
+        for entitlement in course['entitlements']:
+            if entitlement['mode'].lower() in applicable_seat_types:
+                skus.add(entitlement['sku'])
+        courses.append(CompiledProgramCourse(
+            uuid=course['uuid'],
+            course_run_keys=frozenset(course_run['key'] for course_run in course['course_runs']),
+            skus=frozenset(skus),
+        ))
+
+    return CompiledProgram(
+        status=program['status'],
+        applicable_seat_types=applicable_seat_types,
+        courses=tuple(courses),
+        skus=frozenset().union(*(course.skus for course in courses)),
+        has_entitlements=any(course['entitlements'] for course in program['courses']),
+    )
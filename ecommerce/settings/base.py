@@ -73,6 +73,18 @@ DATABASES = {
         'CONN_MAX_AGE': 60,
     }
 }
+
+# Reads opted in with ecommerce.core.db_router.read_replica, or ReadReplicaMixin, go to a database called
+# 'read_replica' when one is configured.
+DATABASE_ROUTERS = ['ecommerce.core.db_router.ReadReplicaRouter']
+
+# After one of its requests writes to the database, the requests of a client read from the primary database
+# for this many seconds. This fixed window only hides the write while the read replica lags less than it, so
+# reads also go to the primary database while the measured replication lag of a MySQL replica exceeds it, or
+# cannot be measured (which requires the REPLICATION CLIENT privilege).
+READ_REPLICA_PIN_SECONDS = 15
+# Each process measures the replication lag of the read replica at most this often, in seconds.
+READ_REPLICA_LAG_CHECK_SECONDS = 5
 # END DATABASE CONFIGURATION
 
 
@@ -223,6 +235,7 @@ MIDDLEWARE = (
     'corsheaders.middleware.CorsMiddleware',
     'edx_django_utils.monitoring.DeploymentMonitoringMiddleware',
     'edx_django_utils.cache.middleware.RequestCacheMiddleware',
+    'ecommerce.core.middleware.ReadReplicaPinningMiddleware',
     'edx_django_utils.monitoring.CachedCustomMonitoringMiddleware',
     'edx_django_utils.monitoring.CookieMonitoringMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -277,10 +290,29 @@ CREDIT_PROVIDER_CACHE_TIMEOUT = 600
 
 # Anonymous User Calculate Cache timeout
 ANONYMOUS_BASKET_CALCULATE_CACHE_TIMEOUT = 3600  # Value is in seconds.
+# Only one request at a time calculates an anonymous basket that is not cached. The lock it takes expires after
+# ANONYMOUS_BASKET_CALCULATE_LOCK_TIMEOUT, and other requests wait up to ANONYMOUS_BASKET_CALCULATE_LOCK_WAIT
+# for its result before calculating the basket themselves.
+ANONYMOUS_BASKET_CALCULATE_LOCK_TIMEOUT = 10  # Value is in seconds.
+ANONYMOUS_BASKET_CALCULATE_LOCK_WAIT = 2  # Value is in seconds.
 
 # LMS API settings used for fetching information from LMS
 LMS_API_CACHE_TIMEOUT = 30  # Value is in seconds.
 
+# Connection pooling for the OAuth API clients shared by each site to call backend services.
+OAUTH_API_CLIENT_POOL_CONNECTIONS = 10
+OAUTH_API_CLIENT_POOL_MAXSIZE = 10
+# Default (connect, read) timeout applied to requests that do not set their own. Values are in seconds.
+OAUTH_API_CLIENT_REQUEST_TIMEOUT = (3.05, 30)
+
+# Seconds after which the process-local registries of lookup-table rows (see ecommerce.core.lookup_registry)
+# reload the rows, to pick up changes made by other processes.
+LOOKUP_TABLE_REGISTRY_TIMEOUT = 60 * 60
+
+# Seconds after which the payment processor registry (see ecommerce.extensions.payment.registry) checks the
+# payment processor switches and configuration of each site again.
+PAYMENT_PROCESSOR_REGISTRY_TIMEOUT = 60 * 60
+
 # Add here custom payment processor urls. For instance:
 # EXTRA_PAYMENT_PROCESSOR_URLS = {
 #   "mycustompaymentprocessor": "ecommerce.payment.processors.mycustompaymentprocessor.urls"
@@ -290,6 +322,16 @@ EXTRA_PAYMENT_PROCESSOR_URLS = {}
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
 
+# Cache of the converted offer pages of the voucher offers endpoint. Pages are also invalidated when the voucher's
+# range, or a product or stock record, changes.
+VOUCHER_OFFERS_CACHE_TIMEOUT = 3600  # Value is in seconds.
+# Maximum number of remote lookups (Discovery, LMS credit eligibility) issued at the same time for a single page of
+# voucher offers.
+VOUCHER_OFFERS_MAX_WORKERS = 4
+# Maximum number of course and course run details requested from Discovery at the same time when rendering a
+# basket with several products.
+COURSE_INFO_PREFETCH_MAX_WORKERS = 4
+
 SDN_CHECK_REQUEST_TIMEOUT = 5  # Value is in seconds.
 
 # APP CONFIGURATION
@@ -664,6 +706,8 @@ EDX_DRF_EXTENSIONS = {
 # created for the Enrollment code products.
 ENROLLMENT_CODE_EXIPRATION_DATE = datetime.datetime.now() + datetime.timedelta(weeks=520)
 ENROLLMENT_FULFILLMENT_TIMEOUT = 7
+# Maximum number of enrollments of a single order posted to the Enrollment API at the same time.
+ENROLLMENT_FULFILLMENT_MAX_WORKERS = 4
 
 # Affiliate cookie key
 AFFILIATE_COOKIE_KEY = 'affiliate_id'
@@ -726,6 +770,15 @@ if os.environ.get('ENABLE_DJANGO_TOOLBAR', False):
 # Determines if events are actually sent to Segment. This should only be set to False for testing purposes.
 SEND_SEGMENT_EVENTS = True
 
+# Segment and Braze events are queued in memory, and sent by a background thread of each process in batches of
+# up to ANALYTICS_EVENT_BATCH_SIZE events, gathered for at most ANALYTICS_EVENT_FLUSH_INTERVAL seconds. Events
+# fired while ANALYTICS_EVENT_QUEUE_SIZE events are already queued are dropped.
+ANALYTICS_EVENT_QUEUE_SIZE = 10000
+ANALYTICS_EVENT_BATCH_SIZE = 100
+ANALYTICS_EVENT_FLUSH_INTERVAL = 0.5  # Value is in seconds.
+# Send events from the thread firing them, which sees their errors. This should only be set to True for testing.
+ANALYTICS_EVENT_SYNC_MODE = False
+
 NEW_CODES_EMAIL_CONFIG = {
     'email_subject': 'New edX codes available',
     'from_email': 'customersuccess@edx.org',
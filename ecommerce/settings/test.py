@@ -187,6 +187,9 @@ ENTERPRISE_CATALOG_API_URL = urljoin(f"{ENTERPRISE_CATALOG_SERVICE_URL}/", 'api/
 # Don't bother sending fake events to Segment. Doing so creates unnecessary threads.
 SEND_SEGMENT_EVENTS = False
 
+# Send analytics events as they are fired, so that tests can check them.
+ANALYTICS_EVENT_SYNC_MODE = True
+
 # SPEED
 DEBUG = False
 TEMPLATE_DEBUG = False
@@ -30,6 +30,7 @@ from social_django.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 from waffle.models import Flag
 
+from ecommerce.core.api_clients import oauth_api_client_registry
 from ecommerce.core.constants import ALL_ACCESS_CONTEXT, SYSTEM_ENTERPRISE_ADMIN_ROLE, SYSTEM_ENTERPRISE_OPERATOR_ROLE
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
@@ -344,6 +345,7 @@ class SiteMixin:
         Course.objects.all().delete()
         Partner.objects.all().delete()
         Site.objects.all().delete()
+        oauth_api_client_registry.invalidate()
         lms_url_root = "http://lms.testserver.fake"
         self.site_configuration = SiteConfigurationFactory(
             lms_url_root=lms_url_root,
@@ -7,6 +7,7 @@ from django.test import TransactionTestCase as DjangoTransactionTestCase
 from edx_django_utils.cache import TieredCache
 from oscar.test.factories import CategoryFactory
 
+from ecommerce.core.lookup_registry import invalidate_lookup_table_registries
 from ecommerce.tests.mixins import SiteMixin, TestServerUrlMixin, TestWaffleFlagMixin, UserMixin
 
 # When all unit tests are run, the catalog category table will sometimes be empty. However, if only a single test
@@ -22,6 +23,7 @@ class TieredCacheMixin:
 
     def setUp(self):
         TieredCache.dangerous_clear_all_tiers()
+        invalidate_lookup_table_registries()
         super(TieredCacheMixin, self).setUp()
 
     def tearDown(self):